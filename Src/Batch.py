@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Play many seeded games headlessly on all CPU cores and report their results.
+
+Each game runs on the TetrisCore engine (no window, no sound) with a policy choosing
+one key per tick. Results are printed as one JSON line per game as soon as the game
+ends, and percentiles of every metric are printed to stderr at the end.
+
+Example:
+    python Batch.py --games 1000 --policy lowest --seed 0 > results.jsonl
+"""
+
+import sys
+import json
+import time
+import argparse
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Tuple
+
+from TetrisCore.Engine import Engine
+from TetrisCore.Rules import COLUMNS, ROWS, check_board_size
+from TetrisCore.Generator import PieceGenerator, UNIFORM, BAG
+from TetrisCore.Policies import POLICIES, make_policy
+from TetrisCore.Stats import summarize
+
+METRICS = ('score', 'lines', 'level', 'pieces', 'ticks', 'seconds')
+
+
+def play_game(job: Tuple[int, str, str, int, int, int]) -> Dict[str, object]:
+    """
+    Play one game until it ends or reaches the tick limit.
+
+    Args:
+        job (tuple): The seed of the game, the generator mode, the policy name, the tick limit
+            and the width and height of the board.
+
+    Returns:
+        dict: The seed, score, cleared lines, level reached, locked pieces, ticks played,
+        wall-clock duration and how the game ended ('game over' or 'limit').
+    """
+    seed, mode, policy_name, max_ticks, columns, rows = job
+    start = time.perf_counter()
+    engine = Engine(generator=PieceGenerator(seed, mode), columns=columns, rows=rows)
+    policy = make_policy(policy_name, seed)
+    end = 'limit'
+    while engine.counter < max_ticks:
+        engine.apply(policy(engine))
+        engine.tick()
+        if not engine.inPlay:
+            end = 'game over'
+            break
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'lines': engine.lines,
+        'level': engine.level + 1,
+        'pieces': engine.pieces,
+        'ticks': engine.counter,
+        'seconds': round(time.perf_counter() - start, 6),
+        'end': end,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=100, help='number of games to play')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game, the next games use the following seeds')
+    parser.add_argument('--bag', action='store_true', help='deal pieces from shuffled 7-bags')
+    parser.add_argument('--policy', default='lowest',
+                        help=f"built-in policy ({', '.join(POLICIES)}) or module:attribute")
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='number of worker processes')
+    parser.add_argument('--max-ticks', type=int, default=360000, help='tick limit of a game (an hour of play)')
+    parser.add_argument('--columns', type=int, default=COLUMNS, help='width of the board')
+    parser.add_argument('--rows', type=int, default=ROWS, help='height of the board')
+    args = parser.parse_args(argv)
+    try:
+        check_board_size(args.columns, args.rows)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # Fail before starting the pool if the policy cannot be created
+    make_policy(args.policy, args.seed)
+    mode = BAG if args.bag else UNIFORM
+    jobs = [(args.seed + game, mode, args.policy, args.max_ticks, args.columns, args.rows) for game in range(args.games)]
+
+    results = []
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        for result in pool.imap_unordered(play_game, jobs):
+            print(json.dumps(result), flush=True)
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    print(f'{len(results)} games in {elapsed:.2f}s on {args.workers} workers', file=sys.stderr)
+    print('{:<10}{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}'.format('metric', 'mean', 'min', 'p50', 'p90', 'p99', 'max'), file=sys.stderr)
+    for metric in METRICS:
+        summary = summarize(result[metric] for result in results)
+        print('{:<10}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}'.format(
+            metric, summary['mean'], summary['min'], summary['p50'], summary['p90'], summary['p99'], summary['max']),
+            file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/python3
+"""
+Measure the engine and renderer hot paths on generated boards and compare runs.
+
+Every benchmark runs against board fixtures of controlled density and reports the
+time per operation and the memory it allocates. The fixtures can be built on a board
+of any size, to check how the costs grow with the board. Rendering is measured on an offscreen
+surface, so no window is needed. Results are printed as JSON and can be saved as a
+baseline that later runs are compared against.
+
+Example:
+    python Bench.py --save baseline.json
+    python Bench.py --baseline baseline.json --fail-above 10
+    python Bench.py --columns 100 --rows 1000
+"""
+
+import os
+import sys
+
+# Rendering is measured offscreen: the display and the mixer must not need a device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pygame
+
+from Util.Constants import *
+from TetrisGrid.Grid import Grid
+from TetrisGrid.Floor import Floor
+from TetrisGrid.Renderer import DirtyRenderer
+from TetrisGrid.Viewport import VIEWPORT
+from TetrisPiece.Shape import Shape
+from TetrisPiece.Obstacles import Obstacles
+from TetrisPiece.MovePiece import MovePiece
+from TetrisCore.Rules import spawn_column
+
+# Board fixtures: the height of the random stack (in rows, given the board height) and whether its bottom rows are full
+FIXTURES = {
+    'empty': lambda rows: (0, 0),
+    'half': lambda rows: (rows // 2, 0),
+    'nearly-full': lambda rows: (rows - 4, 0),
+    'clear-ready': lambda rows: (rows // 2, 4),
+}
+DEFAULT_BOARD = '{}x{}'.format(COLUMNS, ROWS)
+
+
+def build_board(fixture: str, seed: int = 0, columns: int = COLUMNS, rows: int = ROWS) -> Obstacles:
+    """
+    Build the obstacles of a fixture: a random stack with one hole or more per row,
+    topped by a few full rows for the fixtures ready to clear lines.
+
+    Args:
+        fixture (str): The fixture name, a key of FIXTURES.
+        seed (int): The seed of the random stack.
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+
+    Returns:
+        Obstacles: The locked cells of the fixture.
+    """
+    height, full = FIXTURES[fixture](rows)
+    rnd = random.Random(seed)
+    obstacles = Obstacles(LEFT, TOP + rows, 0, columns, rows)
+    for row in range(obstacles.rows - height, obstacles.rows):
+        hole = rnd.randrange(columns)
+        for col in range(columns):
+            if col != hole and rnd.random() < 0.75:
+                obstacles.setCell(LEFT + col, row, rnd.randint(1, 7))
+    for row in range(obstacles.rows - full, obstacles.rows):
+        for col in range(columns):
+            obstacles.setCell(LEFT + col, row, rnd.randint(1, 7))
+    return obstacles
+
+
+class Case(NamedTuple):
+    """
+    One operation to measure on one fixture.
+
+    Attributes:
+        name (str): The name of the measured operation.
+        fixture (str): The board fixture.
+        op (callable): The operation, called with no arguments.
+        reset (callable): Restores the state the operation changes, run untimed before
+            every call (None when the operation can simply be repeated).
+    """
+    name: str
+    fixture: str
+    op: Callable[[], object]
+    reset: Optional[Callable[[], None]] = None
+
+
+def engine_cases(fixture: str, columns: int = COLUMNS, rows: int = ROWS) -> List[Case]:
+    """
+    Build the collision, line clear and drop benchmarks of a fixture.
+    """
+    obstacles = build_board(fixture, 0, columns, rows)
+    # A T piece at the spawn position, and its shadow dropped by MovePiece.drop
+    shape = Shape(spawn_column(columns), TOP, 6)
+    shadow = Shape(spawn_column(columns), TOP, 6, shadow=True)
+    floor = Floor(LEFT, rows, columns)
+    full_rows = obstacles.findFullRows(TOP, TOP + rows, columns)
+    board = {}
+
+    def reset_board():
+        board['obstacles'] = build_board(fixture, 0, columns, rows)
+
+    def reset_shadow():
+        shadow.row = TOP
+        shadow.update()
+
+    return [
+        Case('Grid.collides', fixture, lambda: shape.collides(obstacles)),
+        Case('Shape.fits', fixture, lambda: shape.fits(obstacles, shape.col, shape.row + 1, shape._rot)),
+        Case('Grid.update', fixture, shape.update),
+        Case('Obstacles.findFullRows', fixture, lambda: obstacles.findFullRows(TOP, TOP + rows, columns)),
+        Case('Obstacles.removeFullRows', fixture, lambda: board['obstacles'].removeFullRows(full_rows), reset_board),
+        Case('MovePiece.drop', fixture, lambda: MovePiece.drop(shadow, floor, obstacles, None), reset_shadow),
+    ]
+
+
+def render_cases(fixture: str, columns: int = COLUMNS, rows: int = ROWS) -> List[Case]:
+    """
+    Build the full and dirty-rectangle redraw benchmarks of a fixture, on an offscreen surface.
+
+    VIEWPORT must be configured for the board first.
+    """
+    obstacles = build_board(fixture, 0, columns, rows)
+    surface = pygame.Surface(screen.get_size())
+    assets = grid_img.get(), tetris_img.get()
+    blocks, game_font = [img.get() for img in block_img], font.get()
+    shape = Shape(spawn_column(columns), TOP, 6)
+    if rows > VIEWPORT.visible:
+        # On a board taller than the window the piece is moved down to the stack, which the viewport follows
+        shape.row = max(shape.landing_row(obstacles) - 2, TOP)
+        shape.update()
+    shadow = Shape(spawn_column(columns), TOP, 6, shadow=True)
+    MovePiece.drop(shadow, None, obstacles, None)
+    renderer = DirtyRenderer()
+    step = [1]
+
+    def full_redraw():
+        Grid.redraw_screen(surface, *assets, shape, shadow, obstacles, blocks, 1, 1200, 3, game_font)
+
+    def dirty_redraw():
+        # The piece moves one column every frame, as when a player holds a key
+        step[0] = -step[0]
+        shape.col += step[0]
+        shape.update()
+        renderer.redraw(surface, *assets, shape, shadow, obstacles, blocks, 1, 1200, 3, game_font)
+
+    return [
+        Case('Grid.redraw_screen', fixture, full_redraw),
+        Case('DirtyRenderer.redraw', fixture, dirty_redraw),
+    ]
+
+
+def timer_overhead() -> float:
+    """
+    Measure the cost of one pair of perf_counter_ns calls, subtracted from individually timed operations.
+    """
+    samples = []
+    for _ in range(1000):
+        start = time.perf_counter_ns()
+        samples.append(time.perf_counter_ns() - start)
+    return statistics.median(samples)
+
+
+def time_case(case: Case, min_time: float, rounds: int, overhead: float) -> Dict[str, float]:
+    """
+    Time an operation: the number of calls per round grows until a round lasts
+    `min_time`, then the best and median rounds are reported.
+
+    Args:
+        case (Case): The operation.
+        min_time (float): Minimum duration of a round, in seconds.
+        rounds (int): Number of rounds.
+        overhead (float): Cost of the timer calls, in nanoseconds.
+
+    Returns:
+        dict: `ns_per_op` (best round), `ns_median` and the number of calls per round.
+    """
+    op, reset = case.op, case.reset
+
+    def run(calls):
+        if reset is None:
+            start = time.perf_counter_ns()
+            for _ in range(calls):
+                op()
+            return time.perf_counter_ns() - start
+        total = 0
+        for _ in range(calls):
+            reset()
+            start = time.perf_counter_ns()
+            op()
+            total += time.perf_counter_ns() - start - overhead
+        return total
+
+    # Calibrate on wall-clock time, so an expensive reset does not multiply the rounds
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        run(calls)
+        if time.perf_counter() - start >= min_time or calls >= 1 << 24:
+            break
+        calls *= 2
+    per_op = [max(run(calls), 0) / calls for _ in range(rounds)]
+    return {'ns_per_op': round(min(per_op), 1), 'ns_median': round(statistics.median(per_op), 1), 'calls': calls}
+
+
+def measure_memory(case: Case, calls: int) -> Dict[str, float]:
+    """
+    Measure the memory an operation allocates.
+
+    CPython does not count allocations, so two figures are reported: the peak of the
+    memory allocated by Python during one call (traced by tracemalloc, temporary
+    objects included), and the number of memory blocks still allocated after the call
+    (caches filling up or leaks).
+
+    Args:
+        case (Case): The operation.
+        calls (int): Number of calls to average over.
+
+    Returns:
+        dict: `peak_bytes` and `retained_blocks` per call.
+    """
+    op, reset = case.op, case.reset
+    retained = 0
+    for _ in range(calls):
+        if reset:
+            reset()
+        blocks = sys.getallocatedblocks()
+        op()
+        retained += sys.getallocatedblocks() - blocks
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            if reset:
+                reset()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op()
+            peak += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': round(peak / calls, 1), 'retained_blocks': round(retained / calls, 3)}
+
+
+def case_key(result: Dict[str, object]) -> str:
+    """
+    Get the key identifying a benchmark across runs, e.g. 'Grid.collides[half]', or
+    'Grid.collides[half@40x200]' on a board of another size.
+    """
+    board = result.get('board', DEFAULT_BOARD)
+    fixture = result['fixture'] if board == DEFAULT_BOARD else '{}@{}'.format(result['fixture'], board)
+    return '{}[{}]'.format(result['name'], fixture)
+
+
+def compare(results: List[Dict[str, object]], baseline: Dict[str, object]) -> Dict[str, float]:
+    """
+    Compare the results with a baseline run.
+
+    Returns:
+        dict: The relative change of ns/op of every benchmark found in both runs, in
+        percent (positive is slower).
+    """
+    before = {case_key(result): result for result in baseline['results']}
+    changes = {}
+    for result in results:
+        old = before.get(case_key(result))
+        if old and old['ns_per_op'] > 0:
+            changes[case_key(result)] = 100.0 * (result['ns_per_op'] - old['ns_per_op']) / old['ns_per_op']
+    return changes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filter', default='', help='only run the benchmarks whose key contains this text')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum duration of a round, in seconds')
+    parser.add_argument('--rounds', type=int, default=5, help='number of timed rounds per benchmark')
+    parser.add_argument('--memory-calls', type=int, default=200, help='number of calls the memory figures are averaged over')
+    parser.add_argument('--save', metavar='FILE', help='write the results to FILE as well')
+    parser.add_argument('--baseline', metavar='FILE', help='compare with the results saved in FILE')
+    parser.add_argument('--fail-above', type=float, metavar='PCT',
+                        help='exit with an error if a benchmark is more than PCT percent slower than the baseline')
+    parser.add_argument('--columns', type=int, default=COLUMNS, help='width of the fixture boards')
+    parser.add_argument('--rows', type=int, default=ROWS, help='height of the fixture boards')
+    args = parser.parse_args(argv)
+    try:
+        VIEWPORT.configure(args.columns, args.rows)
+    except ValueError as error:
+        parser.error(str(error))
+
+    board = '{}x{}'.format(args.columns, args.rows)
+    cases = [case for fixture in FIXTURES
+             for case in engine_cases(fixture, args.columns, args.rows) + render_cases(fixture, args.columns, args.rows)]
+    cases = [case for case in cases if args.filter in case_key({'name': case.name, 'fixture': case.fixture, 'board': board})]
+    overhead = timer_overhead()
+    results = []
+    for case in cases:
+        result = {'name': case.name, 'fixture': case.fixture, 'board': board}
+        result.update(time_case(case, args.min_time, args.rounds, overhead))
+        result.update(measure_memory(case, args.memory_calls))
+        results.append(result)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'timer_overhead_ns': overhead,
+        },
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    changes = {}
+    if args.baseline:
+        with open(args.baseline) as saved:
+            changes = compare(results, json.load(saved))
+    print('{:<44}{:>14}{:>14}{:>14}{:>12}'.format('benchmark', 'ns/op', 'peak B/op', 'blocks/op', 'change'), file=sys.stderr)
+    for result in results:
+        key = case_key(result)
+        change = '{:+.1f}%'.format(changes[key]) if key in changes else ''
+        print('{:<44}{:>14.1f}{:>14.1f}{:>14.3f}{:>12}'.format(
+            key, result['ns_per_op'], result['peak_bytes'], result['retained_blocks'], change), file=sys.stderr)
+
+    if args.fail_above is not None:
+        slower = [key for key, change in changes.items() if change > args.fail_above]
+        if slower:
+            print('slower than the baseline: ' + ', '.join(slower), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
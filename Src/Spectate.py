@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+"""
+Watch many games at once in one window: AI games played live, or replays.
+
+Every game runs on the headless TetrisCore engine at the speed of the game (one tick
+every TICK_MS milliseconds) and is shown in its own tile of the window. A policy game
+presses at most one key every `--action-ms` milliseconds, so the games can be followed;
+a game that ends is replaced by a new one with the next seed. A replay is played once
+and its final board stays on screen.
+
+Example:
+    python Spectate.py --games 36 --policy ai --seed 0
+    python Spectate.py ../Replays/*.pxr
+"""
+
+import sys
+import argparse
+from typing import List, Optional
+
+from Util.Constants import *
+from Util.Profiler import FrameProfiler
+from TetrisCore.Engine import Engine
+from TetrisCore.Rules import check_board_size
+from TetrisCore.Generator import PieceGenerator, UNIFORM, BAG
+from TetrisCore.Policies import POLICIES, make_policy
+from TetrisCore.Replay import ReplayReader
+from TetrisGrid.Tiles import TiledRenderer
+
+
+class PolicyGame:
+    """
+    A game played live by a policy, started again with the next seed when it ends.
+
+    Args:
+        seed (int): Seed of the first game.
+        mode (str): Generator mode.
+        policy (str): Policy name, see make_policy.
+        action_ticks (int): Ticks between two actions of the policy.
+        columns (int): Width of the board.
+        rows (int): Height of the board.
+        stride (int): Added to the seed to start the next game (the number of games shown, so seeds never repeat).
+    """
+
+    def __init__(self, seed: int, mode: str, policy: str, action_ticks: int, columns: int, rows: int, stride: int):
+        self.mode, self.policyName, self.actionTicks = mode, policy, action_ticks
+        self.columns, self.rows, self.stride = columns, rows, stride
+        self.start(seed)
+
+    def start(self, seed: int) -> None:
+        """
+        Start a new game.
+        """
+        self.seed = seed
+        self.engine = Engine(generator=PieceGenerator(seed, self.mode), columns=self.columns, rows=self.rows)
+        self.policy = make_policy(self.policyName, seed)
+
+    def step(self) -> None:
+        """
+        Advance the game by one tick, starting the next game once it ended.
+        """
+        engine = self.engine
+        # The seed staggers the games, so their policies do not all plan on the same tick
+        if (engine.counter + self.seed) % self.actionTicks == 0:
+            engine.apply(self.policy(engine))
+        engine.tick()
+        if not engine.inPlay:
+            self.start(self.seed + self.stride)
+
+
+class ReplayGame:
+    """
+    A recorded game played back tick by tick, kept on screen once it ended.
+
+    Args:
+        reader (ReplayReader): The replay.
+    """
+
+    def __init__(self, reader: ReplayReader):
+        self.reader = reader
+        self.engine = Engine(generator=reader.generator(), columns=reader.columns, rows=reader.rows)
+        self._timeline = reader.timeline()
+
+    def step(self) -> None:
+        """
+        Apply the key presses recorded before the next tick, then play the tick.
+        """
+        for tick, actions in self._timeline:
+            for action in actions:
+                self.engine.apply(action)
+            if tick < self.reader.ticks:
+                self.engine.tick()
+            else:
+                # The recording ended: the final board is shown as a game over
+                self.engine.inPlay = False
+            return
+
+
+def spectate(surface: pygame.Surface, games: List, fps: int = FPS, seconds: Optional[float] = None,
+             profiler: Optional[FrameProfiler] = None) -> int:
+    """
+    Run the games in real time and show them until the window is closed.
+
+    Parameters:
+        surface (pygame.Surface): The window surface.
+        games (list): PolicyGame and ReplayGame instances.
+        fps (int): Frame rate cap (0 draws as fast as possible).
+        seconds (float): Stop after this much game time (optional).
+        profiler (FrameProfiler): Times the phases of every frame (optional).
+
+    Returns:
+        int: The number of frames drawn.
+    """
+    tiles = TiledRenderer(surface, [game.engine for game in games])
+    clock = pygame.time.Clock()
+    accumulator = elapsed = frames = 0
+    running = True
+    while running:
+        if profiler:
+            profiler.begin_frame()
+        step = min(clock.tick(fps), MAX_FRAME_MS)
+        accumulator += step
+        elapsed += step
+        if profiler:
+            profiler.mark('wait')
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        while accumulator >= TICK_MS:
+            for game in games:
+                game.step()
+            accumulator -= TICK_MS
+        # Restarted games have a new engine
+        for index, game in enumerate(games):
+            tiles.games[index] = game.engine
+        if profiler:
+            profiler.mark('update')
+        rects = tiles.draw()
+        if profiler:
+            profiler.mark('draw')
+        # One display update per frame, for every tile drawn
+        if rects:
+            pygame.display.update(rects)
+        if profiler:
+            profiler.mark('present')
+        frames += 1
+        if seconds is not None and elapsed >= seconds * 1000:
+            running = False
+    return frames
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('replays', nargs='*', metavar='REPLAY', help='replay files to play back instead of policy games')
+    parser.add_argument('--games', type=int, default=16, help='number of policy games shown')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game, the next games use the following seeds')
+    parser.add_argument('--bag', action='store_true', help='deal pieces from shuffled 7-bags')
+    parser.add_argument('--policy', default='ai', help=f"built-in policy ({', '.join(POLICIES)}) or module:attribute")
+    parser.add_argument('--action-ms', type=int, default=100, metavar='MS', help='time between two key presses of a policy')
+    parser.add_argument('--columns', type=int, default=COLUMNS, help='width of the boards of the policy games')
+    parser.add_argument('--rows', type=int, default=ROWS, help='height of the boards of the policy games')
+    parser.add_argument('--size', type=int, nargs=2, default=(1280, 720), metavar=('WIDTH', 'HEIGHT'), help='window size')
+    parser.add_argument('--fps', type=int, default=FPS, help='frame rate cap (0 draws as fast as possible)')
+    parser.add_argument('--seconds', type=float, help='stop after this much game time')
+    parser.add_argument('--profile', action='store_true', help='time the phases of every frame and print them on exit')
+    args = parser.parse_args(argv)
+    try:
+        check_board_size(args.columns, args.rows)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.replays:
+        games = [ReplayGame(ReplayReader.load(path)) for path in args.replays]
+    else:
+        make_policy(args.policy, args.seed)
+        mode = BAG if args.bag else UNIFORM
+        action_ticks = max(1, args.action_ms // TICK_MS)
+        games = [PolicyGame(args.seed + game, mode, args.policy, action_ticks, args.columns, args.rows, args.games)
+                 for game in range(args.games)]
+
+    surface = pygame.display.set_mode(args.size)
+    pygame.display.set_caption('Pixel Tetris Horizon - Spectator')
+    profiler = FrameProfiler() if args.profile else None
+    try:
+        frames = spectate(surface, games, args.fps, args.seconds, profiler)
+    except ValueError as error:
+        parser.error(str(error))
+    if profiler:
+        print(f'{len(games)} games, {frames} frames', file=sys.stderr)
+        print(profiler.report(), file=sys.stderr)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,43 @@
 import os
 import sys
+import json
+import time
+import shutil
+import argparse
+import platform
 import subprocess
+import importlib.util
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Imported first, so that the startup timings start at launch
+from Util.Startup import STARTUP
+from TetrisCore.Engine import Engine, MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP
+from TetrisCore.Generator import PieceGenerator, UNIFORM, BAG
+from TetrisCore.Pieces import PIECE_TABLE
+from TetrisCore.Rules import COLUMNS, ROWS, TICK_MS, check_board_size
+
+# Keys read by KeyReader: escape sequences of the arrow keys, then single characters
+ARROW_KEYS = {'\x1b[A': 'up', '\x1b[B': 'down', '\x1b[C': 'right', '\x1b[D': 'left',
+              '\x1bOA': 'up', '\x1bOB': 'down', '\x1bOC': 'right', '\x1bOD': 'left'}
+# Second character of the arrow keys on the Windows console (after '\xe0' or '\x00')
+WINDOWS_ARROW_KEYS = {'H': 'up', 'P': 'down', 'M': 'right', 'K': 'left'}
+
+# Engine actions of the keys of the terminal game
+KEY_ACTIONS = {
+    'up': ROTATE, 'w': ROTATE, 'x': ROTATE,
+    'left': MOVE_LEFT, 'a': MOVE_LEFT,
+    'right': MOVE_RIGHT, 'd': MOVE_RIGHT,
+    'down': SOFT_DROP, 's': SOFT_DROP,
+    ' ': HARD_DROP,
+}
+
+# Packages needed by every frontend (the headless engine only needs the standard library)
+FRONTEND_PACKAGES = {
+    'window': ('pygame', 'colorama'),
+    'terminal': ('colorama',),
+    'headless': (),
+}
 
 
 def install(package):
@@ -15,42 +52,79 @@ def install(package):
     """
     subprocess.check_call([sys.executable, "-m", "pip", "install", package])
 
-def install_dependencies():
+def missing_packages(required: Iterable[str]) -> List[str]:
+    """
+    Find the packages that are not installed, without importing any of them.
+
+    The import system only looks the packages up (`importlib.util.find_spec`), so the
+    check costs a few file system lookups instead of the import of every package.
+
+    Args:
+        required (iterable): The names of the packages to check.
+
+    Returns:
+        list: The names of the missing packages.
+    """
+    return [package for package in required if importlib.util.find_spec(package) is None]
+
+def install_dependencies(required=FRONTEND_PACKAGES['window']):
     """
     Install required Python packages if not already installed.
 
-    This function checks if the required packages (pygame, colorama, requests) are installed.
+    This function checks if the required packages (those of the game window by default) are installed.
     If any of them are missing, it installs them using the `install` function.
 
+    Args:
+        required (iterable): The names of the packages to check.
+
     Returns:
-        None
+        list: The names of the packages installed.
     """
-    required = ["pygame", "colorama", "requests"]
-    for package in required:
-        try:
-            __import__(package)
-        except ImportError:
-            print(f"Installing missing package: {package}")
-            install(package)
+    missing = missing_packages(required)
+    for package in missing:
+        print(f"Installing missing package: {package}")
+        install(package)
+    if missing:
+        # Let the import system see the new packages
+        importlib.invalidate_caches()
+    return missing
 
-def run_tetris():
+def run_tetris(argv=None):
     """
-    Run the Tetris game script.
+    Run the Tetris game (Tetris.py) in this process.
+
+    The game module is imported and its `main` called with the options, so the game
+    does not pay for the startup of a second interpreter.
 
-    This function attempts to run the Tetris game script (Tetris.py) using the Python interpreter.
-    It checks if the script exists in the same directory as this script and runs it.
+    Args:
+        argv (list): The command line options of Tetris.py (optional).
 
     Returns:
         None
     """
-    try:
-        # Get the directory of the current script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        tetris_path = os.path.join(script_dir, 'Tetris.py')
+    import Tetris
+    Tetris.main(argv)
+
+def play_headless(seed: Optional[int] = None, mode: str = UNIFORM, policy: str = 'ai', max_ticks: int = 360000,
+                  columns: int = COLUMNS, rows: int = ROWS) -> Dict[str, object]:
+    """
+    Play one game on the headless engine with a policy, without any output.
+
+    Args:
+        seed (int): Seed of the piece sequence (optional).
+        mode (str): Generator mode.
+        policy (str): Policy name, see TetrisCore.Policies.make_policy.
+        max_ticks (int): Tick limit of the game.
+        columns (int): Width of the board.
+        rows (int): Height of the board.
 
-        subprocess.run([sys.executable, tetris_path], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"An error occurred while trying to run Tetris.py: {e}")
+    Returns:
+        dict: The result of the game, as printed by Batch.py.
+    """
+    from Batch import play_game
+    # There is no frame to present: the game is ready once its first step can run
+    STARTUP.first_frame()
+    return play_game((seed, mode, policy, max_ticks, columns, rows))
 
 def print_tetris_ascii():
     """
@@ -75,7 +149,439 @@ def print_tetris_ascii():
     print(f"{Fore.BLACK}║████══███                                                 ████══██████║{Fore.RESET}")
     print(f"{Fore.BLACK}╚████══███═══███══███████══█████████══█████████══███████═══████══██████╝{Fore.RESET}")
 
+class KeyReader:
+    """
+    Reads the keys pressed in the terminal without blocking and without echoing them.
+
+    On POSIX systems the terminal is switched to cbreak mode while the reader is open,
+    and `read` waits on the standard input with `select`, so a game loop can sleep
+    until its next tick and still wake up as soon as a key is pressed. The escape
+    sequences of the arrow keys may arrive split over several reads on a slow link;
+    an incomplete sequence is kept until the rest of it arrives. On Windows the keys
+    come from `msvcrt`.
+
+    Keys are returned as their character, or as 'up', 'down', 'left' and 'right'.
+
+    Example:
+        To wait at most 10 milliseconds for keys:
+
+        >>> with KeyReader() as keys:
+        ...     pressed = keys.read(0.01)
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdin
+        self.windows = platform.system() == "Windows"
+        self._saved = None
+        self._pending = ''
+
+    def __enter__(self) -> 'KeyReader':
+        if not self.windows and self.stream.isatty():
+            import termios
+            import tty
+            self._saved = termios.tcgetattr(self.stream)
+            tty.setcbreak(self.stream)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._saved is not None:
+            import termios
+            termios.tcsetattr(self.stream, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def read(self, timeout: float = 0) -> List[str]:
+        """
+        Get the keys pressed since the last call, waiting for one at most `timeout` seconds.
+
+        Args:
+            timeout (float): The longest wait in seconds (0 returns at once).
+
+        Returns:
+            list: The keys, in the order they were pressed.
+        """
+        if self.windows:
+            return self._read_windows(timeout)
+        import select
+        data = ''
+        ready, _, _ = select.select([self.stream], [], [], timeout)
+        while ready:
+            chunk = os.read(self.stream.fileno(), 1024)
+            if not chunk:
+                break
+            data += chunk.decode('utf-8', 'ignore')
+            ready, _, _ = select.select([self.stream], [], [], 0)
+        return self._parse(self._pending + data)
+
+    def _parse(self, data: str) -> List[str]:
+        """
+        Split the characters read into keys, keeping an incomplete escape sequence for the next read.
+        """
+        keys = []
+        self._pending = ''
+        while data:
+            if data[0] == '\x1b':
+                sequence = data[:3]
+                if sequence in ARROW_KEYS:
+                    keys.append(ARROW_KEYS[sequence])
+                    data = data[3:]
+                    continue
+                if len(data) < 3 and data in ('\x1b', '\x1b[', '\x1bO'):
+                    self._pending = data
+                    break
+            keys.append(data[0])
+            data = data[1:]
+        return keys
+
+    def _read_windows(self, timeout: float) -> List[str]:
+        """
+        Get the keys waiting in the Windows console, polling it until one comes or the timeout passes.
+        """
+        import msvcrt
+        deadline = time.perf_counter() + timeout
+        while not msvcrt.kbhit() and time.perf_counter() < deadline:
+            time.sleep(0.002)
+        keys = []
+        while msvcrt.kbhit():
+            key = msvcrt.getwch()
+            if key in ('\xe0', '\x00'):
+                key = WINDOWS_ARROW_KEYS.get(msvcrt.getwch(), '')
+            if key:
+                keys.append(key)
+        return keys
+
+
+class TerminalRenderer:
+    """
+    Draws an engine game in the terminal with ANSI colors, sending only the cells that changed.
+
+    The frame is composed into a buffer of `(style, character)` cells: the board with
+    two rows per text line (each character is an upper half block, its foreground
+    color being the upper cell and its background the lower one), the falling piece,
+    its shadow and the HUD (score, level, lines, next piece). The buffer is compared
+    with the previous frame row by row, and only the runs of changed cells are sent,
+    each one after a cursor move; the color codes are only sent when the color
+    changes. Nearby runs are merged when repainting the cells between them is shorter
+    than moving the cursor. A frame where nothing changed sends nothing.
+
+    Args:
+        stream: The text stream to write to (the standard output by default).
+
+    Attributes:
+        frames (int): Number of frames that sent something.
+        bytes (int): Number of characters sent.
+
+    Methods:
+        open() / close(): Switch to the alternate screen and back.
+        draw(engine, status): Send the changes of a frame.
+        invalidate(): Paint the whole screen again on the next frame.
+        size(columns, rows): Text lines and columns taken by a board.
+
+    Example:
+        To draw a game:
+
+        >>> renderer = TerminalRenderer()
+        >>> renderer.open()
+        >>> renderer.draw(engine)
+    """
+
+    # Shadow of the falling piece, after the seven piece colors
+    GHOST = 8
+    hud_width = 16
+    # Unchanged cells repainted rather than moving the cursor over them
+    merge_gap = 4
+
+    def __init__(self, stream=None):
+        from colorama import Fore, Back, Style
+        self.stream = stream if stream is not None else sys.stdout
+        fores = [Fore.BLACK, Fore.RED, Fore.GREEN, Fore.BLUE, Fore.YELLOW, Fore.CYAN, Fore.MAGENTA,
+                 Fore.LIGHTYELLOW_EX, Fore.LIGHTBLACK_EX]
+        backs = [Back.BLACK, Back.RED, Back.GREEN, Back.BLUE, Back.YELLOW, Back.CYAN, Back.MAGENTA,
+                 Back.LIGHTYELLOW_EX, Back.LIGHTBLACK_EX]
+        # Style of a half block by the colors of its upper and lower cells
+        self.pairs = [[fore + back for back in backs] for fore in fores]
+        self.wall = Fore.WHITE + Back.RESET
+        self.label = Fore.LIGHTBLACK_EX + Back.RESET
+        self.value = Fore.LIGHTWHITE_EX + Back.RESET
+        self.status = {'GAME OVER': Fore.LIGHTRED_EX + Back.RESET, 'PAUSED': Fore.LIGHTYELLOW_EX + Back.RESET}
+        self.reset = Style.RESET_ALL
+        self.frames = 0
+        self.bytes = 0
+        self._frame: Optional[List[List[Tuple[str, str]]]] = None
+
+    @classmethod
+    def size(cls, columns: int, rows: int) -> Tuple[int, int]:
+        """
+        Get the text columns and lines taken by a board and the HUD.
+        """
+        return columns + 2 + cls.hud_width, max((rows + 1) // 2 + 1, 12)
+
+    def open(self) -> None:
+        """
+        Switch to the alternate screen, hide the cursor and clear the screen.
+        """
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+        self._write('\x1b[?1049h\x1b[?25l' + self.reset + '\x1b[2J')
+        self.invalidate()
+
+    def close(self) -> None:
+        """
+        Reset the colors, show the cursor and go back to the normal screen.
+        """
+        self._write(self.reset + '\x1b[?25h\x1b[?1049l')
+
+    def invalidate(self) -> None:
+        """
+        Paint every cell again on the next frame (e.g. after the screen was cleared).
+        """
+        self._frame = None
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+        self.bytes += len(text)
+
+    def compose(self, engine: Engine, status: str = '') -> List[List[Tuple[str, str]]]:
+        """
+        Compose the cells of a frame.
+
+        Args:
+            engine (Engine): The game to draw.
+            status (str): A status shown in the HUD ('GAME OVER', 'PAUSED' or '').
+
+        Returns:
+            list: The text lines, as lists of `(style, character)` cells.
+        """
+        board = engine.board
+        columns, rows = board.columns, board.rows
+        colors = [list(board.rowColors(row)) for row in range(rows)]
+        if engine.inPlay:
+            mask = PIECE_TABLE[engine.clr][engine.rot]
+            left = engine.col - board.col
+            ghost = engine.ghost_row()
+            for clr, top in ((self.GHOST, ghost), (engine.clr, engine.row)):
+                for dc, dr in zip(mask.colOffsets, mask.rowOffsets):
+                    if 0 <= top + dr < rows and 0 <= left + dc < columns:
+                        colors[top + dr][left + dc] = clr
+        if rows % 2:
+            colors.append([0] * columns)
+
+        width, height = self.size(columns, rows)
+        blank = (self.reset, ' ')
+        wall = (self.wall, '█')
+        pairs = self.pairs
+        lines = []
+        for row in range(0, rows, 2):
+            line = [wall]
+            line.extend((pairs[upper][lower], '▀') for upper, lower in zip(colors[row], colors[row + 1]))
+            line.append(wall)
+            lines.append(line)
+        lines.append([(self.wall, '▀')] * (columns + 2))
+        for line in lines:
+            line.extend([blank] * (width - len(line)))
+        lines.extend([blank] * width for _ in range(height - len(lines)))
+
+        # HUD, to the right of the board
+        left = columns + 4
+        for index, (name, value) in enumerate((('SCORE', engine.score), ('LEVEL', engine.level + 1), ('LINES', engine.lines))):
+            self._text(lines[index * 2], left, name, self.label)
+            self._text(lines[index * 2 + 1], left, str(value), self.value)
+        self._text(lines[6], left, 'NEXT', self.label)
+        preview = PIECE_TABLE[engine.nextShapeNo][0]
+        cells = [[0] * 4 for _ in range(4)]
+        for dc, dr in zip(preview.colOffsets, preview.rowOffsets):
+            cells[dr - preview.minRow][dc - preview.minCol] = engine.nextShapeNo
+        for index in range(2):
+            lines[7 + index][left:left + 4] = [(pairs[upper][lower], '▀') for upper, lower in
+                                               zip(cells[index * 2], cells[index * 2 + 1])]
+        if status:
+            self._text(lines[10], left, status, self.status[status])
+        self._text(lines[11], left, 'q quit p pause', self.label)
+        return lines
+
+    @staticmethod
+    def _text(line: List[Tuple[str, str]], left: int, text: str, style: str) -> None:
+        """
+        Write a text into a line of cells.
+        """
+        line[left:left + len(text)] = [(style, char) for char in text][:max(len(line) - left, 0)]
+
+    def draw(self, engine: Engine, status: str = '') -> int:
+        """
+        Send the cells of a frame that differ from the previous frame.
+
+        Args:
+            engine (Engine): The game to draw.
+            status (str): A status shown in the HUD ('GAME OVER', 'PAUSED' or '').
+
+        Returns:
+            int: Number of characters sent (0 if nothing changed).
+        """
+        frame = self.compose(engine, status)
+        previous = self._frame if self._frame is not None and len(self._frame) == len(frame) else None
+        out = []
+        style = None
+        for y, (line, old) in enumerate(zip_longest(frame, previous or ())):
+            if line == old:
+                continue
+            if old is None or len(old) != len(line):
+                changed = list(range(len(line)))
+            else:
+                changed = [x for x, (cell, was) in enumerate(zip(line, old)) if cell != was]
+            # Runs of changed cells, merged across short gaps of unchanged ones
+            runs = []
+            for x in changed:
+                if runs and x - runs[-1][1] <= self.merge_gap:
+                    runs[-1][1] = x
+                else:
+                    runs.append([x, x])
+            for start, end in runs:
+                out.append('\x1b[{};{}H'.format(y + 1, start + 1))
+                for cell_style, char in line[start:end + 1]:
+                    if cell_style != style:
+                        out.append(cell_style)
+                        style = cell_style
+                    out.append(char)
+        self._frame = frame
+        if not out:
+            return 0
+        text = ''.join(out)
+        self._write(text)
+        self.frames += 1
+        return len(text)
+
+
+def play_in_terminal(seed: Optional[int] = None, mode: str = UNIFORM, columns: int = COLUMNS, rows: int = ROWS) -> TerminalRenderer:
+    """
+    Play a game in the terminal on the headless engine.
+
+    The loop sleeps until the next tick or the next key press, whichever comes first,
+    and only draws when the state of the game changed.
+
+    Args:
+        seed (int): Seed of the piece sequence (optional).
+        mode (str): Generator mode.
+        columns (int): Width of the board.
+        rows (int): Height of the board.
+
+    Returns:
+        TerminalRenderer: The renderer, with the number of frames and characters sent.
+    """
+    def new_game(seed):
+        return Engine(generator=PieceGenerator(seed, mode), columns=columns, rows=rows)
+
+    engine = new_game(seed)
+    renderer = TerminalRenderer()
+    tick = TICK_MS / 1000
+    status = ''
+    drawn = None
+    renderer.open()
+    try:
+        with KeyReader() as keys:
+            next_tick = time.perf_counter()
+            while True:
+                for key in keys.read(max(0.0, next_tick - time.perf_counter())):
+                    if key == 'q':
+                        return renderer
+                    elif key == '\x0c':
+                        # Ctrl+L repaints the screen, e.g. after another program wrote on it
+                        renderer.invalidate()
+                        drawn = None
+                    elif key == 'p' and status != 'GAME OVER':
+                        status = '' if status else 'PAUSED'
+                    elif key == 'r' and status == 'GAME OVER':
+                        seed = seed + 1 if seed is not None else None
+                        engine, status = new_game(seed), ''
+                    elif not status and key in KEY_ACTIONS:
+                        engine.apply(KEY_ACTIONS[key])
+                now = time.perf_counter()
+                if status:
+                    next_tick = now + tick
+                else:
+                    # Catch up on at most a quarter second, then drop the time lost
+                    next_tick = max(next_tick, now - 0.25)
+                    while next_tick <= now and not status:
+                        engine.tick()
+                        next_tick += tick
+                        if not engine.inPlay:
+                            status = 'GAME OVER'
+                state = (engine, engine.board.version, engine.clr, engine.rot, engine.col, engine.row,
+                         engine.score, status)
+                if state != drawn:
+                    renderer.draw(engine, status)
+                    STARTUP.first_frame()
+                    drawn = state
+    finally:
+        renderer.close()
+
+
+def main(argv=None) -> None:
+    """
+    Check the packages of the chosen frontend, then play in the same process.
+
+    Args:
+        argv (list): The command line options (optional, sys.argv by default).
+    """
+    parser = argparse.ArgumentParser(description="Pixel Tetris Horizon launcher",
+                                     epilog="Other options are passed to Tetris.py by the window frontend.")
+    parser.add_argument("--frontend", choices=tuple(FRONTEND_PACKAGES), default="window",
+                        help="play in the game window, in the terminal (ANSI colors), or headless (one AI game, result as JSON)")
+    parser.add_argument("--terminal", action="store_const", dest="frontend", const="terminal", help="same as --frontend terminal")
+    parser.add_argument("--seed", type=int, help="seed of the piece sequence")
+    parser.add_argument("--bag", action="store_true", help="deal pieces from shuffled 7-bags")
+    parser.add_argument("--columns", type=int, default=COLUMNS, help="width of the board")
+    parser.add_argument("--rows", type=int, default=ROWS, help="height of the board")
+    parser.add_argument("--policy", default="ai", help="policy of the headless game")
+    parser.add_argument("--max-ticks", type=int, default=360000, help="tick limit of the headless game")
+    parser.add_argument("--stats", action="store_true", help="print the frames and characters sent to the terminal on exit")
+    parser.add_argument("--no-install", action="store_true", help="report missing packages instead of installing them with pip")
+    parser.add_argument("--startup-report", action="store_true", help="print where the time to the first frame went")
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.frontend != "window":
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    try:
+        check_board_size(args.columns, args.rows)
+    except ValueError as error:
+        parser.error(str(error))
+
+    with STARTUP.phase('preflight'):
+        missing = missing_packages(FRONTEND_PACKAGES[args.frontend])
+    if missing:
+        if args.no_install:
+            parser.error(f"missing packages: {', '.join(missing)} (pip install {' '.join(missing)})")
+        install_dependencies(missing)
+
+    mode = BAG if args.bag else UNIFORM
+    try:
+        if args.frontend == "window":
+            print_tetris_ascii()
+            options = list(rest) + ["--columns", str(args.columns), "--rows", str(args.rows)]
+            if args.seed is not None:
+                options += ["--seed", str(args.seed)]
+            if args.bag:
+                options.append("--bag")
+            if args.startup_report:
+                options.append("--startup-report")
+            run_tetris(options)
+        elif args.frontend == "terminal":
+            width, height = TerminalRenderer.size(args.columns, args.rows)
+            available = shutil.get_terminal_size()
+            if width > available.columns or height > available.lines:
+                parser.error(f"the board needs a terminal of {width} x {height} characters, this one is "
+                             f"{available.columns} x {available.lines}")
+            renderer = play_in_terminal(args.seed, mode, args.columns, args.rows)
+            if args.stats:
+                print(f"{renderer.frames} frames, {renderer.bytes} characters sent "
+                      f"({renderer.bytes / max(renderer.frames, 1):.0f} per frame)")
+        else:
+            print(json.dumps(play_headless(args.seed, mode, args.policy, args.max_ticks, args.columns, args.rows)))
+    finally:
+        # The window prints its own report on the first frame when asked to
+        if args.startup_report and args.frontend != "window" and STARTUP.firstFrame is not None:
+            print(STARTUP.report(), file=sys.stderr)
+        if STARTUP.firstFrame is not None:
+            print(f"launch to first frame: {STARTUP.firstFrame * 1000:.1f} ms", file=sys.stderr)
+
+
 if __name__ == '__main__':
-    install_dependencies()
-    print_tetris_ascii()
-    run_tetris()
+    main()
@@ -1,44 +1,88 @@
 #!/usr/bin/python3
 
-import pygame
-from random import randint
+import os
+import sys
+import time
+import argparse
+from Util.Startup import STARTUP
+
+with STARTUP.phase('import pygame'):
+    import pygame
 
 from Util.Constants import *
+from Util.Assets import play_music
+from Util.Profiler import FrameProfiler
+from Util.Input import InputHandler, DAS_MS, ARR_MS
 from Util.GameState import GameState
 from Util.Windows import IntroScreen, OutroScreen
+from Util.Frontend import EngineFrontend
+from TetrisCore.Generator import PieceGenerator, UNIFORM, BAG
+from TetrisCore.Replay import ReplayReader, ReplayWriter
+from TetrisCore.Autoplay import AutoPlayer
 
 from TetrisGrid.Grid import Grid
+from TetrisGrid.Renderer import DirtyRenderer
+from TetrisGrid.Viewport import VIEWPORT
 from TetrisGrid.Wall import Wall
 from TetrisGrid.Floor import Floor
-from TetrisPiece.Shape import Shape
+from TetrisPiece.Ghost import Ghost
 
 from TetrisPiece.Obstacles import Obstacles
 from TetrisPiece.MovePiece import MovePiece
 
+# The key of every engine action, to press the keys chosen by the AI or stored in a replay
+ACTION_KEYS = {action: key for key, action in EngineFrontend.KEY_ACTIONS.items()}
+
 class TetrisGame:
-    def __init__(self):
+    def __init__(self, fps=FPS, dirty_rendering=DIRTY_RENDERING, seed=None, mode=UNIFORM, record_dir=None,
+                 autoplay=False, profile=False, das_ms=DAS_MS, arr_ms=ARR_MS, columns=COLUMNS, rows=ROWS):
         self.grid = Grid()
-        self.floor = Floor(LEFT, ROWS, COLUMNS)
-        self.left_wall = Wall(LEFT - 1, 0, ROWS)
-        self.right_wall = Wall(RIGHT, 0, ROWS)
-        
-        self.game_state = GameState()
-        self.shape_no = randint(1, 7)
+        self.renderer = DirtyRenderer() if dirty_rendering else None
+        self.set_board_size(columns, rows)
         
-        self.game_state.shape = Shape(MIDDLE, TOP, self.shape_no)
-        self.obstacles = Obstacles(LEFT, FLOOR, 0)
+        # One piece sequence for the whole session, so a seed replays every game
+        self.generator = PieceGenerator(seed, mode)
+        # Every game is written to a replay log in this directory, if given
+        self.record_dir = record_dir
+        self.recorder = None
+        self.games = 0
+        # The AI presses one key per frame through the same paths as the keyboard
+        self.autoplayer = AutoPlayer() if autoplay else None
+        # Times the phases of every frame, F3 shows them over the game
+        self.profiler = FrameProfiler() if profile else None
+        # Key presses and the auto-repeat of held keys, read at the start of every frame
+        self.inputs = InputHandler(das_ms, arr_ms)
+        self.new_game()
         
         self.intro_screen = IntroScreen(screen, intro_screen)
-        self.outro_screen = OutroScreen(screen, outro_screen)
+        self.outro_screen = OutroScreen(screen, outro_screen, reset=self.new_game)
         
         self.in_play = False
         self.has_played = False
+        self.fps = fps
+
+    def set_board_size(self, columns, rows):
+        """Play the next games on a board of another size, scrolled when it is taller than the window"""
+        VIEWPORT.configure(columns, rows)
+        self.columns, self.rows = columns, rows
+        self.floor = Floor(LEFT, rows, columns)
+        self.left_wall = Wall(LEFT - 1, 0, rows)
+        self.right_wall = Wall(LEFT + columns, 0, rows)
+
+    def new_game(self):
+        """Start a new game on an empty board, continuing the piece sequence"""
+        self.game_snapshot = self.generator.snapshot()
+        self.game_state = GameState(self.generator, self.columns)
+        self.game_state.shape = self.game_state.next_shape()
+        self.obstacles = Obstacles(LEFT, TOP + self.rows, 0, self.columns, self.rows)
+        self.ghost = Ghost()
 
     def process_key_events(self, event):
-        """Handle keyboard events for controlling the game pieces"""
+        """Handle keyboard events for controlling the game pieces, return True if the game state changed"""
         # Retrieve current shape and the number of the next shape
         shape = self.game_state.shape
         next_shape_no = self.game_state.nextShapeNo
+        before = (shape.col, shape.row, shape._rot)
 
         # Rotate, move left/right, and drop the piece based on key press
         if event.key == pygame.K_UP:
@@ -50,68 +94,181 @@ class TetrisGame:
         elif event.key == pygame.K_DOWN:
             MovePiece.drop_piece(shape, self.floor, self.obstacles, next_shape_no)
         elif event.key == pygame.K_SPACE:
+            # A hard drop always locks the piece
             self.game_state.drop_instant_piece(self.obstacles, self.floor, line_remove, tetris_remove)
+            return True
+        else:
+            return False
+        # Moves and rotations are rejected when the target is not free
+        return (shape.col, shape.row, shape._rot) != before
 
 
-    def update_game_state(self, counter):
-        """Update the game state based on the game loop counter"""
-        # Create a shadow of the current shape for visual aid
-        shadow = Shape(self.game_state.shape.col, self.game_state.shape.row, self.game_state.shape.clr, self.game_state.shape._rot, True)
-        # Continuously drop the shadow shape
-        MovePiece.drop(shadow, self.floor, self.obstacles, slow_hit)
-
-        # Handle the movement of the active shape based on the game counter
-        if counter % LEVELS[self.game_state.level] == 0:
-            # Move the shape down by one row
-            self.game_state.shape.move_down()
-            # Check for collision with the floor or other shapes
-            if self.game_state.shape.collides(self.floor) or self.game_state.shape.collides(self.obstacles):
-                # Move the shape back up and add it to the list of obstacles
-                self.game_state.shape.move_up()
-                self.obstacles.append(self.game_state.shape)
+    def update_game_state(self):
+        """Advance the game state by one fixed simulation step of TICK_MS milliseconds"""
+        # Move the active shape down once the gravity period of the current level has elapsed
+        if self.game_state.advance_gravity(TICK_MS):
+            shape = self.game_state.shape
+            # Move the shape down by one row if the row below is free
+            if shape.fits(self.obstacles, shape.col, shape.row + 1, shape._rot):
+                shape.move_down()
+            else:
+                # Lock the shape in place by adding it to the obstacles
+                self.obstacles.append(shape)
+                self.game_state.pieces += 1
                 # Play sound effect for shape placement
-                pygame.mixer.Channel(5).play(slow_hit)
+                slow_hit.play(5)
                 # Update the game score and handle line removals
                 self.game_state.update_score_and_sound_effects(self.obstacles, line_remove, tetris_remove)
                 # Spawn a new shape and check if the game should continue
-                shape_no = self.game_state.nextShapeNo
-                self.game_state.nextShapeNo = randint(1, 7)
+                next_shape = self.game_state.next_shape()
                 if self.game_state.shape.row > 1:
-                    self.game_state.shape = Shape(MIDDLE, TOP, shape_no)
+                    self.game_state.shape = next_shape
                 else:
                     self.game_state.inPlay = False
 
         # Update the game level and reset Tetris combo flag
         self.game_state.level = self.game_state.update_level()
         self.game_state.prevTetris = False
-        return shadow
 
     def handle_event(self, event):
-        """Handle different types of events"""
+        """Handle different types of events, return True if a key press changed the game state"""
         if event.type == pygame.QUIT:
             self.game_state.inPlay = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler:
+            self.profiler.overlay = not self.profiler.overlay
         elif event.type == pygame.KEYDOWN:
-            self.process_key_events(event)
+            # A key press after the game ended is neither applied nor recorded
+            if not self.game_state.inPlay:
+                return False
+            if self.recorder:
+                action = EngineFrontend.KEY_ACTIONS.get(event.key)
+                if action is not None:
+                    self.recorder.action(action)
+            return self.process_key_events(event)
+        return False
+
+    def autoplay_event(self):
+        """Get the key press the AI chooses for the falling piece"""
+        shape = self.game_state.shape
+        action = self.autoplayer.next_action(self.obstacles, shape.clr, shape._rot, shape.col, shape.row,
+                                             self.game_state.pieces)
+        return pygame.event.Event(pygame.KEYDOWN, key=ACTION_KEYS[action])
+
+    def start_recording(self):
+        """Open the replay log of the game about to be played, if recording is enabled"""
+        if self.record_dir is None:
+            return None
+        os.makedirs(self.record_dir, exist_ok=True)
+        self.games += 1
+        name = "{}-{}.pxr".format(time.strftime("%Y%m%d-%H%M%S"), self.games)
+        return ReplayWriter(open(os.path.join(self.record_dir, name), "wb"), self.generator, self.game_snapshot,
+                            self.columns, self.rows)
+
+    def load_assets(self):
+        """Resolve the game assets once per game (the first game loads them)"""
+        return grid_img.get(), tetris_img.get(), [img.get() for img in block_img], font.get()
+
+    def draw_frame(self, assets, present=True):
+        """Redraw the screen with updated game elements"""
+        grid_surface, tetris_surface, block_surfaces, game_font = assets
+        shadow = self.ghost.update(self.game_state.shape, self.obstacles)
+        redraw = self.renderer.redraw if self.renderer else self.grid.redraw_screen
+        redraw(screen,
+               grid_surface, tetris_surface,
+               self.game_state.shape, shadow, self.obstacles, block_surfaces,
+               self.game_state.nextShapeNo, self.game_state.score, self.game_state.level,
+               game_font, present)
+
+    def present_frame(self, extra=()):
+        """Present a frame drawn with draw_frame(present=False), plus the extra regions drawn since"""
+        if self.renderer:
+            self.renderer.present(list(extra))
+        else:
+            pygame.display.flip()
 
     def main_game_loop(self):
-        state = 0
+        clock = pygame.time.Clock()
+        accumulator = 0
+        if self.renderer:
+            # The intro screen covered the window, so the first frame is repainted in full
+            self.renderer.invalidate()
+        assets = self.load_assets()
+        self.recorder = self.start_recording()
+        profiler = self.profiler
+        inputs = self.inputs
+        # Keys released on the intro or outro screen must not keep repeating
+        inputs.release_all()
         while self.game_state.inPlay:
-            # Update the game state
-            shadow = self.update_game_state(state)
-            # Handle all events in the event queue
-            for event in pygame.event.get():
-                self.handle_event(event)
-            state += 1
-            # Redraw the screen with updated game elements
-            self.grid.redraw_screen(screen,
-                                    grid_img, tetris_img, 
-                                    self.game_state.shape, shadow, self.obstacles, block_img,
-                                    self.game_state.nextShapeNo, self.game_state.score, self.game_state.level,
-                                    font)
+            if profiler:
+                profiler.begin_frame()
+            # Wait for the frame cap and collect the real time elapsed since the last frame
+            accumulator += min(clock.tick(self.fps), MAX_FRAME_MS)
+            if profiler:
+                profiler.mark('wait')
+            # Handle the input first, so a key press is not held back by the simulation steps
+            for event, stamp in inputs.poll():
+                # Only the key presses that changed the game state count for the input latency
+                if self.handle_event(event):
+                    inputs.applied(stamp)
+            if self.autoplayer and self.game_state.inPlay:
+                self.handle_event(self.autoplay_event())
+            if profiler:
+                profiler.mark('events')
+            # Run as many fixed simulation steps as the elapsed time covers
+            while accumulator >= TICK_MS and self.game_state.inPlay:
+                self.update_game_state()
+                if self.recorder:
+                    self.recorder.tick()
+                accumulator -= TICK_MS
+            if profiler:
+                profiler.mark('update')
+                self.draw_frame(assets, present=False)
+                profiler.mark('draw')
+                # The overlay is only on screen while the frame is presented
+                self.present_frame([profiler.draw_overlay(screen)])
+                profiler.restore_overlay(screen)
+                profiler.mark('present')
+            else:
+                self.draw_frame(assets)
+            inputs.presented()
+        if self.recorder:
+            self.recorder.finish(self.game_state.score, self.game_state.lines, self.game_state.pieces)
+            self.recorder = None
         return self.game_state 
 
+    def play_replay(self, replay):
+        """Re-simulate a recorded game in real time, feeding its key presses to the game"""
+        self.generator = replay.generator()
+        self.set_board_size(replay.columns, replay.rows)
+        self.new_game()
+        timeline = replay.timeline()
+        clock = pygame.time.Clock()
+        accumulator = 0
+        playing = True
+        if self.renderer:
+            self.renderer.invalidate()
+        assets = self.load_assets()
+        while playing:
+            accumulator += min(clock.tick(self.fps), MAX_FRAME_MS)
+            while accumulator >= TICK_MS and playing:
+                # Key presses recorded before this tick, then the tick itself
+                tick, actions = next(timeline)
+                for action in actions:
+                    self.process_key_events(pygame.event.Event(pygame.KEYDOWN, key=ACTION_KEYS[action]))
+                if tick == replay.ticks:
+                    playing = False
+                else:
+                    self.update_game_state()
+                    accumulator -= TICK_MS
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    playing = False
+            self.draw_frame(assets)
+        return self.game_state
+
 
     def run(self):
+        play_music(music_files)
         while True:
             if not self.in_play:
                 pygame.display.set_caption("Pixel Tetris Horizon")
@@ -133,7 +290,65 @@ class TetrisGame:
             if not self.in_play and not self.has_played:
                 break  # Exit the game
 
-if __name__ == "__main__":
-    tetris_game = TetrisGame()
-    tetris_game.run()
+class EngineTetrisGame(TetrisGame):
+    """TetrisGame whose rules run in the headless TetrisCore engine"""
+    def new_game(self):
+        """Start a new engine game, continuing the piece sequence"""
+        self.game_snapshot = self.generator.snapshot()
+        self.game_state = EngineFrontend(generator=self.generator, columns=self.columns, rows=self.rows)
+        self.obstacles = self.game_state.obstacles
+        self.ghost = self.game_state.ghost
+
+    def process_key_events(self, event):
+        """Translate the key press into an engine action, return True if the game state changed"""
+        return bool(self.game_state.process_key(event.key))
+
+    def update_game_state(self):
+        """Advance the engine by one simulation step"""
+        self.game_state.tick()
+
+def main(argv=None):
+    """Parse the command line options and play, in a window"""
+    parser = argparse.ArgumentParser(description="Pixel Tetris Horizon")
+    parser.add_argument("--engine", action="store_true", help="run the rules in the headless TetrisCore engine")
+    parser.add_argument("--seed", type=int, help="seed of the piece sequence")
+    parser.add_argument("--bag", action="store_true", help="deal pieces from shuffled 7-bags")
+    parser.add_argument("--record", metavar="DIR", help="write a replay log of every game to DIR")
+    parser.add_argument("--replay", metavar="FILE", help="play a replay log back in real time, then exit")
+    parser.add_argument("--autoplay", action="store_true", help="let the AI play the falling pieces")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the phases of every frame (F3 shows them) and print them with the input latency on exit")
+    parser.add_argument("--das", type=int, default=DAS_MS, metavar="MS", help="delay before a held key repeats")
+    parser.add_argument("--arr", type=int, default=ARR_MS, metavar="MS", help="time between two repeats of a held key")
+    parser.add_argument("--trace", metavar="FILE", help="profile and save a Chrome/Perfetto trace of the frames to FILE on exit")
+    parser.add_argument("--startup-report", action="store_true", help="print where the time to the intro screen went")
+    parser.add_argument("--columns", type=int, default=COLUMNS, help="width of the board")
+    parser.add_argument("--rows", type=int, default=ROWS, help="height of the board (taller boards scroll)")
+    args = parser.parse_args(argv)
+    try:
+        VIEWPORT.configure(args.columns, args.rows)
+    except ValueError as error:
+        parser.error(str(error))
+
+    STARTUP.verbose = args.startup_report
+    game_class = EngineTetrisGame if args.engine else TetrisGame
+    tetris_game = game_class(seed=args.seed, mode=BAG if args.bag else UNIFORM, record_dir=args.record,
+                             autoplay=args.autoplay, profile=args.profile or bool(args.trace),
+                             das_ms=args.das, arr_ms=args.arr, columns=args.columns, rows=args.rows)
+    try:
+        if args.replay:
+            pygame.display.set_caption("Pixel Tetris Horizon - Replay")
+            tetris_game.play_replay(ReplayReader.load(args.replay))
+        else:
+            tetris_game.run()
+    finally:
+        if tetris_game.profiler:
+            print(tetris_game.profiler.report(), file=sys.stderr)
+            print(tetris_game.inputs.report(), file=sys.stderr)
+            if args.trace:
+                tetris_game.profiler.write_trace(args.trace)
     pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
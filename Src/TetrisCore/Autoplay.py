@@ -0,0 +1,269 @@
+# Placement search and heuristic player for autoplay and headless stress runs.
+# This module must not import pygame.
+from typing import List, NamedTuple, Optional
+
+from .Board import Board
+from .Pieces import PIECE_TABLE
+from .Engine import MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP
+
+
+class Placement(NamedTuple):
+    """
+    A final resting position of the falling piece and the way to reach it.
+
+    The piece is rotated at its current position, moved sideways to `col`, then either
+    hard-dropped, or (for a tuck) soft-dropped down to `tuckRow`, moved sideways to
+    `tuckCol` under an overhang and hard-dropped from there.
+
+    Attributes:
+        rot (int): Rotation state of the placement.
+        col (int): Anchor column reached before dropping.
+        tuckRow (int): Row where the tuck starts, None for a straight drop.
+        tuckCol (int): Anchor column of the placement after the tuck.
+        row (int): Anchor row where the piece lands.
+        score (float): Heuristic value of the board after the placement.
+    """
+    rot: int
+    col: int
+    tuckRow: Optional[int]
+    tuckCol: int
+    row: int
+    score: float
+
+
+class Weights(NamedTuple):
+    """
+    Weights of the board features scored by the heuristic.
+    """
+    height: float = -0.510066
+    lines: float = 0.760666
+    holes: float = -0.35663
+    bumpiness: float = -0.184483
+
+
+def evaluate(rows: List[int], columns: int, weights: Weights) -> float:
+    """
+    Score a board given as row bitmasks: full rows are counted as cleared lines, then the
+    aggregate height, holes and bumpiness of the remaining rows are weighed.
+
+    Args:
+        rows (list): One occupancy bitmask per row, top to bottom.
+        columns (int): The width of the board.
+        weights (Weights): The feature weights.
+
+    Returns:
+        float: The heuristic value (higher is better).
+    """
+    full = (1 << columns) - 1
+    # Empty rows above the stack change nothing
+    start = 0
+    while start < len(rows) and not rows[start]:
+        start += 1
+    kept = [bits for bits in rows[start:] if bits != full]
+    lines = len(rows) - start - len(kept)
+    holes = 0
+    covered = 0
+    heights = [0] * columns
+    # Once the full rows are removed, the k-th kept row from the top is len(kept) - k rows high
+    height = len(kept)
+    for bits in kept:
+        new = bits & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = height
+            new ^= low
+        holes += (covered & ~bits).bit_count()
+        covered |= bits
+        height -= 1
+    bumpiness = 0
+    previous = heights[0]
+    for value in heights[1:]:
+        bumpiness += abs(value - previous)
+        previous = value
+    return (weights.height * sum(heights) + weights.lines * lines
+            + weights.holes * holes + weights.bumpiness * bumpiness)
+
+
+def enumerate_placements(board: Board, clr: int, rot: int, col: int, row: int,
+                         weights: Weights = Weights()) -> List[Placement]:
+    """
+    Find every final placement of the falling piece reachable with the player's keys.
+
+    For each rotation reachable in place, the piece is slid to every free column of its
+    current row and dropped; from each landing spot it is also slid sideways under
+    overhangs (soft-drop tucks) and dropped again. Landing rows come from the board's
+    column heights, and every resulting board is scored on its row bitmasks.
+
+    Args:
+        board (Board): The locked cells.
+        clr (int): The piece number (1-7).
+        rot (int): The current rotation state.
+        col (int): The current anchor column.
+        row (int): The current anchor row.
+        weights (Weights): The feature weights.
+
+    Returns:
+        list: One Placement per distinct landing position, with its score.
+    """
+    table = PIECE_TABLE[clr]
+    rows = board.bitRows()
+    offset0 = board.col
+    # The empty rows above the stack score nothing, so they are neither copied nor scanned
+    surface = min(board.columnTops())
+    placements = {}
+
+    def fits(mask, c, r):
+        return board.fits(mask.rowMasks, c + mask.minCol, r + mask.minRow)
+
+    def add(r, c, tuckRow, tuckCol, landing, mask):
+        key = (r, tuckCol, landing)
+        if key in placements:
+            return
+        shift = tuckCol + mask.minCol - offset0
+        top = landing + mask.minRow
+        first = max(min(surface, top), 0)
+        after = rows[first:]
+        for i, bits in enumerate(mask.rowMasks):
+            if 0 <= top + i < len(rows):
+                after[top + i - first] |= bits << shift
+        placements[key] = Placement(r, c, tuckRow, tuckCol, landing, evaluate(after, board.columns, weights))
+
+    # Straight drops first, so a tuck is only kept for a spot no straight drop reaches
+    landings = []
+    straight = {}
+    for turns in range(4):
+        r = (rot + turns) % 4
+        mask = table[r]
+        if not fits(mask, col, row):
+            # The next rotation cannot be reached in place
+            break
+        reachable = [col]
+        for step in (-1, 1):
+            c = col + step
+            while fits(mask, c, row):
+                reachable.append(c)
+                c += step
+        for c in reachable:
+            landing = row + board.dropDistance(mask.lowest, c, row)
+            add(r, c, None, c, landing, mask)
+            landings.append((r, c, landing, mask))
+            straight[r, c] = landing
+    # Tucks: slide sideways at the landing row, then drop again. The slide stops at a
+    # column whose straight drop passes that row, as the slides from there are tried too
+    for r, c, landing, mask in landings:
+        for step in (-1, 1):
+            c2 = c + step
+            while fits(mask, c2, landing) and straight.get((r, c2), -1) < landing:
+                add(r, c, landing, c2, landing + board.dropDistance(mask.lowest, c2, landing), mask)
+                c2 += step
+    return list(placements.values())
+
+
+def best_placement(board: Board, clr: int, rot: int, col: int, row: int,
+                   weights: Weights = Weights()) -> Optional[Placement]:
+    """
+    Get the reachable placement with the highest heuristic score.
+
+    Returns:
+        Placement: The best placement (the first one found on ties), None if the piece cannot move.
+    """
+    best = None
+    for placement in enumerate_placements(board, clr, rot, col, row, weights):
+        if best is None or placement.score > best.score:
+            best = placement
+    return best
+
+
+class AutoPlayer:
+    """
+    Plays the falling piece: picks the best placement and presses one key per call.
+
+    The keys are derived from the piece's current position at every call, so gravity
+    moving the piece while the plan runs does not break it. When the planned key is
+    blocked, the placement is chosen again from where the piece is; if no placement
+    can be reached, the piece is hard-dropped.
+
+    Args:
+        weights (Weights): The feature weights of the heuristic.
+
+    Methods:
+        next_action(board, clr, rot, col, row, piece): Get the next key to press.
+
+    Example:
+        To drive the headless engine:
+
+        >>> player = AutoPlayer()
+        >>> engine.apply(player.next_action(engine.board, engine.clr, engine.rot,
+        ...                                 engine.col, engine.row, engine.pieces))
+    """
+
+    def __init__(self, weights: Weights = Weights()) -> None:
+        self.weights = weights
+        self.target: Optional[Placement] = None
+        self._piece = None
+
+    def _key(self, target: Placement, rot: int, col: int, row: int) -> int:
+        """
+        Get the key moving the piece one step towards a placement.
+        """
+        if rot != target.rot:
+            return ROTATE
+        if target.tuckRow is None or row < target.tuckRow:
+            if col != target.col:
+                return MOVE_LEFT if target.col < col else MOVE_RIGHT
+            if target.tuckRow is None:
+                return HARD_DROP
+            return SOFT_DROP
+        if col != target.tuckCol:
+            return MOVE_LEFT if target.tuckCol < col else MOVE_RIGHT
+        return HARD_DROP
+
+    @staticmethod
+    def _possible(board: Board, clr: int, rot: int, col: int, row: int, key: int) -> bool:
+        """
+        Check if a key would move the piece.
+        """
+        if key == HARD_DROP:
+            return True
+        if key == ROTATE:
+            rot = (rot + 1) % 4
+        elif key == MOVE_LEFT:
+            col -= 1
+        elif key == MOVE_RIGHT:
+            col += 1
+        elif key == SOFT_DROP:
+            row += 1
+        mask = PIECE_TABLE[clr][rot]
+        return board.fits(mask.rowMasks, col + mask.minCol, row + mask.minRow)
+
+    def next_action(self, board: Board, clr: int, rot: int, col: int, row: int, piece) -> int:
+        """
+        Get the next key to press for the falling piece.
+
+        Args:
+            board (Board): The locked cells.
+            clr (int): The piece number (1-7).
+            rot (int): The current rotation state.
+            col (int): The current anchor column.
+            row (int): The current anchor row.
+            piece: Any value that changes when a new piece starts falling (e.g. the number of locked pieces).
+
+        Returns:
+            int: The engine action to apply.
+        """
+        if piece != self._piece:
+            self._piece = piece
+            self.target = best_placement(board, clr, rot, col, row, self.weights)
+        if self.target is None:
+            return HARD_DROP
+        key = self._key(self.target, rot, col, row)
+        if not self._possible(board, clr, rot, col, row, key):
+            # Blocked (e.g. gravity moved the piece): plan again from here
+            self.target = best_placement(board, clr, rot, col, row, self.weights)
+            if self.target is None:
+                return HARD_DROP
+            key = self._key(self.target, rot, col, row)
+            if not self._possible(board, clr, rot, col, row, key):
+                self.target = None
+                return HARD_DROP
+        return key
@@ -0,0 +1,361 @@
+# Many headless games stepped in lockstep on NumPy arrays, for training and evaluating policies.
+# This module must not import pygame.
+import sys
+import time
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from .Engine import MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP, ACTIONS
+from .Generator import UNIFORM, BAG, MODES, PIECES, _MASK64
+from .Pieces import PIECE_TABLE
+from .Rules import TOP, COLUMNS, ROWS, LEFT, TICK_MS, GRAVITY_MS, LEVEL_THRESHOLDS, TETRIS_ROWS, spawn_column
+
+# Block offsets of every piece and rotation, indexed by [clr, rot, block] (clr 0 is unused)
+BLOCK_COLS = np.zeros((PIECES + 1, 4, 4), dtype=np.int64)
+BLOCK_ROWS = np.zeros((PIECES + 1, 4, 4), dtype=np.int64)
+# True for the lowest block of each piece column, the only blocks that can land
+BLOCK_LOWEST = np.zeros((PIECES + 1, 4, 4), dtype=bool)
+for _clr, _masks in PIECE_TABLE.items():
+    for _rot, _mask in enumerate(_masks):
+        BLOCK_COLS[_clr, _rot] = _mask.colOffsets
+        BLOCK_ROWS[_clr, _rot] = _mask.rowOffsets
+        BLOCK_LOWEST[_clr, _rot] = [(dc, dr) in _mask.lowest for dc, dr in zip(_mask.colOffsets, _mask.rowOffsets)]
+
+_GRAVITY_MS = np.array(GRAVITY_MS, dtype=np.int64)
+_LEVEL_THRESHOLDS = np.array(LEVEL_THRESHOLDS, dtype=np.int64)
+
+# splitmix64 constants, as in PieceGenerator._random
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_LOW32 = np.uint64(0xFFFFFFFF)
+
+
+class BatchGenerator:
+    """
+    Produces the piece sequences of many games at once, one splitmix64 state per game.
+
+    Every game draws exactly the numbers a PieceGenerator with the same seed and mode
+    would (with a lookahead of one piece), so a batched game can be checked against
+    an Engine game.
+
+    Args:
+        seeds (iterable): The seed of every game.
+        mode (str): UNIFORM or BAG.
+
+    Attributes:
+        mode (str): UNIFORM or BAG.
+        queue (numpy.ndarray): The next piece number of every game.
+
+    Methods:
+        next(games): Take the next piece number of some games.
+    """
+
+    def __init__(self, seeds: Iterable[int], mode: str = UNIFORM) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown generator mode '{mode}' (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self._state = np.array([seed & _MASK64 for seed in seeds], dtype=np.uint64)
+        count = len(self._state)
+        self._bag = np.zeros((count, PIECES), dtype=np.int64)
+        self._bagSize = np.zeros(count, dtype=np.int64)
+        self.queue = self._draw(np.arange(count))
+
+    def _below(self, games: np.ndarray, n: int) -> np.ndarray:
+        """
+        Draw an integer in range(n) for every game, like PieceGenerator._below.
+        """
+        state = self._state[games] + _GOLDEN
+        self._state[games] = state
+        z = (state ^ (state >> np.uint64(30))) * _MIX1
+        z = (z ^ (z >> np.uint64(27))) * _MIX2
+        z ^= z >> np.uint64(31)
+        # High 64 bits of z * n, computed in two 32-bit halves to stay within 64 bits
+        n = np.uint64(n)
+        high = (z >> np.uint64(32)) * n + (((z & _LOW32) * n) >> np.uint64(32))
+        return (high >> np.uint64(32)).astype(np.int64)
+
+    def _draw(self, games: np.ndarray) -> np.ndarray:
+        """
+        Draw a new piece number for every game.
+        """
+        if self.mode == UNIFORM:
+            return 1 + self._below(games, PIECES)
+        empty = games[self._bagSize[games] == 0]
+        if len(empty):
+            # Fisher-Yates shuffle of fresh bags, dealt from the end
+            bags = np.tile(np.arange(1, PIECES + 1), (len(empty), 1))
+            rows = np.arange(len(empty))
+            for i in range(PIECES - 1, 0, -1):
+                j = self._below(empty, i + 1)
+                swapped = bags[rows, j]
+                bags[rows, j] = bags[:, i]
+                bags[:, i] = swapped
+            self._bag[empty] = bags
+            self._bagSize[empty] = PIECES
+        self._bagSize[games] -= 1
+        return self._bag[games, self._bagSize[games]]
+
+    def next(self, games: np.ndarray) -> np.ndarray:
+        """
+        Take the next piece number of some games, refilling their queue.
+
+        Args:
+            games (numpy.ndarray): Indices of the games.
+
+        Returns:
+            numpy.ndarray: The piece numbers (1-7).
+        """
+        pieces = self.queue[games]
+        self.queue[games] = self._draw(games)
+        return pieces
+
+
+class BatchEnv:
+    """
+    Steps many headless games in lockstep, with the rules of Engine applied to arrays.
+
+    The locked cells of all games are one `(games, rows, columns)` array of color indices
+    and the falling pieces, scores and timers are one array each. A step applies one
+    action per game and then advances every game by one tick, exactly like
+    `Engine.apply` followed by `Engine.tick`: collisions, locking, line clears, scoring
+    and leveling are computed for all games at once, with no loop over games.
+
+    Finished games stay finished (their actions are ignored) until `reset` restarts them.
+
+    Args:
+        seeds (iterable): The seed of every game; the number of seeds is the number of games.
+        mode (str): The generator mode, UNIFORM or BAG.
+        columns (int): The width of the boards.
+        rows (int): The height of the boards.
+
+    Attributes:
+        count (int): Number of games.
+        columns, rows (int): The size of the boards.
+        cells (numpy.ndarray): Locked cells, `(count, rows, columns)` color indices (0 is free).
+        clr, rot, col, row (numpy.ndarray): The falling piece of every game, as in Engine.
+        nextShapeNo (numpy.ndarray): The next piece number of every game.
+        score, level, lines, pieces, counter, gravityTimer (numpy.ndarray): Per game, as in Engine.
+        inPlay (numpy.ndarray): True for the games still running.
+
+    Methods:
+        reset(games): Restart some games, continuing their piece sequences.
+        step(actions): Apply one action per game and advance every game by one tick.
+        observe(): Get the boards with the falling pieces drawn in.
+
+    Example:
+        To play 1000 games with random keys:
+
+        >>> env = BatchEnv(range(1000))
+        >>> observations, rewards, done = env.step(np.random.randint(0, 6, env.count))
+    """
+
+    def __init__(self, seeds: Iterable[int], mode: str = UNIFORM, columns: int = COLUMNS, rows: int = ROWS) -> None:
+        self.generator = BatchGenerator(seeds, mode)
+        self.count = count = len(self.generator.queue)
+        self.columns = columns
+        self.rows = rows
+        self.cells = np.zeros((count, rows, columns), dtype=np.uint8)
+        self.clr = np.zeros(count, dtype=np.int64)
+        self.rot = np.zeros(count, dtype=np.int64)
+        self.col = np.zeros(count, dtype=np.int64)
+        self.row = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.level = np.zeros(count, dtype=np.int64)
+        self.lines = np.zeros(count, dtype=np.int64)
+        self.pieces = np.zeros(count, dtype=np.int64)
+        self.counter = np.zeros(count, dtype=np.int64)
+        self.gravityTimer = np.zeros(count, dtype=np.int64)
+        self.inPlay = np.zeros(count, dtype=bool)
+        self.reset()
+
+    @property
+    def nextShapeNo(self) -> np.ndarray:
+        """
+        The next piece number of every game.
+        """
+        return self.generator.queue
+
+    def reset(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Restart games on an empty board, continuing their piece sequences.
+
+        Args:
+            games (numpy.ndarray): Indices or boolean mask of the games (optional, all games by default).
+
+        Returns:
+            numpy.ndarray: The observations of all games.
+        """
+        if games is None:
+            games = np.arange(self.count)
+        else:
+            games = np.asarray(games)
+            if games.dtype == bool:
+                games = np.flatnonzero(games)
+        self.cells[games] = 0
+        for stat in (self.score, self.level, self.lines, self.pieces, self.counter, self.gravityTimer):
+            stat[games] = 0
+        self.inPlay[games] = True
+        self._spawn(games, self.generator.next(games))
+        return self.observe()
+
+    def _spawn(self, games: np.ndarray, pieces: np.ndarray) -> None:
+        """
+        Make new pieces the falling pieces of some games, at the spawn position.
+        """
+        self.clr[games] = pieces
+        self.rot[games] = 0
+        self.col[games] = spawn_column(self.columns)
+        self.row[games] = TOP
+
+    def _blocks(self, games: np.ndarray, rot: np.ndarray, col: np.ndarray, row: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the board row and column of the four blocks of the falling pieces at a candidate position.
+        """
+        clr = self.clr[games]
+        rows = row[:, None] + BLOCK_ROWS[clr, rot]
+        cols = col[:, None] + BLOCK_COLS[clr, rot] - LEFT
+        return rows, cols
+
+    def _fits(self, games: np.ndarray, rot: np.ndarray, col: np.ndarray, row: np.ndarray) -> np.ndarray:
+        """
+        Check if the falling pieces of some games could be placed at candidate positions,
+        like Board.fits: rows above the board are free, the sides and the bottom are not.
+        """
+        rows, cols = self._blocks(games, rot, col, row)
+        inside = (cols >= 0) & (cols < self.columns) & (rows < self.rows)
+        occupied = self.cells[games[:, None], np.clip(rows, 0, self.rows - 1), np.clip(cols, 0, self.columns - 1)] != 0
+        return np.all(inside & ~(occupied & (rows >= 0)), axis=1)
+
+    def _drop_distance(self, games: np.ndarray) -> np.ndarray:
+        """
+        Count the rows the falling pieces of some games can fall, like Board.dropDistance.
+        """
+        count = len(games)
+        # Row of the nearest locked cell at or below every cell, `rows` past the bottom
+        nearest = np.where(self.cells[games] != 0, np.arange(self.rows)[None, :, None], self.rows)
+        nearest = np.minimum.accumulate(nearest[:, ::-1], axis=1)[:, ::-1]
+        nearest = np.concatenate((nearest, np.full((count, 1, self.columns), self.rows)), axis=1)
+        rows, cols = self._blocks(games, self.rot[games], self.col[games], self.row[games])
+        below = nearest[np.arange(count)[:, None], np.clip(rows + 1, 0, self.rows), np.clip(cols, 0, self.columns - 1)]
+        distance = np.where(BLOCK_LOWEST[self.clr[games], self.rot[games]], below - rows - 1, self.rows)
+        return np.maximum(distance.min(axis=1), 0)
+
+    def _lock(self, games: np.ndarray) -> None:
+        """
+        Lock the falling pieces of some games into their boards, dropping the blocks above the board.
+        """
+        rows, cols = self._blocks(games, self.rot[games], self.col[games], self.row[games])
+        keep = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.columns)
+        owners = np.broadcast_to(games[:, None], rows.shape)
+        colors = np.broadcast_to(self.clr[games, None], rows.shape)
+        self.cells[owners[keep], rows[keep], cols[keep]] = colors[keep]
+        self.pieces[games] += 1
+
+    def _clear_rows(self, games: np.ndarray) -> None:
+        """
+        Remove the full rows of some games and update their scores, like Engine.clear_rows.
+        """
+        full = np.zeros((len(games), self.rows), dtype=bool)
+        full[:, TOP:] = np.all(self.cells[games, TOP:] != 0, axis=2)
+        cleared = full.sum(axis=1)
+        hit = cleared > 0
+        if not hit.any():
+            return
+        games, full, cleared = games[hit], full[hit], cleared[hit]
+        # A stable sort puts the full rows on top and keeps the order of the other rows
+        order = np.argsort(~full, axis=1, kind='stable')
+        boards = np.take_along_axis(self.cells[games], order[:, :, None], axis=1)
+        boards[np.arange(self.rows)[None, :] < cleared[:, None]] = 0
+        self.cells[games] = boards
+        self.score[games] += np.where(cleared >= TETRIS_ROWS, 500 + 100 * (cleared - TETRIS_ROWS), 100 * cleared)
+        self.lines[games] += cleared
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply one action per game, then advance every game by one tick of TICK_MS milliseconds.
+
+        Args:
+            actions (array-like): One engine action per game (NOOP, MOVE_LEFT, MOVE_RIGHT,
+                ROTATE, SOFT_DROP or HARD_DROP).
+
+        Returns:
+            tuple: The observations (see observe), the points scored by every game during
+            the step, and True for every game that is over.
+        """
+        actions = np.asarray(actions)
+        before = self.score.copy()
+
+        # Moves and rotations, kept only where the target is free
+        games = np.flatnonzero(self.inPlay & (actions >= MOVE_LEFT) & (actions <= SOFT_DROP))
+        if len(games):
+            action = actions[games]
+            rot = np.where(action == ROTATE, (self.rot[games] + 1) % 4, self.rot[games])
+            col = self.col[games] + (action == MOVE_RIGHT) - (action == MOVE_LEFT)
+            row = self.row[games] + (action == SOFT_DROP)
+            ok = self._fits(games, rot, col, row)
+            games = games[ok]
+            self.rot[games], self.col[games], self.row[games] = rot[ok], col[ok], row[ok]
+
+        # Hard drops: lock at the landing row, spawn, then clear rows
+        games = np.flatnonzero(self.inPlay & (actions == HARD_DROP))
+        if len(games):
+            self.row[games] += self._drop_distance(games)
+            self._lock(games)
+            self._spawn(games, self.generator.next(games))
+            self._clear_rows(games)
+
+        # Gravity
+        ticking = games = np.flatnonzero(self.inPlay)
+        self.gravityTimer[games] += TICK_MS
+        period = _GRAVITY_MS[self.level[games]]
+        due = self.gravityTimer[games] >= period
+        games, period = games[due], period[due]
+        self.gravityTimer[games] -= period
+        if len(games):
+            falls = self._fits(games, self.rot[games], self.col[games], self.row[games] + 1)
+            self.row[games[falls]] += 1
+            games = games[~falls]
+            if len(games):
+                self._lock(games)
+                self._clear_rows(games)
+                pieces = self.generator.next(games)
+                # A piece locking before it left the spawn row ends the game
+                alive = self.row[games] > 1
+                self._spawn(games[alive], pieces[alive])
+                self.inPlay[games[~alive]] = False
+
+        self.counter[ticking] += 1
+        self.level = np.searchsorted(_LEVEL_THRESHOLDS, self.score, side='right')
+        return self.observe(), self.score - before, ~self.inPlay
+
+    def observe(self) -> np.ndarray:
+        """
+        Get the boards of all games with their falling pieces drawn in.
+
+        Returns:
+            numpy.ndarray: A `(count, rows, columns)` array of color indices (0 is free).
+        """
+        observations = self.cells.copy()
+        games = np.flatnonzero(self.inPlay)
+        rows, cols = self._blocks(games, self.rot[games], self.col[games], self.row[games])
+        keep = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.columns)
+        owners = np.broadcast_to(games[:, None], rows.shape)
+        colors = np.broadcast_to(self.clr[games, None], rows.shape)
+        observations[owners[keep], rows[keep], cols[keep]] = colors[keep]
+        return observations
+
+
+if __name__ == "__main__":
+    # Measure the stepping rate with random actions: python -m TetrisCore.BatchEnv [games] [steps]
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    env = BatchEnv(range(count), BAG if '--bag' in sys.argv else UNIFORM)
+    random = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(random.choice(ACTIONS, count))
+    elapsed = time.perf_counter() - start
+    print(f'{count} games x {steps} steps in {elapsed:.2f}s: {count * steps / elapsed:,.0f} game steps/s, '
+          f'{int(env.pieces.sum())} pieces, {int((~env.inPlay).sum())} games over', file=sys.stderr)
@@ -0,0 +1,312 @@
+# Bitboard of locked cells shared by Obstacles and the headless engine.
+# This module must not import pygame.
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+from .Rules import COLUMNS, ROWS
+
+class Board:
+    """ Represents the locked cells of a Tetris board as a bitboard.
+
+    Every row is stored as one integer where bit `c` is set when column `col + c`
+    is occupied, alongside a parallel color plane holding the color index of
+    every cell. Collisions, full row detection and line clears work on whole rows
+    at once instead of scanning individual blocks. The rows that are full and the
+    top of every column are kept up to date as cells are locked, so locking a piece
+    and clearing its rows cost time in proportion to the board width, not to the
+    number of locked cells.
+
+    Args:
+        col (int): The column of the leftmost board cell.
+        columns (int): The width of the board in columns.
+        rows (int): The height of the board in rows.
+
+    Attributes:
+        col (int): The column of the leftmost board cell.
+        columns (int): The width of the board in columns.
+        rows (int): The height of the board in rows.
+        fullRowMask (int): Bitmask of a row with every column occupied.
+        version (int): Counter bumped whenever locked cells are added or removed.
+
+    Methods:
+        cellColor(col, row): Get the color index of a cell.
+        rowBits(row) / rowColors(row): Get the occupancy bitmask and colors of a row.
+        bitRows(): Get the occupancy bitmasks of every row.
+        fits(rowMasks, col, top): Check if a piece can be placed on the board.
+        place(rowMasks, col, top, clr): Lock a piece into the board.
+        cells(top, bottom): Iterate over the locked cells.
+        findFullRows(top, bottom, columns): Find full rows within a specified range.
+        removeFullRows(fullRows): Remove full rows from the board.
+        columnTops(): Get the topmost occupied row of every column.
+        dropDistance(lowest, col, row): Rows a piece can fall before landing.
+
+    Example:
+        To create an empty 10 x 20 board:
+
+        >>> board = Board(col=0, columns=10, rows=20)
+    """
+
+    def __init__(self, col: int = 0, columns: int = COLUMNS, rows: int = ROWS) -> None:
+        self.col = col
+        self.columns = columns
+        self.rows = rows
+        self.fullRowMask = (1 << columns) - 1
+        self.version = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove every locked cell from the board.
+        """
+        self._bits = [0] * self.rows
+        self._colors = [[0] * self.columns for _ in range(self.rows)]
+        self._tops = [self.rows] * self.columns
+        self._full = set()
+        self.version += 1
+
+    def setCell(self, col: int, row: int, clr: int) -> None:
+        """
+        Lock a single cell, ignoring cells outside the board.
+
+        Parameters:
+            col (int): The column of the cell.
+            row (int): The row of the cell.
+            clr (int): The color index of the cell.
+        """
+        offset = col - self.col
+        if 0 <= row < self.rows and 0 <= offset < self.columns:
+            self._bits[row] |= 1 << offset
+            self._colors[row][offset] = clr
+            if row < self._tops[offset]:
+                self._tops[offset] = row
+            if self._bits[row] == self.fullRowMask:
+                self._full.add(row)
+            self.version += 1
+
+    def isOccupied(self, col: int, row: int) -> bool:
+        """
+        Check if a cell is locked. Cells outside the board are free.
+
+        Parameters:
+            col (int): The column of the cell.
+            row (int): The row of the cell.
+
+        Returns:
+            bool: True if the cell is locked, False otherwise.
+        """
+        offset = col - self.col
+        return 0 <= row < self.rows and 0 <= offset < self.columns and bool(self._bits[row] >> offset & 1)
+
+    def cellColor(self, col: int, row: int) -> int:
+        """
+        Get the color index of a cell.
+
+        Parameters:
+            col (int): The column of the cell.
+            row (int): The row of the cell.
+
+        Returns:
+            int: The color index of the locked cell, 0 for a free cell or a cell outside the board.
+        """
+        offset = col - self.col
+        if 0 <= row < self.rows and 0 <= offset < self.columns and self._bits[row] >> offset & 1:
+            return self._colors[row][offset]
+        return 0
+
+    def rowBits(self, row: int) -> int:
+        """
+        Get the occupancy bitmask of a row (bit `c` is column `col + c`).
+        """
+        return self._bits[row]
+
+    def bitRows(self) -> List[int]:
+        """
+        Get the occupancy bitmasks of every row, top to bottom.
+
+        The board's own list is returned (not a copy), so it must not be modified.
+        """
+        return self._bits
+
+    def rowColors(self, row: int) -> Tuple[int, ...]:
+        """
+        Get the color indices of a row, free cells included.
+        """
+        return tuple(self._colors[row])
+
+    def cells(self, top: int = 0, bottom: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate over the locked cells, optionally of a band of rows only.
+
+        Parameters:
+            top (int): The first row (default 0).
+            bottom (int): The row after the last one (default the bottom of the board).
+
+        Returns:
+            iterator: `(col, row, clr)` of every locked cell, row by row.
+        """
+        top = max(top, 0)
+        bottom = self.rows if bottom is None else min(bottom, self.rows)
+        for row in range(top, bottom):
+            bits, colors = self._bits[row], self._colors[row]
+            while bits:
+                low = bits & -bits
+                offset = low.bit_length() - 1
+                yield self.col + offset, row, colors[offset]
+                bits ^= low
+
+    def fits(self, rowMasks, col: int, top: int) -> bool:
+        """
+        Check if a piece given as row bitmasks can be placed on the board.
+
+        Rows above the board are free, but the piece must stay between the side
+        bounds and above the bottom of the board.
+
+        Parameters:
+            rowMasks (tuple): One bitmask per piece row, top to bottom, bit 0 being column `col`.
+            col (int): The column of bit 0 of the masks.
+            top (int): The row of the first mask.
+
+        Returns:
+            bool: True if the piece is inside the board and hits no locked cell, False otherwise.
+        """
+        offset = col - self.col
+        if offset < 0 or top + len(rowMasks) > self.rows:
+            return False
+        bits, full = self._bits, self.fullRowMask
+        row = top
+        for mask in rowMasks:
+            mask <<= offset
+            if mask & ~full or (row >= 0 and bits[row] & mask):
+                return False
+            row += 1
+        return True
+
+    def place(self, rowMasks, col: int, top: int, clr: int) -> None:
+        """
+        Lock a piece given as row bitmasks into the board.
+
+        Rows above the board are dropped.
+
+        Parameters:
+            rowMasks (tuple): One bitmask per piece row, top to bottom, bit 0 being column `col`.
+            col (int): The column of bit 0 of the masks.
+            top (int): The row of the first mask.
+            clr (int): The color index of the piece.
+        """
+        offset = col - self.col
+        tops = self._tops
+        row = top
+        for mask in rowMasks:
+            if 0 <= row < self.rows:
+                mask = (mask << offset) & self.fullRowMask
+                self._bits[row] |= mask
+                if self._bits[row] == self.fullRowMask:
+                    self._full.add(row)
+                colors = self._colors[row]
+                while mask:
+                    low = mask & -mask
+                    cell = low.bit_length() - 1
+                    colors[cell] = clr
+                    if row < tops[cell]:
+                        tops[cell] = row
+                    mask ^= low
+            row += 1
+        self.version += 1
+
+    def findFullRows(self, top, bottom, columns):
+        """
+        Find full rows within a specified range.
+
+        Args:
+            top (int): The top row of the range to search for full rows.
+            bottom (int): The bottom row of the range to search for full rows.
+            columns (int): The number of columns in the grid.
+
+        Returns:
+            list: A list of row indices that are full within the specified range.
+
+        """
+        if columns == self.columns:
+            # Rows are recorded as they fill up, so no row needs to be scanned
+            return sorted(row for row in self._full if top <= row < bottom)
+        full = (1 << columns) - 1
+        bits = self._bits
+        return [row for row in range(max(top, 0), min(bottom, self.rows)) if bits[row] & full == full]
+
+    def removeFullRows(self, fullRows):
+        """
+        Remove full rows from the board.
+
+        The removed rows are deleted from the row lists and as many empty rows are
+        inserted at the top, so the rows in between are moved by list operations
+        instead of one by one. Every column top moves down by the number of removed
+        rows below it; only a column whose top cell was in a removed row is scanned
+        for its next cell.
+
+        Args:
+            fullRows (list): A list of row indices to remove from the board.
+
+        Returns:
+            None
+
+        """
+        if not fullRows:
+            return
+        removed = {row for row in fullRows if 0 <= row < self.rows}
+        below = sorted(removed)
+        bits, colors, tops = self._bits, self._colors, self._tops
+        for offset, top in enumerate(tops):
+            row = top
+            while row < self.rows and (row in removed or not bits[row] >> offset & 1):
+                row += 1
+            # The topmost kept cell falls by the number of removed rows under it
+            tops[offset] = row + len(below) - bisect_right(below, row) if row < self.rows else self.rows
+        for row in reversed(below):
+            del bits[row]
+            del colors[row]
+        bits[:0] = [0] * len(below)
+        colors[:0] = [[0] * self.columns for _ in below]
+        # Full rows that were not removed fall like the others
+        self._full = {row + len(below) - bisect_right(below, row) for row in self._full - removed}
+        self.version += 1
+
+    def columnTops(self) -> List[int]:
+        """
+        Get the topmost occupied row of every column (the surface of the stack).
+
+        The tops are kept up to date by every change of the board (setCell, place and
+        removeFullRows), so reading them costs nothing. The board's own list is
+        returned (not a copy), so it must not be modified.
+
+        Returns:
+            list: One row index per column, `rows` for an empty column.
+        """
+        return self._tops
+
+    def dropDistance(self, lowest, col: int, row: int) -> int:
+        """
+        Count the rows a piece can fall before it lands on a locked cell or the bottom.
+
+        Only the lowest block of each piece column is checked. When that block is above
+        the column's surface the landing row comes straight from the column heights;
+        otherwise (the piece is tucked under an overhang) the column is scanned downwards.
+
+        Parameters:
+            lowest (tuple): `(colOffset, rowOffset)` of the lowest block per piece column.
+            col (int): Anchor column of the piece.
+            row (int): Anchor row of the piece.
+
+        Returns:
+            int: The number of free rows below the piece.
+        """
+        tops, bits = self.columnTops(), self._bits
+        distance = self.rows
+        for dc, dr in lowest:
+            offset = col + dc - self.col
+            start = row + dr
+            below = tops[offset]
+            if below <= start:
+                below = max(start + 1, 0)
+                while below < self.rows and not bits[below] >> offset & 1:
+                    below += 1
+            distance = min(distance, below - start - 1)
+        return max(distance, 0)
@@ -0,0 +1,238 @@
+# Headless game engine: the same rules as TetrisGame, GameState and MovePiece,
+# driven one action or one tick at a time. This module must not import pygame.
+from typing import Optional
+
+from .Board import Board
+from .Generator import PieceGenerator
+from .Pieces import PIECE_TABLE
+from .Rules import TOP, COLUMNS, ROWS, LEFT, TICK_MS, GRAVITY_MS, TETRIS_ROWS, level_for_score, score_for_rows, spawn_column
+
+# Actions accepted by Engine.apply
+NOOP = 0
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+ROTATE = 3
+SOFT_DROP = 4
+HARD_DROP = 5
+ACTIONS = (NOOP, MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP)
+
+# Event flags returned by Engine.apply and Engine.tick
+MOVED = 1
+ROTATED = 2
+DROPPED = 4
+LOCKED = 8
+LINES = 16
+TETRIS = 32
+GAME_OVER = 64
+
+
+class Engine:
+    """
+    Represents a complete game of Tetris without any rendering or sound.
+
+    The falling piece is kept as plain integers (`clr`, `rot`, `col`, `row`) and the
+    locked cells live in a Board, so a step costs a few bitmask operations. The
+    attribute names follow GameState, which lets frontends read an Engine the same
+    way they read a GameState.
+
+    Args:
+        seed (int): Seed of the piece generator (optional).
+        board (Board): The board to play on (optional, an empty Board by default).
+            Passing an Obstacles instance lets the pygame frontend draw it directly.
+        generator (PieceGenerator): The piece generator (optional, a uniform
+            generator seeded with `seed` by default).
+        columns (int): The width of the board created when no board is given.
+        rows (int): The height of the board created when no board is given.
+
+    Attributes:
+        board (Board): The locked cells.
+        generator (PieceGenerator): The source of the piece sequence.
+        clr (int): Piece number (1-7) of the falling piece.
+        rot (int): Rotation state of the falling piece.
+        col (int): Anchor column of the falling piece.
+        row (int): Anchor row of the falling piece.
+        nextShapeNo (int): Next piece number.
+        score (int): Player's score.
+        level (int): Current game level.
+        prevTetris (bool): Flag to track previous Tetris completion.
+        inPlay (bool): Flag to check if the game is active.
+        counter (int): Number of ticks played.
+        gravityTimer (int): Milliseconds accumulated towards the next gravity step.
+        lines (int): Total number of cleared rows.
+        pieces (int): Total number of locked pieces.
+
+    Methods:
+        apply(action): Apply a player action to the falling piece.
+        tick(): Advance the game by one simulation step of TICK_MS milliseconds.
+        ghost_row(): Row where the falling piece would land.
+
+    Example:
+        To play a hard drop and advance the game by one tick:
+
+        >>> engine = Engine(seed=42)
+        >>> events = engine.apply(HARD_DROP) | engine.tick()
+    """
+
+    def __init__(self, seed: Optional[int] = None, board: Optional[Board] = None,
+                 generator: Optional[PieceGenerator] = None, columns: int = COLUMNS, rows: int = ROWS) -> None:
+        self.board = board if board is not None else Board(LEFT, columns, rows)
+        self.generator = generator if generator is not None else PieceGenerator(seed)
+        self.score = 0
+        self.level = 0
+        self.prevTetris = False
+        self.inPlay = True
+        self.counter = 0
+        self.gravityTimer = 0
+        self.lines = 0
+        self.pieces = 0
+        self.spawn(self.generator.next())
+
+    @property
+    def nextShapeNo(self) -> int:
+        """
+        The number of the next piece, the head of the generator's lookahead queue.
+        """
+        return self.generator.peek()[0]
+
+    def spawn(self, clr: int) -> None:
+        """
+        Make a new piece the falling piece at the spawn position.
+
+        Args:
+            clr (int): The piece number (1-7).
+        """
+        self.clr, self.rot, self.col, self.row = clr, 0, spawn_column(self.board.columns), TOP
+
+    def fits(self, col: int, row: int, rot: int) -> bool:
+        """
+        Check if the falling piece could be placed at a candidate position and rotation.
+
+        Args:
+            col (int): Candidate anchor column.
+            row (int): Candidate anchor row.
+            rot (int): Candidate rotation state (0 to 3).
+
+        Returns:
+            bool: True if the piece would be inside the board on free cells, False otherwise.
+        """
+        mask = PIECE_TABLE[self.clr][rot]
+        return self.board.fits(mask.rowMasks, col + mask.minCol, row + mask.minRow)
+
+    def ghost_row(self) -> int:
+        """
+        Get the row where the falling piece would land if dropped straight down.
+
+        Returns:
+            int: The anchor row of the piece once it has landed.
+        """
+        mask = PIECE_TABLE[self.clr][self.rot]
+        return self.row + self.board.dropDistance(mask.lowest, self.col, self.row)
+
+    def apply(self, action: int) -> int:
+        """
+        Apply a player action to the falling piece.
+
+        Mirrors TetrisGame.process_key_events: moves and rotations only happen when the
+        target is free, a soft drop moves one row down, and a hard drop locks the piece
+        at its landing row and spawns the next one.
+
+        Args:
+            action (int): One of NOOP, MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP or HARD_DROP.
+
+        Returns:
+            int: The event flags raised by the action.
+        """
+        if not self.inPlay:
+            return 0
+        if action == MOVE_LEFT:
+            if self.fits(self.col - 1, self.row, self.rot):
+                self.col -= 1
+                return MOVED
+        elif action == MOVE_RIGHT:
+            if self.fits(self.col + 1, self.row, self.rot):
+                self.col += 1
+                return MOVED
+        elif action == ROTATE:
+            rot = (self.rot + 1) % 4
+            if self.fits(self.col, self.row, rot):
+                self.rot = rot
+                return ROTATED
+        elif action == SOFT_DROP:
+            if self.fits(self.col, self.row + 1, self.rot):
+                self.row += 1
+                return MOVED
+        elif action == HARD_DROP:
+            # Same order as GameState.drop_instant_piece: lock, spawn, then clear rows
+            self.row = self.ghost_row()
+            self.lock()
+            self.spawn(self.next_piece())
+            return DROPPED | LOCKED | self.clear_rows()
+        return 0
+
+    def tick(self) -> int:
+        """
+        Advance the game by one simulation step of TICK_MS milliseconds.
+
+        Mirrors TetrisGame.update_game_state: every GRAVITY_MS[level] milliseconds the
+        falling piece moves down one row or, when blocked, is locked; the game ends when
+        a piece locks before leaving the spawn row.
+
+        Returns:
+            int: The event flags raised by the tick.
+        """
+        if not self.inPlay:
+            return 0
+        events = 0
+        self.gravityTimer += TICK_MS
+        if self.gravityTimer >= GRAVITY_MS[self.level]:
+            self.gravityTimer -= GRAVITY_MS[self.level]
+            if self.fits(self.col, self.row + 1, self.rot):
+                self.row += 1
+            else:
+                self.lock()
+                events = LOCKED | self.clear_rows()
+                shape_no = self.next_piece()
+                if self.row > 1:
+                    self.spawn(shape_no)
+                else:
+                    self.inPlay = False
+                    events |= GAME_OVER
+        self.level = level_for_score(self.score)
+        self.prevTetris = False
+        self.counter += 1
+        return events
+
+    def lock(self) -> None:
+        """
+        Lock the falling piece into the board.
+        """
+        mask = PIECE_TABLE[self.clr][self.rot]
+        self.board.place(mask.rowMasks, self.col + mask.minCol, self.row + mask.minRow, self.clr)
+        self.pieces += 1
+
+    def clear_rows(self) -> int:
+        """
+        Remove full rows and update the score.
+
+        Returns:
+            int: LINES and/or TETRIS event flags.
+        """
+        fullRows = self.board.findFullRows(TOP, TOP + self.board.rows, self.board.columns)
+        if not fullRows:
+            return 0
+        self.board.removeFullRows(fullRows)
+        self.score += score_for_rows(len(fullRows))
+        self.lines += len(fullRows)
+        if len(fullRows) >= TETRIS_ROWS:
+            self.prevTetris = True
+            return LINES | TETRIS
+        return LINES
+
+    def next_piece(self) -> int:
+        """
+        Take the next piece number from the generator.
+
+        Returns:
+            int: The piece number that was next.
+        """
+        return self.generator.next()
@@ -0,0 +1,143 @@
+# Seedable piece generator shared by the game, the engine and the simulations.
+# This module must not import pygame.
+from collections import deque
+from random import getrandbits
+from typing import Optional, Tuple
+
+# Generator modes
+UNIFORM = 'uniform'
+BAG = 'bag'
+MODES = (UNIFORM, BAG)
+
+PIECES = 7
+_MASK64 = (1 << 64) - 1
+
+
+class PieceGenerator:
+    """
+    Produces the sequence of piece numbers (1-7) of a game from a seed.
+
+    In UNIFORM mode every piece is drawn independently, like `randint(1, 7)`. In BAG
+    mode the seven pieces are dealt from shuffled bags, so each piece appears once in
+    every group of seven. The upcoming pieces are kept in a lookahead queue.
+
+    Random numbers come from a private splitmix64 state (one integer), never from the
+    global `random` module, so the same seed always gives the same sequence and the
+    whole generator can be snapshot and restored as a handful of integers.
+
+    Args:
+        seed (int): The seed of the sequence (optional, random by default).
+        mode (str): UNIFORM or BAG.
+        lookahead (int): Number of upcoming pieces kept in the queue (at least 1).
+
+    Attributes:
+        seed (int): The seed the sequence was started from.
+        mode (str): UNIFORM or BAG.
+        lookahead (int): Length of the lookahead queue.
+
+    Methods:
+        next(): Take the next piece number.
+        peek(n): Get the upcoming piece numbers without taking them.
+        snapshot(): Capture the generator state.
+        restore(state): Go back to a captured state.
+
+    Example:
+        To deal pieces from a 7-bag, looking three pieces ahead:
+
+        >>> generator = PieceGenerator(seed=42, mode=BAG, lookahead=3)
+        >>> shape_no = generator.next()
+        >>> upcoming = generator.peek(3)
+    """
+
+    def __init__(self, seed: Optional[int] = None, mode: str = UNIFORM, lookahead: int = 1) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown generator mode '{mode}' (expected one of {', '.join(MODES)})")
+        self.seed = getrandbits(64) if seed is None else seed
+        self.mode = mode
+        self.lookahead = max(1, lookahead)
+        self._state = self.seed & _MASK64
+        self._bag = []
+        self._queue = deque()
+        self._fill(self.lookahead)
+
+    def _random(self) -> int:
+        """
+        Advance the splitmix64 state and return 64 random bits.
+        """
+        self._state = (self._state + 0x9E3779B97F4A7C15) & _MASK64
+        z = self._state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+
+    def _below(self, n: int) -> int:
+        """
+        Draw an integer in range(n).
+        """
+        return (self._random() * n) >> 64
+
+    def _draw(self) -> int:
+        """
+        Draw a new piece number.
+        """
+        if self.mode == UNIFORM:
+            return 1 + self._below(PIECES)
+        if not self._bag:
+            # Fisher-Yates shuffle of a fresh bag, dealt from the end
+            bag = list(range(1, PIECES + 1))
+            for i in range(PIECES - 1, 0, -1):
+                j = self._below(i + 1)
+                bag[i], bag[j] = bag[j], bag[i]
+            self._bag = bag
+        return self._bag.pop()
+
+    def _fill(self, n: int) -> None:
+        """
+        Draw pieces until the queue holds at least n of them.
+        """
+        while len(self._queue) < n:
+            self._queue.append(self._draw())
+
+    def next(self) -> int:
+        """
+        Take the next piece number, refilling the lookahead queue.
+
+        Returns:
+            int: The piece number (1-7).
+        """
+        self._fill(self.lookahead + 1)
+        return self._queue.popleft()
+
+    def peek(self, n: int = 1) -> Tuple[int, ...]:
+        """
+        Get the upcoming piece numbers without taking them.
+
+        Args:
+            n (int): Number of pieces to look at (may exceed the lookahead).
+
+        Returns:
+            tuple: The next n piece numbers, in order.
+        """
+        self._fill(n)
+        queue = self._queue
+        return tuple(queue[i] for i in range(n))
+
+    def snapshot(self) -> tuple:
+        """
+        Capture the generator state.
+
+        Returns:
+            tuple: An immutable state to pass to restore.
+        """
+        return self._state, tuple(self._bag), tuple(self._queue)
+
+    def restore(self, state: tuple) -> None:
+        """
+        Go back to a state captured by snapshot.
+
+        Args:
+            state (tuple): The captured state.
+        """
+        self._state, bag, queue = state
+        self._bag = list(bag)
+        self._queue = deque(queue)
@@ -0,0 +1,155 @@
+# Tetromino offsets and the masks precomputed from them.
+# This module must not import pygame.
+from typing import Dict, NamedTuple, Tuple
+
+class PieceMask(NamedTuple):
+    """
+    Precomputed geometry of one tetromino in one rotation state.
+
+    All offsets are relative to the piece's anchor block (`Shape.col`, `Shape.row`).
+
+    Attributes:
+        colOffsets (tuple): Column offset of each of the four blocks.
+        rowOffsets (tuple): Row offset of each of the four blocks.
+        minCol (int): Leftmost column offset of the bounding box.
+        maxCol (int): Rightmost column offset of the bounding box.
+        minRow (int): Topmost row offset of the bounding box.
+        maxRow (int): Bottom row offset of the bounding box.
+        rowMasks (tuple): One bitmask per bounding box row (top to bottom), bit 0 being `minCol`.
+        lowest (tuple): `(colOffset, rowOffset)` of the lowest block in every occupied column.
+        spawnOffset (int): Rows to move the anchor down so the whole piece sits inside the board.
+    """
+    colOffsets: Tuple[int, ...]
+    rowOffsets: Tuple[int, ...]
+    minCol: int
+    maxCol: int
+    minRow: int
+    maxRow: int
+    rowMasks: Tuple[int, ...]
+    lowest: Tuple[Tuple[int, int], ...]
+    spawnOffset: int
+
+
+def build_mask(colOffsets, rowOffsets) -> PieceMask:
+    """
+    Build the PieceMask of a single rotation state from its block offsets.
+
+    Args:
+        colOffsets (list): Column offset of each block.
+        rowOffsets (list): Row offset of each block.
+
+    Returns:
+        PieceMask: The precomputed geometry of the rotation state.
+    """
+    minCol, maxCol = min(colOffsets), max(colOffsets)
+    minRow, maxRow = min(rowOffsets), max(rowOffsets)
+
+    rowMasks = [0] * (maxRow - minRow + 1)
+    lowest = {}
+    for dc, dr in zip(colOffsets, rowOffsets):
+        rowMasks[dr - minRow] |= 1 << (dc - minCol)
+        lowest[dc] = max(dr, lowest.get(dc, dr))
+
+    return PieceMask(tuple(colOffsets), tuple(rowOffsets),
+                     minCol, maxCol, minRow, maxRow,
+                     tuple(rowMasks), tuple(sorted(lowest.items())),
+                     max(0, -minRow))
+
+
+def build_piece_table(trominos) -> Dict[int, Tuple[PieceMask, ...]]:
+    """
+    Precompute the PieceMask of every piece and rotation state.
+
+    Args:
+        trominos (dict): Offsets per piece and rotation, laid out like `TROMINOS`.
+
+    Returns:
+        dict: Maps each piece number to a tuple of four PieceMasks indexed by rotation.
+    """
+    return {clr: tuple(build_mask(*rotations[rot]) for rot in range(4))
+            for clr, rotations in trominos.items()}
+
+
+TROMINOS = {
+    # Red Z-Tetromino
+    1: {
+        # Initial orientation
+        0: ([-1, -1, 0, 0], [1, 0, 0, -1]),
+        # 90 degrees rotation
+        1: ([-1, 0, 0, 1], [-1, -1, 0, 0]),
+        # 180 degrees rotation
+        2: ([1, 1, 0, 0], [-1, 0, 0, 1]),
+        # 270 degrees rotation
+        3: ([1, 0, 0, -1], [1, 1, 0, 0])
+    },
+    # Green S-Tetromino
+    2: {
+        # Initial orientation
+        0: ([-1, -1, 0, 0], [-1, 0, 0, 1]),
+        # 90 degrees rotation
+        1: ([1, 0, 0, -1], [-1, -1, 0, 0]),
+        # 180 degrees rotation
+        2: ([1, 1, 0, 0], [1, 0, 0, -1]),
+        # 270 degrees rotation
+        3: ([-1, 0, 0, 1], [1, 1, 0, 0])
+    },
+    # Blue J-Tetromino
+    3: {
+        # Initial orientation
+        0: ([-1, -1, 0, 1], [-1, 0, 0, 0]),
+        # 90 degrees rotation
+        1: ([1, 1, 0, -1], [1, 0, 0, 0]),
+        # 180 degrees rotation
+        2: ([1, 0, 0, 0], [-1, -1, 0, 1]),
+        # 270 degrees rotation
+        3: ([-1, 0, 0, 0], [1, 1, 0, -1])
+    },
+    # Orange L-Tetromino
+    4: {
+        # Initial orientation
+        0: ([1, 1, 0, -1], [-1, 0, 0, 0]),
+        # 90 degrees rotation
+        1: ([-1, -1, 0, 1], [1, 0, 0, 0]),
+        # 180 degrees rotation
+        2: ([-1, 0, 0, 0], [-1, -1, 0, 1]),
+        # 270 degrees rotation
+        3: ([1, 0, 0, 0], [1, 1, 0, -1])
+    },
+    # Cyan I-Tetromino
+    5: {
+        # Initial orientation
+        0: ([0, 0, 0, 0], [-2, 1, 0, -1]),
+        # 90 degrees rotation
+        1: ([-2, 1, 0, -1], [0, 0, 0, 0]),
+        # 180 degrees rotation
+        2: ([-2, -1, 0, 1], [0, 0, 0, 0]),
+        # 270 degrees rotation
+        3: ([0, 0, 0, 0], [-2, -1, 0, 1])
+    },
+    # Purple T-Tetromino
+    6: {
+        # Initial orientation
+        0: ([0, -1, 0, 0], [1, 0, 0, -1]),
+        # 90 degrees rotation
+        1: ([-1, 0, 0, 1], [0, -1, 0, 0]),
+        # 180 degrees rotation
+        2: ([0, 1, 0, 0], [-1, 0, 0, 1]),
+        # 270 degrees rotation
+        3: ([1, 0, 0, -1], [0, 1, 0, 0])
+    },
+    # Yellow O-Tetromino
+    # Does not rotate, so all offsets are the same
+    7: {
+        # Initial orientation
+        0: ([-1, -1, 0, 0], [0, -1, 0, -1]),
+        # 90 degrees rotation
+        1: ([-1, -1, 0, 0], [0, -1, 0, -1]),
+        # 180 degrees rotation
+        2: ([-1, -1, 0, 0], [0, -1, 0, -1]),
+        # 270 degrees rotation
+        3: ([-1, -1, 0, 0], [0, -1, 0, -1])
+    }
+}
+
+# Row bitmasks, bounding boxes and lowest blocks of every piece and rotation
+PIECE_TABLE = build_piece_table(TROMINOS)
@@ -0,0 +1,135 @@
+# Policies choosing the player action of a headless game, one call per tick.
+# This module must not import pygame.
+from importlib import import_module
+from random import Random
+from typing import Callable, List, Optional
+
+from .Engine import Engine, NOOP, MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP
+from .Autoplay import AutoPlayer
+
+# A policy is any callable taking the engine and returning the next action
+Policy = Callable[[Engine], int]
+
+
+class RandomPolicy:
+    """
+    Presses random keys, mostly moves and rotations, with an occasional hard drop.
+
+    Args:
+        seed (int): Seed of the policy's random choices (optional).
+
+    Example:
+        >>> policy = RandomPolicy(seed=1)
+        >>> engine.apply(policy(engine))
+    """
+
+    actions = (NOOP, NOOP, NOOP, NOOP, MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP)
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = Random(seed)
+
+    def __call__(self, engine: Engine) -> int:
+        return self.rng.choice(self.actions)
+
+
+class LowestPolicy:
+    """
+    Hard-drops every piece at the rotation and column where it lands lowest.
+
+    When a new piece appears, every rotation and column the piece fits in at its spawn
+    row is tried, and the keys reaching the deepest landing row (ties broken at random)
+    are queued: rotations first, then moves, then a hard drop, one key per call.
+
+    Args:
+        seed (int): Seed of the tie-breaking choices (optional).
+
+    Example:
+        >>> policy = LowestPolicy(seed=1)
+        >>> engine.apply(policy(engine))
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = Random(seed)
+        self._plan: List[int] = []
+        self._piece = None
+
+    def plan(self, engine: Engine) -> List[int]:
+        """
+        Get the keys that place the falling piece at its lowest landing spot.
+
+        Args:
+            engine (Engine): The game being played.
+
+        Returns:
+            list: The actions to apply, ending with HARD_DROP.
+        """
+        board = engine.board
+        rot, col = engine.rot, engine.col
+        best = None
+        for target_rot in range(4):
+            for target_col in range(board.col - 3, board.col + board.columns + 3):
+                if not engine.fits(target_col, engine.row, target_rot):
+                    continue
+                engine.rot, engine.col = target_rot, target_col
+                landing = engine.ghost_row() + self.rng.random()
+                engine.rot, engine.col = rot, col
+                if best is None or landing > best[0]:
+                    best = (landing, target_rot, target_col)
+        if best is None:
+            return [HARD_DROP]
+        _, target_rot, target_col = best
+        keys = [ROTATE] * ((target_rot - rot) % 4)
+        keys += [MOVE_LEFT if target_col < col else MOVE_RIGHT] * abs(target_col - col)
+        return keys + [HARD_DROP]
+
+    def __call__(self, engine: Engine) -> int:
+        # Plan again whenever a new piece is falling
+        piece = (engine.pieces, engine.clr)
+        if piece != self._piece:
+            self._piece = piece
+            self._plan = self.plan(engine)
+        return self._plan.pop(0) if self._plan else NOOP
+
+
+class AutoplayPolicy:
+    """
+    Plays like the autoplay mode: every reachable placement is scored by the AutoPlayer heuristic.
+
+    Args:
+        seed (int): Unused, the player is deterministic.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.player = AutoPlayer()
+
+    def __call__(self, engine: Engine) -> int:
+        return self.player.next_action(engine.board, engine.clr, engine.rot, engine.col, engine.row, engine.pieces)
+
+
+# Built-in policies by name
+POLICIES = {
+    'random': RandomPolicy,
+    'lowest': LowestPolicy,
+    'ai': AutoplayPolicy,
+}
+
+
+def make_policy(name: str, seed: Optional[int] = None) -> Policy:
+    """
+    Create a policy from its name.
+
+    Args:
+        name (str): A built-in policy name, or `module:attribute` naming a class or
+            factory taking a seed (e.g. `MyPolicies:Careful`).
+        seed (int): Seed passed to the policy (optional).
+
+    Returns:
+        Policy: A callable returning the next action for an engine.
+    """
+    factory = POLICIES.get(name)
+    if factory is None:
+        if ':' not in name:
+            raise ValueError(f"unknown policy '{name}' (built-in: {', '.join(POLICIES)})")
+        module, attribute = name.split(':', 1)
+        factory = getattr(import_module(module), attribute)
+    return factory(seed)
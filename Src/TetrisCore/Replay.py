@@ -0,0 +1,315 @@
+# Compact input logs of games, and their re-simulation on the headless engine.
+# This module must not import pygame.
+import sys
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from .Engine import Engine, ACTIONS, NOOP
+from .Generator import PieceGenerator, MODES
+from .Rules import COLUMNS, ROWS
+
+MAGIC = b'PXR'
+# Version 2 added the board size; version 1 logs are games on the default board
+VERSION = 2
+# Low bits of a record holding the action, the high bits hold the tick delta
+ACTION_BITS = 3
+# The action code of the end record
+END = NOOP
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encode a non-negative integer in LEB128 form, 7 bits per byte.
+
+    Args:
+        value (int): The integer to encode.
+
+    Returns:
+        bytes: The encoded integer (one byte up to 127).
+    """
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """
+    Decode an LEB128 integer.
+
+    Args:
+        data (bytes): The encoded data.
+        position (int): The offset of the first byte.
+
+    Returns:
+        tuple: The integer and the offset after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """
+    Map a signed integer to a non-negative one (0, -1, 1, -2... become 0, 1, 2, 3...).
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    """
+    Invert zigzag.
+    """
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+class ReplayWriter:
+    """
+    Streams the inputs of one game to a binary replay log.
+
+    The log starts with the board size and the state of the piece generator before the first piece, then
+    holds one record per player action: the number of ticks since the previous action
+    and the action code packed into one varint, so most actions take one or two bytes.
+    `finish` writes an end record and the final score, lines and pieces, which lets
+    a replay be checked by re-simulating it.
+
+    Args:
+        stream (BinaryIO): The file to write to.
+        generator (PieceGenerator): The generator of the game.
+        snapshot (tuple): The generator state before the first piece of the game was taken
+            (optional, the current state of the generator by default).
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+
+    Attributes:
+        ticks (int): Number of ticks recorded.
+
+    Methods:
+        tick(): Record one simulation step.
+        action(action): Record a player action.
+        finish(score, lines, pieces): Record the end of the game.
+
+    Example:
+        To record a game played on the engine:
+
+        >>> writer = ReplayWriter(open('game.pxr', 'wb'), generator)
+        >>> engine = Engine(generator=generator)
+        >>> writer.action(HARD_DROP); engine.apply(HARD_DROP)
+        >>> writer.tick(); engine.tick()
+        >>> writer.finish(engine.score, engine.lines, engine.pieces)
+    """
+
+    def __init__(self, stream: BinaryIO, generator: PieceGenerator, snapshot: Optional[tuple] = None,
+                 columns: int = COLUMNS, rows: int = ROWS) -> None:
+        self.stream = stream
+        self.ticks = 0
+        self._pending = 0
+        state, bag, queue = snapshot if snapshot is not None else generator.snapshot()
+        header = [VERSION, columns, rows, MODES.index(generator.mode), generator.lookahead, zigzag(generator.seed), state,
+                  len(bag), *bag, len(queue), *queue]
+        stream.write(MAGIC + b''.join(encode_varint(value) for value in header))
+
+    def tick(self) -> None:
+        """
+        Record one simulation step.
+        """
+        self.ticks += 1
+        self._pending += 1
+
+    def action(self, action: int) -> None:
+        """
+        Record a player action applied after the ticks recorded so far.
+
+        Args:
+            action (int): An engine action other than NOOP.
+        """
+        self.stream.write(encode_varint(self._pending << ACTION_BITS | action))
+        self._pending = 0
+
+    def finish(self, score: int, lines: int, pieces: int) -> None:
+        """
+        Record the end of the game and its final result, then close the stream.
+
+        Args:
+            score (int): The final score.
+            lines (int): The number of cleared rows.
+            pieces (int): The number of locked pieces.
+        """
+        self.stream.write(encode_varint(self._pending << ACTION_BITS | END))
+        self.stream.write(b''.join(encode_varint(value) for value in (self.ticks, score, lines, pieces)))
+        self.stream.close()
+
+
+class ReplayReader:
+    """
+    Decodes a replay log written by ReplayWriter.
+
+    A log without an end record (e.g. from a process that was killed) keeps the inputs
+    read so far and has no result.
+
+    Args:
+        data (bytes): The content of the log.
+
+    Attributes:
+        seed (int): The seed of the recorded session.
+        mode (str): The generator mode.
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+        inputs (list): `(tick, action)` pairs, the tick being the number of ticks played before the action.
+        ticks (int): Number of ticks of the game.
+        result (tuple): The recorded `(score, lines, pieces)`, None if the log has no end record.
+
+    Methods:
+        load(path): Read a replay file.
+        generator(): Get a piece generator in the state of the start of the game.
+        timeline(): Iterate over the ticks with the actions applied before each one.
+
+    Example:
+        >>> reader = ReplayReader.load('game.pxr')
+        >>> engine = simulate(reader)
+    """
+
+    def __init__(self, data: bytes) -> None:
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError('not a replay log')
+        position = len(MAGIC)
+
+        def read() -> int:
+            nonlocal position
+            value, position = decode_varint(data, position)
+            return value
+
+        version = read()
+        if version not in (1, VERSION):
+            raise ValueError(f'unsupported replay version {version}')
+        self.columns, self.rows = (read(), read()) if version >= 2 else (COLUMNS, ROWS)
+        self.mode = MODES[read()]
+        self.lookahead = read()
+        self.seed = unzigzag(read())
+        state = read()
+        bag = tuple(read() for _ in range(read()))
+        queue = tuple(read() for _ in range(read()))
+        self._snapshot = (state, bag, queue)
+
+        self.inputs: List[Tuple[int, int]] = []
+        self.result: Optional[Tuple[int, int, int]] = None
+        tick = 0
+        ticks = None
+        mask = (1 << ACTION_BITS) - 1
+        try:
+            while position < len(data):
+                record = read()
+                tick += record >> ACTION_BITS
+                action = record & mask
+                if action == END:
+                    ticks = read()
+                    self.result = (read(), read(), read())
+                    break
+                if action not in ACTIONS:
+                    raise ValueError(f'unknown action {action} in replay')
+                self.inputs.append((tick, action))
+        except IndexError:
+            ticks = self.result = None
+        self.ticks = tick if ticks is None else ticks
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayReader':
+        """
+        Read a replay file.
+
+        Args:
+            path (str): The path of the replay.
+
+        Returns:
+            ReplayReader: The decoded replay.
+        """
+        with open(path, 'rb') as replay:
+            return cls(replay.read())
+
+    def generator(self) -> PieceGenerator:
+        """
+        Get a piece generator in the state it had when the game started.
+
+        Returns:
+            PieceGenerator: A new generator, ready to deal the first piece of the game.
+        """
+        generator = PieceGenerator(self.seed, self.mode, self.lookahead)
+        generator.restore(self._snapshot)
+        return generator
+
+    def timeline(self) -> Iterator[Tuple[int, List[int]]]:
+        """
+        Iterate over the ticks of the game with the actions to apply before each one.
+
+        Yields:
+            tuple: The tick number and the actions applied before that tick. The last
+            pair (tick == ticks) holds the actions applied after the last tick.
+        """
+        inputs = self.inputs
+        index = 0
+        for tick in range(self.ticks + 1):
+            actions = []
+            while index < len(inputs) and inputs[index][0] == tick:
+                actions.append(inputs[index][1])
+                index += 1
+            yield tick, actions
+
+
+def simulate(reader: ReplayReader) -> Engine:
+    """
+    Re-simulate a replay on the headless engine, as fast as possible.
+
+    Args:
+        reader (ReplayReader): The replay.
+
+    Returns:
+        Engine: The engine at the end of the game.
+    """
+    engine = Engine(generator=reader.generator(), columns=reader.columns, rows=reader.rows)
+    apply, tick = engine.apply, engine.tick
+    played = 0
+    for at, action in reader.inputs:
+        for _ in range(at - played):
+            tick()
+        played = at
+        apply(action)
+    for _ in range(reader.ticks - played):
+        tick()
+    return engine
+
+
+def verify(reader: ReplayReader) -> Tuple[bool, Engine]:
+    """
+    Check that re-simulating a replay gives the result it recorded.
+
+    Args:
+        reader (ReplayReader): The replay.
+
+    Returns:
+        tuple: True if the score, lines and pieces match (False if they differ or the log
+        has no end record), and the engine at the end of the game.
+    """
+    engine = simulate(reader)
+    return reader.result == (engine.score, engine.lines, engine.pieces), engine
+
+
+if __name__ == "__main__":
+    # Re-verify replay files headlessly: python -m TetrisCore.Replay ../Replays/*.pxr
+    failures = 0
+    start = time.perf_counter()
+    for path in sys.argv[1:]:
+        reader = ReplayReader.load(path)
+        ok, engine = verify(reader)
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {path}: {reader.ticks} ticks, score {engine.score}, "
+              f"lines {engine.lines}, pieces {engine.pieces}, recorded {reader.result}")
+    elapsed = time.perf_counter() - start
+    print(f'{len(sys.argv) - 1} replays verified in {elapsed:.2f}s, {failures} failed', file=sys.stderr)
+    sys.exit(1 if failures else 0)
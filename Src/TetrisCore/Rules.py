@@ -0,0 +1,90 @@
+# Board geometry, scoring and leveling rules shared by the game and headless simulations.
+# This module must not import pygame.
+
+# Constants for the game grid (the default board, other sizes can be played)
+TOP = 1
+ROWS = 24
+COLUMNS = 14
+FLOOR = TOP + ROWS
+
+# Constants for grid positions
+LEFT = 0
+RIGHT = LEFT + COLUMNS
+MIDDLE = (LEFT + COLUMNS) // 2
+
+# Initial game score
+SCORE = 0
+
+# Length of one fixed simulation step, in milliseconds
+TICK_MS = 10
+
+# Time the falling piece takes to move down one row at each level, in milliseconds
+GRAVITY_MS = [1000, 830, 670, 580, 500, 420, 370, 330, 300, 270]
+
+# Score needed to leave each level
+LEVEL_THRESHOLDS = [500, 1000, 1500, 2000, 2250, 2500, 2750, 3000, 3250]
+
+# Number of cleared rows that counts as a Tetris
+TETRIS_ROWS = 3
+
+# Smallest board every piece can spawn and turn on
+MIN_COLUMNS = 4
+MIN_ROWS = 4
+
+
+def spawn_column(columns: int) -> int:
+    """
+    Get the anchor column new pieces spawn at, in the middle of the board.
+
+    Args:
+        columns (int): The width of the board.
+
+    Returns:
+        int: The spawn column (MIDDLE on the default board).
+    """
+    return (LEFT + columns) // 2
+
+
+def check_board_size(columns: int, rows: int) -> None:
+    """
+    Check that a board is large enough to play on.
+
+    Args:
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+
+    Raises:
+        ValueError: If the board is smaller than MIN_COLUMNS x MIN_ROWS.
+    """
+    if columns < MIN_COLUMNS or rows < MIN_ROWS:
+        raise ValueError(f'board must be at least {MIN_COLUMNS}x{MIN_ROWS}, not {columns}x{rows}')
+
+
+def level_for_score(score: int) -> int:
+    """
+    Get the game level reached with a given score.
+
+    Args:
+        score (int): The player's score.
+
+    Returns:
+        int: The game level, from 0 to len(LEVEL_THRESHOLDS).
+    """
+    return next((i for i, threshold in enumerate(LEVEL_THRESHOLDS) if score < threshold), len(LEVEL_THRESHOLDS))
+
+
+def score_for_rows(rows: int) -> int:
+    """
+    Get the points awarded for clearing a number of rows at once.
+
+    Args:
+        rows (int): The number of rows cleared by one lock.
+
+    Returns:
+        int: The points to add to the score.
+    """
+    if rows >= TETRIS_ROWS:
+        # Score for Tetris (three or more completed rows)
+        return 500 + 100 * (rows - TETRIS_ROWS)
+    # Score for completing rows (less than Tetris)
+    return 100 * rows
@@ -0,0 +1,47 @@
+# Summary statistics for simulation and benchmark results.
+# This module must not import pygame.
+from typing import Dict, Iterable, Sequence
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Get a percentile of sorted values, interpolating between the closest ranks.
+
+    Args:
+        sorted_values (Sequence): The values, sorted in ascending order.
+        q (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile value (0 if there are no values).
+    """
+    if not sorted_values:
+        return 0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(values: Iterable[float], percentiles: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+    """
+    Summarize values by their count, mean, extremes and percentiles.
+
+    Args:
+        values (Iterable): The values.
+        percentiles (Sequence): The percentiles to report.
+
+    Returns:
+        dict: `count`, `mean`, `min`, `max` and one `p<q>` entry per percentile.
+    """
+    ordered = sorted(values)
+    summary = {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered) if ordered else 0,
+        'min': ordered[0] if ordered else 0,
+        'max': ordered[-1] if ordered else 0,
+    }
+    for q in percentiles:
+        summary[f'p{q:g}'] = percentile(ordered, q)
+    return summary
@@ -0,0 +1,92 @@
+import pygame
+from typing import Optional
+from Util.Constants import *
+from .Viewport import VIEWPORT
+
+class Background:
+    """
+    The static layer of the game screen, composed once and reused every frame.
+
+    The layer holds everything that never changes during a game: the background grid
+    image, the grid lines and the side panel image with its logo, static HUD labels
+    (Next Piece, Score, Level, Timer) and the frames of the next-piece and value boxes.
+    It is presented with a single blit, or used as the restore source of dirty regions.
+    The layer is rebuilt when the screen size, the board viewport or the source images change.
+
+    Attributes:
+        surface (pygame.Surface): The composed layer, None until first built.
+
+    Methods:
+        get(screen, grid_img, tetris_img): Get the layer, composing it if needed.
+        invalidate: Drop the layer so it is composed again on next use.
+
+    Example:
+        To present the static layer:
+
+        >>> screen.blit(BACKGROUND.get(screen, grid_img, tetris_img), (0, 0))
+    """
+
+    grid_line_thickness = 2
+
+    def __init__(self):
+        self.surface: Optional[pygame.Surface] = None
+        self._key = None
+
+    def invalidate(self) -> None:
+        """
+        Drop the layer so it is composed again on next use.
+        """
+        self.surface = None
+        self._key = None
+
+    def get(self, screen: pygame.Surface, grid_img: pygame.Surface, tetris_img: pygame.Surface) -> pygame.Surface:
+        """
+        Get the static layer, composing it first if it is missing or out of date.
+
+        Parameters:
+            screen (pygame.Surface): The game screen surface (gives the layer size and pixel format).
+            grid_img (pygame.Surface): The background grid image.
+            tetris_img (pygame.Surface): The side panel image.
+
+        Returns:
+            pygame.Surface: The composed layer, the size of the screen.
+        """
+        key = (screen.get_size(), VIEWPORT.cell, VIEWPORT.columns, VIEWPORT.visible, id(grid_img), id(tetris_img))
+        if self.surface is None or key != self._key:
+            self.surface = self._compose(screen, grid_img, tetris_img)
+            self._key = key
+        return self.surface
+
+    def _compose(self, screen, grid_img, tetris_img) -> pygame.Surface:
+        """
+        Draw the grid image, the grid lines and the side panel into a new surface.
+        """
+        surface = pygame.Surface(screen.get_size()).convert(screen)
+        surface.blit(grid_img, (0, 0))
+        self.draw_grid(surface)
+        surface.blit(tetris_img, (GRIDSIZE * COLUMNS, 0))
+        return surface
+
+    def draw_grid(self, surface: pygame.Surface) -> None:
+        """
+        Draw the grid lines of the rows in view on a surface.
+
+        The lines get thinner with small cells, and are left out when the cells are too
+        small to show them.
+
+        Parameters:
+            surface (pygame.Surface): The surface to draw on.
+        """
+        height = surface.get_height()
+        cell, columns = VIEWPORT.cell, VIEWPORT.columns
+        thickness = min(self.grid_line_thickness, cell // 8)
+        if not thickness:
+            return
+        for i in range(columns + 1):
+            pygame.draw.line(surface, BLACK, (i * cell, 0), (i * cell, height), thickness)
+        for i in range(VIEWPORT.visible + 1):
+            pygame.draw.line(surface, BLACK, (0, i * cell), (cell * columns, i * cell), thickness)
+
+
+# Static layer shared by the full and the dirty-region renderers
+BACKGROUND = Background()
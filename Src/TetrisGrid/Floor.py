@@ -24,6 +24,7 @@ class Floor(Grid):
         
         >>> floor = Floor(col=3, row=7, blocksNo=5)
     """
+    __slots__ = ()
 
     def __init__(self, col: int = 1, row: int = 1, blocksNo: int = 1) -> None:
         # Initialize the Floor object using the parent Grid class
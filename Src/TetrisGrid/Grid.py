@@ -1,11 +1,21 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from Util.Constants import *
+from .Sprites import SPRITES
+from .Background import BACKGROUND
+from .Viewport import VIEWPORT
+from .TextCache import TEXT_CACHE
 
 class Grid:
+    # No per-instance dict: a grid is its anchor, its block offsets and its block cells
+    __slots__ = ('col', 'row', '_colOffsets', '_rowOffsets', '_blockCols', '_blockRows', '_blockClrs')
+
     def __init__(self, col: int = 1, row: int = 1, blocksNo: int = 1, clr_list: Optional[List[int]] = None) -> None:
         """
         Initialize a Grid object.
 
+        The blocks are kept as three parallel lists (columns, rows and colors) that
+        `update` rewrites in place, so moving a grid allocates no new objects.
+
         Parameters:
             col (int): Starting column position.
             row (int): Starting row position.
@@ -22,14 +32,44 @@ class Grid:
         self.row = row
         self._colOffsets = [0] * blocksNo
         self._rowOffsets = [0] * blocksNo
-        self.blocks = [{'col': col, 'row': row, 'clr': clr} for clr in clr_list]
+        self._blockCols = [col] * len(clr_list)
+        self._blockRows = [row] * len(clr_list)
+        self._blockClrs = list(clr_list)
 
     def update(self) -> None:
         """
         Update the positions of the blocks based on col and row offsets.
         """
-        self.blocks = [{'col': self.col + col_offset, 'row': self.row + row_offset, 'clr': block['clr']}
-                       for block, col_offset, row_offset in zip(self.blocks, self._colOffsets, self._rowOffsets)]
+        cols, rows = self._blockCols, self._blockRows
+        colOffsets, rowOffsets = self._colOffsets, self._rowOffsets
+        col, row = self.col, self.row
+        for index in range(min(len(cols), len(colOffsets))):
+            cols[index] = col + colOffsets[index]
+            rows[index] = row + rowOffsets[index]
+
+    def cells(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate over the blocks of the grid.
+
+        Returns:
+            iterator: `(col, row, clr)` tuples, one per block.
+        """
+        return zip(self._blockCols, self._blockRows, self._blockClrs)
+
+    @property
+    def blocks(self) -> List[Tuple[int, int, int]]:
+        """
+        The blocks of the grid as `(col, row, clr)` tuples (a copy, see `cells`).
+        """
+        return list(self.cells())
+
+    @blocks.setter
+    def blocks(self, blocks: Iterable[Tuple[int, int, int]]) -> None:
+        self._blockCols, self._blockRows, self._blockClrs = [], [], []
+        for col, row, clr in blocks:
+            self._blockCols.append(col)
+            self._blockRows.append(row)
+            self._blockClrs.append(clr)
 
     def collides(self, other: 'Grid') -> bool:
         """
@@ -41,8 +81,23 @@ class Grid:
         Returns:
             bool: True if there is a collision, False otherwise.
         """
-        return any(block['col'] == obstacle['col'] and block['row'] == obstacle['row']
-                   for block in self.blocks for obstacle in other.blocks)
+        return other.overlaps(self.cells())
+
+    def overlaps(self, cells: Iterable[Tuple[int, int, int]]) -> bool:
+        """
+        Check if any of the given blocks lies on one of this grid's blocks.
+
+        Subclasses with a faster cell lookup (such as Obstacles) override this method,
+        so `collides` picks it up no matter which grid is being tested against them.
+
+        Parameters:
+            cells (iterable): Blocks given as `(col, row, clr)` tuples.
+
+        Returns:
+            bool: True if there is a collision, False otherwise.
+        """
+        occupied = set(zip(self._blockCols, self._blockRows))
+        return any((col, row) in occupied for col, row, clr in cells)
 
     def append(self, other: 'Grid') -> None:
         """
@@ -51,7 +106,29 @@ class Grid:
         Parameters:
             other (Grid): Another grid whose blocks will be appended to this grid.
         """
-        self.blocks.extend(other.blocks)
+        # Appended blocks have no offsets: they keep their place when the grid is updated
+        for col, row, clr in other.cells():
+            self._blockCols.append(col)
+            self._blockRows.append(row)
+            self._blockClrs.append(clr)
+
+    def sprites(self, shadow: bool = False) -> List[tuple]:
+        """
+        Get the block sprites of the grid with their positions, ready for `Surface.blits`.
+
+        Parameters:
+            shadow (bool): Whether to use the shadow sprite (default is False).
+
+        Returns:
+            list: `(sprite, (x, y))` pairs, one per block in the viewport.
+        """
+        cell, top, bottom = VIEWPORT.cell, VIEWPORT.top, VIEWPORT.bottom()
+        if shadow:
+            sprite = SPRITES.shadow(cell)
+            return [(sprite, (col * cell, (row - top) * cell))
+                    for col, row in zip(self._blockCols, self._blockRows) if top <= row < bottom]
+        return [(SPRITES.block(clr, cell), (col * cell, (row - top) * cell))
+                for col, row, clr in self.cells() if top <= row < bottom]
 
     def draw(self, surface: pygame.Surface, shadow: bool = False) -> None:
         """
@@ -61,21 +138,22 @@ class Grid:
             surface (pygame.Surface): The surface to draw on.
             shadow (bool): Whether to draw a shadow (default is False).
         """
-        border_thickness = 3
-        shadow_thickness = 4 
-
-        for block in self.blocks:
-            x, y = block['col'] * GRIDSIZE, block['row'] * GRIDSIZE
+        surface.blits(self.sprites(shadow), doreturn=False)
 
-            if not shadow:
-                inner_rect = (x + border_thickness, y + border_thickness,
-                              GRIDSIZE - 2 * border_thickness, GRIDSIZE - 2 * border_thickness)
-                border_rect = (x, y, GRIDSIZE, GRIDSIZE)
+    @staticmethod
+    def draw_block(surface: pygame.Surface, col: int, row: int, clr: int, shadow: bool = False) -> None:
+        """
+        Draw a single block on a given surface.
 
-                pygame.draw.rect(surface, COLOURS[block['clr']], inner_rect)
-                pygame.draw.rect(surface, GRAY, border_rect, border_thickness)
-            else:
-                pygame.draw.rect(surface, AGRAY, (x, y, GRIDSIZE, GRIDSIZE), shadow_thickness)
+        Parameters:
+            surface (pygame.Surface): The surface to draw on.
+            col (int): The column of the block.
+            row (int): The row of the block.
+            clr (int): The color index of the block.
+            shadow (bool): Whether to draw a shadow outline instead of a block (default is False).
+        """
+        sprite = SPRITES.shadow(VIEWPORT.cell) if shadow else SPRITES.block(clr, VIEWPORT.cell)
+        surface.blit(sprite, VIEWPORT.position(col, row))
 
     @staticmethod
     def draw_grid(screen: pygame.Surface) -> None:
@@ -85,66 +163,99 @@ class Grid:
         Parameters:
             screen (pygame.Surface): The game screen surface.
         """
-        grid_line_thickness = 2
-
-        for i in range(COLUMNS + 1):
-            pygame.draw.line(screen, BLACK, (i * GRIDSIZE, 0), (i * GRIDSIZE, HEIGHT), grid_line_thickness)
-        for i in range(ROWS + 1):
-            pygame.draw.line(screen, BLACK, (0, i * GRIDSIZE), (GRIDSIZE * COLUMNS, i * GRIDSIZE), grid_line_thickness)
+        BACKGROUND.draw_grid(screen)
 
     @staticmethod
-    def redraw_screen(screen, grid_img, tetris_img, shape, shadow, obstacles, block_img_lst, next_shape_no, score, level, my_font):
+    def hud_items(next_shape_no: int, score: int, level: int) -> Dict[str, Tuple[object, Tuple[int, int]]]:
         """
-        Redraw the game screen with updated elements.
+        Get the value and screen position of every HUD field.
 
         Parameters:
-            screen  (pygame.Surface): The game screen surface.
-            grid_img (pygame.Surface): The background grid image.
-            tetris_img (pygame.Surface): The Tetris logo image.
-            shape (Shape): The current game shape.
-            shadow (Shape): The shadow of the game shape.
-            obstacles (Grid): The grid containing obstacles (other shapes).
-            block_img_lst (list): List of block images for next shape preview.
             next_shape_no (int): Index of the next shape.
             score (int): The player's score.
             level (int): The current game level.
-            my_font (pygame.Font): Font for displaying text.
-        """
-        screen.blit(grid_img, (0, 0))
-        Grid.draw_grid(screen)
-        screen.blit(tetris_img, (GRIDSIZE * COLUMNS, 0))
-        shape.draw(screen)
-        shadow.draw(screen, True)
-        obstacles.draw(screen)
 
+        Returns:
+            dict: Maps 'score', 'level' and 'timer' to `(text, position)`, and 'next' to `(next_shape_no, position)`.
+        """
         # Fixed base positions
         base_x_position = GRIDSIZE * COLUMNS
         fixed_y_offset = 160
 
-        # Fixed positions for score, level, and timer
-        score_pos = (base_x_position + 100, 540 - fixed_y_offset / 2)   # Score
-        level_pos = (base_x_position + 100, 540 - fixed_y_offset)       # Level
+        # Fixed positions for score, level, and timer (matching the boxes of the side panel)
+        score_pos = (base_x_position + 100, 540 - fixed_y_offset)       # Score
+        level_pos = (base_x_position + 100, 540 - fixed_y_offset / 2)   # Level
         timer_pos = (base_x_position + 100, 540)                        # Timer
         next_shape_pos_x = base_x_position + 72
 
-        # Dictionary for text rendering
-        texts = {
-            'score': (str(level + 1), score_pos),
-            'level': (str(score), level_pos),
-            'timer': (str(round(pygame.time.get_ticks() / 1000, 2)), timer_pos),
-        }
-
-        # Render and blit the text onto the screen
-        for text, position in texts.values():
-            text_surface = my_font.render(text, True, RED)
-            screen.blit(text_surface, position)
-            
         shape_offset = 0
         if next_shape_no == 5:
             shape_offset = -10
         elif next_shape_no == 7:
             shape_offset = 10
 
-        screen.blit(block_img_lst[next_shape_no - 1], (next_shape_pos_x + shape_offset, 240))
+        return {
+            'score': (str(score), score_pos),
+            'level': (str(level + 1), level_pos),
+            'timer': (str(round(pygame.time.get_ticks() / 1000, 2)), timer_pos),
+            'next': (next_shape_no, (next_shape_pos_x + shape_offset, 240)),
+        }
+
+    @staticmethod
+    def draw_hud_item(screen: pygame.Surface, name: str, value, position, block_img_lst, my_font) -> pygame.Rect:
+        """
+        Draw one HUD field returned by `hud_items`.
+
+        Text values come from the text surface cache, and the timer is composed from
+        cached digit glyphs, so fonts are only rasterized when a value changes.
+
+        Parameters:
+            screen (pygame.Surface): The game screen surface.
+            name (str): The HUD field ('score', 'level', 'timer' or 'next').
+            value: The text of the field, or the next shape index for 'next'.
+            position (tuple): The top-left corner of the field.
+            block_img_lst (list): List of block images for next shape preview.
+            my_font (pygame.Font): Font for displaying text.
+
+        Returns:
+            pygame.Rect: The area covered by the field.
+        """
+        if name == 'next':
+            return screen.blit(block_img_lst[value - 1], position)
+        if name == 'timer':
+            return TEXT_CACHE.blit_digits(screen, my_font, value, RED, position)
+        return screen.blit(TEXT_CACHE.render(my_font, value, RED), position)
+
+    @staticmethod
+    def redraw_screen(screen, grid_img, tetris_img, shape, shadow, obstacles, block_img_lst, next_shape_no, score, level, my_font,
+                      present=True):
+        """
+        Redraw the game screen with updated elements.
+
+        Parameters:
+            screen  (pygame.Surface): The game screen surface.
+            grid_img (pygame.Surface): The background grid image.
+            tetris_img (pygame.Surface): The Tetris logo image.
+            shape (Shape): The current game shape.
+            shadow (Shape): The shadow of the game shape.
+            obstacles (Grid): The grid containing obstacles (other shapes).
+            block_img_lst (list): List of block images for next shape preview.
+            next_shape_no (int): Index of the next shape.
+            score (int): The player's score.
+            level (int): The current game level.
+            my_font (pygame.Font): Font for displaying text.
+            present (bool): Flip the display at the end (False to present the frame separately).
+        """
+        # Scroll tall boards to the falling shape
+        VIEWPORT.follow(shape.row)
+        # Static layer (grid image, grid lines and side panel) in a single blit
+        screen.blit(BACKGROUND.get(screen, grid_img, tetris_img), (0, 0))
+        # Falling shape, shadow and obstacles in a single batched blit
+        screen.blits(shape.sprites() + shadow.sprites(True) + obstacles.sprites(), doreturn=False)
+
+        # Blit the score, level, timer and next shape preview onto the screen
+        for name, (value, position) in Grid.hud_items(next_shape_no, score, level).items():
+            Grid.draw_hud_item(screen, name, value, position, block_img_lst, my_font)
 
-        pygame.display.flip()
+        if present:
+            pygame.display.flip()
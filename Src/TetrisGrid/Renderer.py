@@ -0,0 +1,184 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+from Util.Constants import *
+from .Grid import Grid
+from .Sprites import SPRITES
+from .Background import BACKGROUND
+from .Viewport import VIEWPORT
+
+class DirtyRenderer:
+    """
+    Redraws only the parts of the game screen that changed since the previous frame.
+
+    The renderer remembers what it drew in every board cell (falling shape, shadow,
+    obstacle) and every HUD field (score, level, timer, next shape). Each frame it
+    compares the new state against that record, repaints the cells and fields that
+    differ from the static background layer, and pushes only those rectangles with
+    `pygame.display.update(rects)`. A frame where nothing changed is not presented.
+    Only the rows in the viewport are compared, and a scroll of the viewport repaints
+    the whole screen.
+
+    It takes the same arguments as Grid.redraw_screen, so the two can be swapped.
+
+    Methods:
+        redraw: Repaint the changed regions and present them.
+        present: Present the regions of a redraw made with `present=False`.
+        invalidate: Force a full repaint on the next frame.
+
+    Example:
+        To redraw the game screen every frame:
+
+        >>> renderer = DirtyRenderer()
+        >>> renderer.redraw(screen, grid_img, tetris_img, shape, shadow, obstacles,
+        ...                 block_img, next_shape_no, score, level, font)
+    """
+
+    def __init__(self):
+        self._background = None
+        self._drawn: Dict[Tuple[int, int], Tuple[int, bool, int]] = {}
+        self._piece: List[Tuple[int, int]] = []
+        self._rows: List[Tuple[int, Tuple[int, ...]]] = []
+        self._version = None
+        self._view = None
+        self._hud: Dict[str, Tuple[object, pygame.Rect]] = {}
+        self._full = True
+        # Rectangles repainted by the last redraw and not presented yet, None for the whole screen
+        self._pending: Optional[List[pygame.Rect]] = []
+
+    def invalidate(self) -> None:
+        """
+        Force a full repaint on the next frame, e.g. after another screen covered the game.
+        """
+        self._full = True
+
+    def _cell_state(self, cell, piece, ghost, obstacles) -> Tuple[int, bool, int]:
+        """
+        Get what a board cell should show: shape color, shadow flag and obstacle color.
+        """
+        return piece.get(cell, 0), cell in ghost, obstacles.cellColor(*cell)
+
+    def _paint_cell(self, blits, cell, state) -> pygame.Rect:
+        """
+        Queue the restore of a board cell from the background and its sprites, in the order of Grid.redraw_screen.
+        """
+        rect = VIEWPORT.rect(*cell)
+        blits.append((self._background, rect, rect))
+        piece_clr, in_ghost, obstacle_clr = state
+        if piece_clr:
+            blits.append((SPRITES.block(piece_clr, VIEWPORT.cell), rect))
+        if in_ghost:
+            blits.append((SPRITES.shadow(VIEWPORT.cell), rect))
+        if obstacle_clr:
+            blits.append((SPRITES.block(obstacle_clr, VIEWPORT.cell), rect))
+        return rect
+
+    def redraw(self, screen, grid_img, tetris_img, shape, shadow, obstacles, block_img_lst,
+               next_shape_no, score, level, my_font, present=True) -> bool:
+        """
+        Repaint the changed regions of the game screen and present them.
+
+        Parameters:
+            screen  (pygame.Surface): The game screen surface.
+            grid_img (pygame.Surface): The background grid image.
+            tetris_img (pygame.Surface): The Tetris logo image.
+            shape (Shape): The current game shape.
+            shadow (Shape): The shadow of the game shape.
+            obstacles (Obstacles): The locked cells.
+            block_img_lst (list): List of block images for next shape preview.
+            next_shape_no (int): Index of the next shape.
+            score (int): The player's score.
+            level (int): The current game level.
+            my_font (pygame.Font): Font for displaying text.
+            present (bool): Present the repainted regions (False to call present separately).
+
+        Returns:
+            bool: True if a frame was presented (or is waiting to be), False if nothing changed.
+        """
+        # Scroll tall boards to the falling shape
+        VIEWPORT.follow(shape.row)
+        view = (VIEWPORT.top, VIEWPORT.cell)
+        top, bottom = VIEWPORT.top, VIEWPORT.bottom()
+        background = BACKGROUND.get(screen, grid_img, tetris_img)
+        full = self._full or background is not self._background or view != self._view
+        if full:
+            self._background = background
+            self._view = view
+            screen.blit(background, (0, 0))
+            self._drawn.clear()
+            self._hud.clear()
+            self._rows = []
+            self._version = None
+            self._full = False
+
+        piece = {(col, row): clr for col, row, clr in shape.cells() if top <= row < bottom}
+        ghost = {(col, row) for col, row, clr in shadow.cells() if top <= row < bottom}
+
+        # Cells whose content may have changed: old and new shape and shadow cells,
+        # plus every cell of the obstacle rows that changed since the last frame
+        candidates = set(piece) | ghost | set(self._piece)
+        if obstacles.version != self._version:
+            rows = [(obstacles.rowBits(row), obstacles.rowColors(row)) for row in range(top, min(bottom, obstacles.rows))]
+            for index, state in enumerate(rows):
+                if index >= len(self._rows) or self._rows[index] != state:
+                    candidates.update((obstacles.col + offset, top + index) for offset in range(obstacles.columns))
+            self._rows = rows
+            self._version = obstacles.version
+        self._piece = list(piece) + list(ghost)
+
+        dirty = []
+        blits = []
+        empty = (0, False, 0)
+        for cell in candidates:
+            state = self._cell_state(cell, piece, ghost, obstacles)
+            if self._drawn.get(cell, empty) != state:
+                dirty.append(self._paint_cell(blits, cell, state))
+                if state == empty:
+                    self._drawn.pop(cell, None)
+                else:
+                    self._drawn[cell] = state
+        # Every changed cell is restored and redrawn in a single batched blit
+        screen.blits(blits, doreturn=False)
+
+        # HUD fields: restore the area of every changed field, then redraw every
+        # field overlapping a restored area
+        items = Grid.hud_items(next_shape_no, score, level)
+        restored = []
+        for name, (value, position) in items.items():
+            drawn = self._hud.get(name)
+            if drawn is None or drawn[0] != value:
+                if drawn is not None:
+                    screen.blit(self._background, drawn[1], drawn[1])
+                    restored.append(drawn[1])
+                self._hud.pop(name, None)
+        for name, (value, position) in items.items():
+            drawn = self._hud.get(name)
+            if drawn is not None and drawn[1].collidelist(restored) == -1:
+                continue
+            rect = Grid.draw_hud_item(screen, name, value, position, block_img_lst, my_font)
+            self._hud[name] = (value, rect)
+            restored.append(rect)
+        dirty.extend(restored)
+
+        self._pending = None if full else dirty
+        if present:
+            return self.present()
+        return full or bool(dirty)
+
+    def present(self, extra: List[pygame.Rect] = ()) -> bool:
+        """
+        Present the regions repainted by the last redraw.
+
+        Parameters:
+            extra (list): More regions to present, drawn on the screen after the redraw.
+
+        Returns:
+            bool: True if a frame was presented, False if nothing changed.
+        """
+        pending, self._pending = self._pending, []
+        if pending is None:
+            pygame.display.flip()
+        elif pending or extra:
+            pygame.display.update(pending + [rect for rect in extra if rect])
+        else:
+            return False
+        return True
@@ -0,0 +1,96 @@
+import pygame
+from typing import Dict, List, Tuple
+from Util.Constants import *
+
+class SpriteCache:
+    """
+    Pre-rendered block sprites, one per color index in COLOURS plus a shadow sprite.
+
+    Blocks are drawn once per cell size into small surfaces, so drawing the board is a
+    matter of blitting them instead of issuing two `pygame.draw.rect` calls per block.
+    The shadow sprite keeps per-pixel alpha, so it is blended over whatever lies below.
+    The sprites of every cell size asked for are kept, so renderers drawing at several
+    sizes (the game board and the tiles of the spectator view) share them. The borders
+    get thinner with small cells, so the color of a block stays visible.
+
+    Attributes:
+        size (int): The cell size of the last sprites asked for.
+
+    Methods:
+        block(clr, size): Get the sprite of a block color.
+        shadow(size): Get the shadow sprite.
+
+    Example:
+        To blit a red block at the top-left cell:
+
+        >>> screen.blit(SPRITES.block(1, GRIDSIZE), (0, 0))
+    """
+
+    border_thickness = 3
+    shadow_thickness = 4
+
+    def __init__(self):
+        self.size = None
+        self._blocks: List[pygame.Surface] = []
+        self._shadow = None
+        self._sizes: Dict[int, Tuple[List[pygame.Surface], pygame.Surface]] = {}
+
+    def _build(self, size: int) -> None:
+        """
+        Select the sprites of a cell size, rendering them on first use.
+        """
+        sprites = self._sizes.get(size)
+        if sprites is None:
+            sprites = self._sizes[size] = self._render(size)
+        self._blocks, self._shadow = sprites
+        self.size = size
+
+    def _render(self, size: int) -> Tuple[List[pygame.Surface], pygame.Surface]:
+        """
+        Render every block sprite and the shadow sprite for a cell size.
+        """
+        border = max(1, min(self.border_thickness, size // 8))
+        blocks = []
+        for colour in COLOURS:
+            sprite = pygame.Surface((size, size)).convert()
+            pygame.draw.rect(sprite, colour, (border, border, size - 2 * border, size - 2 * border))
+            pygame.draw.rect(sprite, GRAY, (0, 0, size, size), border)
+            blocks.append(sprite)
+
+        shadow = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        shadow.fill((0, 0, 0, 0))
+        pygame.draw.rect(shadow, AGRAY, (0, 0, size, size), max(1, min(self.shadow_thickness, size // 6)))
+        return blocks, shadow
+
+    def block(self, clr: int, size: int = GRIDSIZE) -> pygame.Surface:
+        """
+        Get the sprite of a block color.
+
+        Parameters:
+            clr (int): The color index in COLOURS.
+            size (int): The cell size in pixels.
+
+        Returns:
+            pygame.Surface: The block sprite.
+        """
+        if size != self.size:
+            self._build(size)
+        return self._blocks[clr]
+
+    def shadow(self, size: int = GRIDSIZE) -> pygame.Surface:
+        """
+        Get the shadow sprite.
+
+        Parameters:
+            size (int): The cell size in pixels.
+
+        Returns:
+            pygame.Surface: The shadow outline with per-pixel alpha.
+        """
+        if size != self.size:
+            self._build(size)
+        return self._shadow
+
+
+# Sprites shared by every grid, built on first use (a display mode must be set)
+SPRITES = SpriteCache()
@@ -0,0 +1,105 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+class TextCache:
+    """
+    Caches rendered text surfaces and composes numbers from pre-rendered digit glyphs.
+
+    `render` keeps the surfaces of recently drawn strings, keyed by font, text and
+    color, so a HUD value is only rasterized again when it changes. The cache is
+    bounded: the least recently used surfaces are evicted once `max_entries` is reached.
+
+    `blit_digits` draws strings made of digits and a few separators (such as the timer,
+    which changes every frame) by blitting one pre-rendered glyph per character, so
+    they never go through `Font.render`.
+
+    Args:
+        max_entries (int): Maximum number of cached text surfaces.
+
+    Methods:
+        render(font, text, colour): Get the surface of a text, rendering it on a cache miss.
+        blit_digits(surface, font, text, colour, position): Draw a number from cached glyphs.
+
+    Example:
+        To draw the score and the timer:
+
+        >>> screen.blit(TEXT_CACHE.render(font, str(score), RED), score_pos)
+        >>> TEXT_CACHE.blit_digits(screen, font, '12.34', RED, timer_pos)
+    """
+
+    digits = '0123456789.:-'
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._surfaces: 'OrderedDict[Tuple[pygame.font.Font, str, tuple], pygame.Surface]' = OrderedDict()
+        self._glyphs: Dict[Tuple[pygame.font.Font, tuple], Dict[str, Tuple[pygame.Surface, int]]] = {}
+
+    def render(self, font: pygame.font.Font, text: str, colour) -> pygame.Surface:
+        """
+        Get the surface of a text, rendering it only on a cache miss.
+
+        Parameters:
+            font (pygame.font.Font): The font to render with.
+            text (str): The text to render.
+            colour (tuple): The text color.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (font, text, tuple(colour))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, colour)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def blit_digits(self, surface: pygame.Surface, font: pygame.font.Font, text: str, colour, position) -> pygame.Rect:
+        """
+        Draw a number on a surface from pre-rendered digit glyphs.
+
+        Characters without a glyph fall back to a cached `render` of the whole text.
+
+        Parameters:
+            surface (pygame.Surface): The surface to draw on.
+            font (pygame.font.Font): The font of the glyphs.
+            text (str): The digits to draw.
+            colour (tuple): The text color.
+            position (tuple): The top-left corner of the text.
+
+        Returns:
+            pygame.Rect: The area covered by the text.
+        """
+        glyphs = self._glyph_set(font, colour)
+        x, y = position
+        sequence = []
+        for char in text:
+            glyph = glyphs.get(char)
+            if glyph is None:
+                return surface.blit(self.render(font, text, colour), position)
+            sequence.append((glyph[0], (x, y)))
+            x += glyph[1]
+        surface.blits(sequence, doreturn=False)
+        return pygame.Rect(position[0], y, x - position[0], glyphs['0'][0].get_height())
+
+    def _glyph_set(self, font: pygame.font.Font, colour) -> Dict[str, Tuple[pygame.Surface, int]]:
+        """
+        Get the digit glyphs (with their widths) of a font and color, rendering them on first use.
+        """
+        key = (font, tuple(colour))
+        glyphs = self._glyphs.get(key)
+        if glyphs is None:
+            glyphs = {}
+            for char in self.digits:
+                glyph = font.render(char, True, colour)
+                glyphs[char] = (glyph, glyph.get_width())
+            self._glyphs[key] = glyphs
+        return glyphs
+
+
+# Text surfaces shared by the HUD renderers
+TEXT_CACHE = TextCache()
@@ -0,0 +1,176 @@
+import math
+import pygame
+from typing import List, Optional, Sequence, Tuple
+from Util.Constants import *
+from TetrisCore.Pieces import PIECE_TABLE
+from .Sprites import SPRITES
+
+class TiledRenderer:
+    """
+    Draws many games side by side in one window, one tile per game.
+
+    The window is split into a grid of tiles sized so that every board fits with the
+    largest cells possible. Every tile is a subsurface of the screen holding the board
+    and a label with the score below it, and every game is read like an Engine (`board`,
+    `clr`, `rot`, `col`, `row`, `score`, `inPlay` and `ghost_row()`).
+
+    Drawing a frame only touches the tiles whose game changed since they were drawn:
+    the locked cells of a board are composed into a layer of the tile that is only
+    rebuilt when `board.version` changes, and a changed tile is that layer plus the
+    falling piece and its shadow. All the tiles share the block sprites of SPRITES, at
+    the cell size of the layout. The areas of the changed tiles are returned, to be
+    presented with a single display update per frame.
+
+    Args:
+        surface (pygame.Surface): The window surface.
+        games (Sequence): The games to show, one per tile. Items may be replaced between
+            frames (e.g. to restart a game that ended).
+        gap (int): Space between two tiles, in pixels.
+
+    Attributes:
+        games (list): The games shown, in tile order.
+        cell (int): The size of a cell, in pixels.
+        tiles (list): The area of every tile on the window.
+
+    Methods:
+        layout(): Fit the tiles to the window and to the boards.
+        draw(): Draw the tiles of the games that changed.
+        invalidate(): Draw every tile again on the next frame.
+
+    Example:
+        To show sixteen games and present the changed tiles every frame:
+
+        >>> tiles = TiledRenderer(screen, [Engine(seed=seed) for seed in range(16)])
+        >>> pygame.display.update(tiles.draw())
+    """
+
+    background = (20, 20, 20)
+    board_colour = BLACK
+    label_font = FontAsset('Consolas', 14)
+
+    def __init__(self, surface: pygame.Surface, games: Sequence, gap: int = 4):
+        self.surface = surface
+        self.games = list(games)
+        self.gap = gap
+        self.layout()
+
+    def layout(self) -> None:
+        """
+        Fit the tiles to the window: choose the number of tiles per line giving the
+        largest cells, and center the grid of tiles.
+
+        The boards may have different sizes; the tiles are sized for the largest.
+
+        Raises:
+            ValueError: If there are no games or the boards do not fit in the window.
+        """
+        if not self.games:
+            raise ValueError('no games to show')
+        width, height = self.surface.get_size()
+        columns = max(game.board.columns for game in self.games)
+        rows = max(game.board.rows for game in self.games)
+        count, gap = len(self.games), self.gap
+        label = self.label_font.get().get_linesize()
+        best = None
+        for across in range(1, count + 1):
+            down = math.ceil(count / across)
+            cell = min((width - gap * (across + 1)) // (across * columns),
+                       (height - gap * (down + 1) - label * down) // (down * rows))
+            if best is None or cell > best[0]:
+                best = (cell, across, down)
+        cell, across, down = best
+        if cell < 2:
+            raise ValueError(f'{count} boards of {columns} x {rows} do not fit in a {width} x {height} window')
+
+        tile_width, tile_height = columns * cell, rows * cell + label
+        left = (width - across * tile_width - (across - 1) * gap) // 2
+        top = (height - down * tile_height - (down - 1) * gap) // 2
+        self.cell = cell
+        self.tiles: List[pygame.Rect] = [
+            pygame.Rect(left + (index % across) * (tile_width + gap), top + (index // across) * (tile_height + gap),
+                        tile_width, tile_height)
+            for index in range(count)]
+        self._views = [self.surface.subsurface(tile) for tile in self.tiles]
+        self._label = label
+        # Per tile: the locked cells layer, the (board, version) it shows, the score label and the state drawn last
+        self._layers: List[Optional[pygame.Surface]] = [None] * count
+        self._layerKeys: List[Optional[Tuple[object, int]]] = [None] * count
+        self._labels: List[Optional[Tuple[int, bool, pygame.Surface]]] = [None] * count
+        self._drawn: List[Optional[tuple]] = [None] * count
+        self._cleared = False
+
+    def invalidate(self) -> None:
+        """
+        Draw the window background and every tile again on the next frame.
+        """
+        self._drawn = [None] * len(self.tiles)
+        self._cleared = False
+
+    def draw(self) -> List[pygame.Rect]:
+        """
+        Draw the tiles whose game changed since they were last drawn.
+
+        Returns:
+            list: The window areas drawn, the whole window when the background was drawn.
+        """
+        rects = []
+        if not self._cleared:
+            self.surface.fill(self.background)
+            self._cleared = True
+            rects.append(self.surface.get_rect())
+        for index, game in enumerate(self.games):
+            board = game.board
+            state = (board, board.version, game.clr, game.rot, game.col, game.row, game.score, game.inPlay)
+            if state == self._drawn[index]:
+                continue
+            self._draw_tile(index, game)
+            self._drawn[index] = state
+            rects.append(self.tiles[index])
+        return rects
+
+    def _layer(self, index: int, board) -> pygame.Surface:
+        """
+        Get the locked cells of a board drawn on the board colour, composing them again
+        if the board changed since they were drawn.
+        """
+        key = (board, board.version)
+        layer = self._layers[index]
+        if layer is None or self._layerKeys[index] != key:
+            cell = self.cell
+            if layer is None or layer.get_size() != (board.columns * cell, board.rows * cell):
+                layer = self._layers[index] = pygame.Surface((board.columns * cell, board.rows * cell)).convert()
+            layer.fill(self.board_colour)
+            blocks = [SPRITES.block(clr, cell) for clr in range(len(COLOURS))]
+            left = board.col
+            layer.blits([(blocks[clr], ((col - left) * cell, row * cell)) for col, row, clr in board.cells()],
+                        doreturn=False)
+            self._layerKeys[index] = key
+        return layer
+
+    def _draw_tile(self, index: int, game) -> None:
+        """
+        Draw one tile: the locked cells, the shadow and blocks of the falling piece, and the score.
+        """
+        view, cell = self._views[index], self.cell
+        board = game.board
+        if (board.columns * cell, board.rows * cell + self._label) != view.get_size():
+            # A board smaller than the tile leaves a margin of background
+            view.fill(self.background)
+        view.blit(self._layer(index, board), (0, 0))
+        if game.inPlay:
+            mask = PIECE_TABLE[game.clr][game.rot]
+            left = game.col - board.col
+            shadow, block = SPRITES.shadow(cell), SPRITES.block(game.clr, cell)
+            ghost = game.ghost_row()
+            view.blits([(shadow, ((left + dc) * cell, (ghost + dr) * cell)) for dc, dr in zip(mask.colOffsets, mask.rowOffsets)],
+                       doreturn=False)
+            view.blits([(block, ((left + dc) * cell, (game.row + dr) * cell)) for dc, dr in zip(mask.colOffsets, mask.rowOffsets)],
+                       doreturn=False)
+        # The score is rendered again only when it changes (a game that ended shows it in red)
+        label = self._labels[index]
+        if label is None or label[:2] != (game.score, game.inPlay):
+            text = self.label_font.get().render(str(game.score), True, GRAY if game.inPlay else RED)
+            label = self._labels[index] = (game.score, game.inPlay, text)
+        top = board.rows * cell
+        view.fill(self.background, (0, top, view.get_width(), self._label))
+        view.blit(label[2], (0, top))
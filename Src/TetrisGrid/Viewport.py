@@ -0,0 +1,105 @@
+import pygame
+from typing import Tuple
+from Util.Constants import *
+from TetrisCore.Rules import check_board_size
+
+class Viewport:
+    """
+    The band of board rows shown on the screen, and the size of their cells.
+
+    The board area of the window keeps the size of the default board (the side panel
+    never moves). A board of another size gets cells as large as the default ones,
+    or smaller when it is wider than the default board, so that all of its columns fit.
+    A board with more rows than fit in the window scrolls: the viewport follows the
+    falling piece, keeping `margin` rows visible around it.
+
+    Every renderer draws through the viewport: only the visible rows are drawn, so a
+    frame costs the same on a board of 24 rows as on a board of 1000.
+
+    Attributes:
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+        cell (int): The size of a cell on the screen, in pixels.
+        visible (int): Number of rows shown at once.
+        top (int): The first row shown.
+
+    Methods:
+        configure(columns, rows): Fit the viewport to a board.
+        follow(row): Scroll to keep a row in view.
+        bottom(): The row after the last one shown.
+        position(col, row) / rect(col, row): Screen position and area of a cell.
+
+    Example:
+        To play on a 40 x 200 board:
+
+        >>> VIEWPORT.configure(40, 200)
+        >>> VIEWPORT.follow(shape.row)
+    """
+
+    margin = 4
+
+    def __init__(self, columns: int = COLUMNS, rows: int = ROWS):
+        self.configure(columns, rows)
+
+    def configure(self, columns: int, rows: int) -> None:
+        """
+        Fit the viewport to a board and scroll back to its top.
+
+        Parameters:
+            columns (int): The width of the board.
+            rows (int): The height of the board.
+
+        Raises:
+            ValueError: If the board is too small to play on or too wide for the window.
+        """
+        check_board_size(columns, rows)
+        cell = min(GRIDSIZE, GRIDSIZE * COLUMNS // columns)
+        if cell < 1:
+            raise ValueError(f'board of {columns} columns does not fit in the window')
+        self.columns = columns
+        self.rows = rows
+        self.cell = cell
+        self.visible = min(rows, HEIGHT // cell)
+        self.top = 0
+
+    def follow(self, row: int) -> bool:
+        """
+        Scroll so that a row and `margin` rows around it are shown.
+
+        Parameters:
+            row (int): The row to keep in view (the anchor row of the falling piece).
+
+        Returns:
+            bool: True if the viewport scrolled.
+        """
+        top = self.top
+        if row - self.margin < top:
+            top = row - self.margin
+        elif row + self.margin >= top + self.visible:
+            top = row + self.margin - self.visible + 1
+        top = max(0, min(top, self.rows - self.visible))
+        scrolled = top != self.top
+        self.top = top
+        return scrolled
+
+    def bottom(self) -> int:
+        """
+        Get the row after the last row shown.
+        """
+        return self.top + self.visible
+
+    def position(self, col: int, row: int) -> Tuple[int, int]:
+        """
+        Get the screen position of the top-left corner of a cell.
+        """
+        return col * self.cell, (row - self.top) * self.cell
+
+    def rect(self, col: int, row: int) -> pygame.Rect:
+        """
+        Get the screen area of a cell.
+        """
+        return pygame.Rect(col * self.cell, (row - self.top) * self.cell, self.cell, self.cell)
+
+
+# The view of the board shared by the renderers, set up for the default board
+VIEWPORT = Viewport()
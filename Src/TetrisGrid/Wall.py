@@ -26,6 +26,8 @@ class Wall(Grid):
         
         >>> wall = Wall(col=5, row=2, blocksNo=3, clr=2)
     """
+    __slots__ = ()
+
     def __init__(self, col: int = 1, row: int = 1, blocksNo: int = 1, clr: int = 1) -> None:
         # Create a list of color indices for the wall blocks
         color_indices = [clr] * blocksNo
@@ -0,0 +1,58 @@
+from TetrisPiece.Shape import Shape
+from TetrisPiece.Obstacles import Obstacles
+
+class Ghost:
+    """
+    Keeps the shadow (ghost piece) of the falling shape up to date.
+
+    Shadows are reused: the pool holds one Shape per piece, created the first time
+    that piece falls, so a game allocates at most seven shadows. The landing row is
+    only recomputed when the falling shape moves, rotates or changes, or when the
+    obstacles change through a lock or a line clear; every other frame returns the
+    cached shadow as is.
+
+    Attributes:
+        shadow (Shape): The shadow shape drawn below the falling shape.
+        pool (dict): The shadow shape of every piece seen so far, by piece number.
+
+    Methods:
+        update: Return the shadow of a shape, recomputing it only when needed.
+
+    Example:
+        To get the shadow of the falling shape every frame:
+
+        >>> ghost = Ghost()
+        >>> shadow = ghost.update(shape, obstacles)
+    """
+
+    def __init__(self):
+        self.shadow = None
+        self.pool = {}
+        self._clr = self._rot = self._col = self._row = self._version = None
+
+    def update(self, shape: Shape, obstacles: Obstacles) -> Shape:
+        """
+        Return the shadow of a shape, recomputing it only when needed.
+
+        Args:
+            shape (Shape): The falling shape.
+            obstacles (Obstacles): The obstacles the shadow lands on.
+
+        Returns:
+            Shape: The shadow shape at its landing row.
+        """
+        if (shape.col == self._col and shape.row == self._row and shape._rot == self._rot
+                and shape.clr == self._clr and obstacles.version == self._version):
+            return self.shadow
+
+        self._clr, self._rot, self._col, self._row = shape.clr, shape._rot, shape.col, shape.row
+        self._version = obstacles.version
+
+        if self.shadow is None or self.shadow.clr != shape.clr:
+            self.shadow = self.pool.get(shape.clr)
+            if self.shadow is None:
+                self.shadow = self.pool[shape.clr] = Shape(shape.col, shape.row, shape.clr, shape._rot, True)
+        self.shadow.col, self.shadow._rot = shape.col, shape._rot
+        self.shadow.row = shape.landing_row(obstacles)
+        self.shadow.rotate()
+        return self.shadow
@@ -1,5 +1,3 @@
-import pygame
-from random import randint
 from Util.Constants import *
 
 from TetrisPiece import Obstacles
@@ -8,7 +6,7 @@ from TetrisPiece.Shape import Shape
 
 class MovePiece:
     @staticmethod
-    def drop(my_shape: Shape, floor: Floor, obstacles: Obstacles, force_hit: pygame.mixer.Sound) -> None:
+    def drop(my_shape: Shape, floor: Floor, obstacles: Obstacles, force_hit: SoundAsset) -> None:
         """
         Drop a shape until it collides with the floor or other obstacles.
 
@@ -16,21 +14,21 @@ class MovePiece:
             my_shape (Shape): The shape to drop.
             floor (Floor): The floor object representing the bottom boundary.
             obstacles (Obstacles): The obstacles on the grid.
-            force_hit (Sound): The sound effect to play when the shape hits the floor.
+            force_hit (SoundAsset): The sound effect to play when the shape hits the floor.
 
-        Drops the given shape vertically until it collides with either the floor or other obstacles. If the shape
-        is not a shadow, it plays the 'force_hit' sound effect upon hitting the floor.
+        Drops the given shape vertically until it collides with either the floor or other obstacles. The landing
+        row is computed from the column heights of the obstacles instead of stepping down one row at a time. If
+        the shape is not a shadow, it plays the 'force_hit' sound effect upon hitting the floor.
 
         Returns:
             None
         """
-        while True:
-            my_shape.move_down()
-            if my_shape.collides(floor) or my_shape.collides(obstacles):
-                my_shape.move_up()
-                break
+        row = my_shape.landing_row(obstacles)
+        if row != my_shape.row:
+            my_shape.row = row
+            my_shape.update()
         if not my_shape.shadow:
-            pygame.mixer.Channel(2).play(force_hit)
+            force_hit.play(2)
 
     @staticmethod
     def move_piece_left(shape: Shape, leftWall: Wall, obstacles: Obstacles) -> None:
@@ -43,13 +41,14 @@ class MovePiece:
             obstacles (Obstacles): The obstacles on the grid.
 
         Moves the given shape one step to the left if it does not collide with the left wall or other obstacles.
+        The target position is checked against the precomputed piece masks before the shape is moved,
+        the board bounds being taken from `obstacles`.
 
         Returns:
             None
         """
-        shape.move_left()
-        if shape.collides(leftWall) or shape.collides(obstacles):
-            shape.move_right()
+        if shape.fits(obstacles, shape.col - 1, shape.row, shape._rot):
+            shape.move_left()
 
     @staticmethod
     def move_piece_right(shape: Shape, rightWall: Wall, obstacles: Obstacles) -> None:
@@ -62,16 +61,17 @@ class MovePiece:
             obstacles (Obstacles): The obstacles on the grid.
 
         Moves the given shape one step to the right if it does not collide with the right wall or other obstacles.
+        The target position is checked against the precomputed piece masks before the shape is moved,
+        the board bounds being taken from `obstacles`.
 
         Returns:
             None
         """
-        shape.move_right()
-        if shape.collides(rightWall) or shape.collides(obstacles):
-            shape.move_left()
+        if shape.fits(obstacles, shape.col + 1, shape.row, shape._rot):
+            shape.move_right()
 
     @staticmethod
-    def rotate_piece_clockwise(shape: Shape, leftWall: Wall, rightWall: Wall, floor: Floor, obstacles: Obstacles, block_rotate: pygame.mixer.Sound) -> None:
+    def rotate_piece_clockwise(shape: Shape, leftWall: Wall, rightWall: Wall, floor: Floor, obstacles: Obstacles, block_rotate: SoundAsset) -> None:
         """
         Rotate a shape clockwise if possible.
 
@@ -81,7 +81,7 @@ class MovePiece:
             rightWall (Wall): The right wall object representing the right boundary.
             floor (Floor): The floor object representing the bottom boundary.
             obstacles (Obstacles): The obstacles on the grid.
-            block_rotate (Sound): The sound effect to play when the shape rotates.
+            block_rotate (SoundAsset): The sound effect to play when the shape rotates.
 
         Rotates the given shape clockwise if the rotation does not result in collisions with the walls, floor,
         or other obstacles. If the rotation is successful, it plays the 'block_rotate' sound effect.
@@ -89,40 +89,27 @@ class MovePiece:
         Returns:
             None
         """
-        shape.rotateClkwise()
-        shape.rotate()
-        if shape.collides(leftWall) or shape.collides(rightWall) or shape.collides(floor) or shape.collides(obstacles):
-            shape.rotateCntclkwise()
-            shape.rotate()
-        else:
-            pygame.mixer.Channel(1).play(block_rotate)
+        if shape.fits(obstacles, shape.col, shape.row, (shape._rot + 1) % 4):
+            shape.rotateClkwise()
+            block_rotate.play(1)
 
     @staticmethod
     def drop_piece(shape: Shape, floor: Floor, obstacles: Obstacles, nextShapeNo: int) -> None:
         """
-        Drop a shape one step and handle collision.
+        Drop a shape one step (soft drop).
 
         Args:
             shape (Shape): The shape to drop.
             floor (Floor): The floor object representing the bottom boundary.
             obstacles (Obstacles): The obstacles on the grid.
             nextShapeNo (int): The next shape number for spawning a new shape.
-            MIDDLE (int): The middle column for spawning a new shape.
-            TOP (int): The top row for spawning a new shape.
 
-        Drops the given shape one step vertically. If the shape collides with the floor or other obstacles,
-        it adds the shape to the obstacles and removes any full rows. Then, it spawns a new shape at the
-        specified location.
+        Drops the given shape one step vertically if the row below is free. A shape that cannot
+        move down any further is left in place, and the next gravity step locks it, updates the
+        score and spawns the next shape.
 
         Returns:
             None
         """
-        shape.move_down()
-        if shape.collides(floor) or shape.collides(obstacles):
-            shape.move_up()
-            obstacles.append(shape)
-            fullRows = obstacles.findFullRows(TOP, FLOOR, COLUMNS)
-            obstacles.removeFullRows(fullRows)
-            shapeNo = nextShapeNo
-            nextShapeNo = randint(1, 7)
-            shape = Shape(MIDDLE, TOP, shapeNo)
+        if shape.fits(obstacles, shape.col, shape.row + 1, shape._rot):
+            shape.move_down()
@@ -1,62 +1,109 @@
+from typing import Iterable, List, Tuple
 from TetrisGrid.Grid import Grid
+from TetrisCore.Board import Board
+from TetrisGrid.Sprites import SPRITES
+from TetrisGrid.Viewport import VIEWPORT
+from Util.Constants import COLUMNS, ROWS
 
-class Obstacles(Grid):
+class Obstacles(Board, Grid):
     """ Represents the grid of obstacles formed by placed Tetriminos.
 
     Inherits from Grid to create a grid of obstacles formed by Tetriminos.
     This class provides methods for finding and removing full rows of obstacles.
 
+    The locked cells are stored in the bitboard of the pygame-free Board class
+    (one integer per row plus a color plane); this class adds the Grid interface
+    on top of it, so shapes can collide with it and it can be drawn like any grid.
+
     Args:
         col (int): The column where the anchor block is located.
         row (int): The row where the anchor block is located.
         blocksNo (int): The number of blocks in the grid.
+        columns (int): The width of the board in columns.
+        rows (int): The height of the board in rows.
 
     Attributes:
         col (int): The column where the anchor block is located.
         row (int): The row where the anchor block is located.
-        blocksNo (int): The number of blocks in the grid.
+        columns (int): The width of the board in columns.
+        rows (int): The height of the board in rows.
+        fullRowMask (int): Bitmask of a row with every column occupied.
+        version (int): Counter bumped whenever locked cells are added or removed.
+        blocks (list): The locked blocks as `(col, row, clr)` tuples (read from the bitboard).
 
     Methods:
         findFullRows(top, bottom, columns): Find full rows within a specified range.
         removeFullRows(fullRows): Remove full rows from the grid.
+        dropDistance(lowest, col, row): Rows a piece can fall before landing.
 
     """
-    def __init__(self, col=0, row=0, blocksNo=0):
-        # Initialize the Obstacles object using the parent Grid class
-        super().__init__(col, row, blocksNo)
-        
-    def findFullRows(self, top, bottom, columns):
+    def __init__(self, col=0, row=0, blocksNo=0, columns=COLUMNS, rows=ROWS):
+        # Initialize the bitboard, then the Obstacles object using the parent Grid class
+        Board.__init__(self, col, columns, rows)
+        Grid.__init__(self, col, row, blocksNo)
+
+    @property
+    def blocks(self) -> List[Tuple[int, int, int]]:
+        """
+        The locked blocks, rebuilt from the bitboard and the color plane.
         """
-        Find full rows within a specified range.
+        return list(self.cells())
+
+    @blocks.setter
+    def blocks(self, blocks: Iterable[Tuple[int, int, int]]) -> None:
+        self.clear()
+        for col, row, clr in blocks:
+            self.setCell(col, row, clr)
+
+    def sprites(self, shadow: bool = False) -> List[tuple]:
+        """
+        Get the block sprites of the locked cells with their positions, read straight from the bitboard.
+
+        Only the rows in the viewport are read, so the cost does not grow with the board.
 
-        Args:
-            top (int): The top row of the range to search for full rows.
-            bottom (int): The bottom row of the range to search for full rows.
-            columns (int): The number of columns in the grid.
+        Parameters:
+            shadow (bool): Whether to use the shadow sprite (default is False).
 
         Returns:
-            list: A list of row indices that are full within the specified range.
+            list: `(sprite, (x, y))` pairs, one per locked cell in the viewport.
+        """
+        cell, top = VIEWPORT.cell, VIEWPORT.top
+        cells = self.cells(top, VIEWPORT.bottom())
+        if shadow:
+            sprite = SPRITES.shadow(cell)
+            return [(sprite, (col * cell, (row - top) * cell)) for col, row, clr in cells]
+        return [(SPRITES.block(clr, cell), (col * cell, (row - top) * cell)) for col, row, clr in cells]
 
+    def overlaps(self, cells: Iterable[Tuple[int, int, int]]) -> bool:
         """
-        rows = [block['row'] for block in self.blocks]
-        return [row for row in range(top, bottom) if rows.count(row) == columns]
+        Check if any of the given blocks lies on an occupied cell.
+
+        Parameters:
+            cells (iterable): Blocks given as `(col, row, clr)` tuples.
 
-    def removeFullRows(self, fullRows):
+        Returns:
+            bool: True if at least one block hits a locked cell, False otherwise.
         """
-        Remove full rows from the grid.
+        return any(self.isOccupied(col, row) for col, row, clr in cells)
 
-        Args:
-            fullRows (list): A list of row indices to remove from the grid.
+    def collides(self, other: Grid) -> bool:
+        """
+        Check if another grid hits any locked cell.
+
+        Parameters:
+            other (Grid): Another grid to check for collisions.
 
         Returns:
-            None
+            bool: True if there is a collision, False otherwise.
+        """
+        return self.overlaps(other.cells())
 
+    def append(self, other: Grid) -> None:
         """
-        for row in fullRows:
-            # Remove blocks in the full row
-            self.blocks = [block for block in self.blocks if block['row'] != row]
+        Lock the blocks of another grid into the board.
 
-            # Move down blocks above the removed row
-            for block in self.blocks:
-                if block['row'] < row:
-                    block['row'] += 1
+        Parameters:
+            other (Grid): Another grid whose blocks will be locked into the board.
+        """
+        for col, row, clr in other.cells():
+            self.setCell(col, row, clr)
@@ -1,4 +1,5 @@
 from TetrisGrid.Grid import Grid
+from TetrisCore.Pieces import TROMINOS, PIECE_TABLE
 
 class Shape(Grid):
     """
@@ -19,6 +20,7 @@ class Shape(Grid):
         shadow (bool): Flag indicating whether the shape is a shadow.
         _colOffsets (list): List of column offsets for each block in the shape.
         _rowOffsets (list): List of row offsets for each block in the shape.
+        _blockCols, _blockRows (list): Column and row of each block, translated in place on every move.
 
     Methods:
         move_left: Move the shape one column to the left.
@@ -27,6 +29,8 @@ class Shape(Grid):
         move_up: Move the shape one row up.
         rotateCntclkwise: Rotate the shape counterclockwise (90 degrees).
         rotateClkwise: Rotate the shape clockwise (90 degrees).
+        fits: Check if the shape could be placed at a candidate position and rotation.
+        landing_row: Find the row where the shape would land if dropped.
 
     Note:
         This class inherits from Grid and represents a tetromino shape in the game.
@@ -38,86 +42,13 @@ class Shape(Grid):
         >>> shape = Shape(col=3, row=7, clr=1, rot=2)
     """
 
-    Trominos = {
-        # Red Z-Tetromino
-        1: {
-            # Initial orientation
-            0: ([-1, -1, 0, 0], [1, 0, 0, -1]),
-            # 90 degrees rotation
-            1: ([-1, 0, 0, 1], [-1, -1, 0, 0]),
-            # 180 degrees rotation
-            2: ([1, 1, 0, 0], [-1, 0, 0, 1]),
-            # 270 degrees rotation
-            3: ([1, 0, 0, -1], [1, 1, 0, 0])
-        },
-        # Green S-Tetromino
-        2: {
-            # Initial orientation
-            0: ([-1, -1, 0, 0], [-1, 0, 0, 1]),
-            # 90 degrees rotation
-            1: ([1, 0, 0, -1], [-1, -1, 0, 0]),
-            # 180 degrees rotation
-            2: ([1, 1, 0, 0], [1, 0, 0, -1]),
-            # 270 degrees rotation
-            3: ([-1, 0, 0, 1], [1, 1, 0, 0])
-        },
-        # Blue J-Tetromino
-        3: {
-            # Initial orientation
-            0: ([-1, -1, 0, 1], [-1, 0, 0, 0]),
-            # 90 degrees rotation
-            1: ([1, 1, 0, -1], [1, 0, 0, 0]),
-            # 180 degrees rotation
-            2: ([1, 0, 0, 0], [-1, -1, 0, 1]),
-            # 270 degrees rotation
-            3: ([-1, 0, 0, 0], [1, 1, 0, -1])
-        },
-        # Orange L-Tetromino
-        4: {
-            # Initial orientation
-            0: ([1, 1, 0, -1], [-1, 0, 0, 0]),
-            # 90 degrees rotation
-            1: ([-1, -1, 0, 1], [1, 0, 0, 0]),
-            # 180 degrees rotation
-            2: ([-1, 0, 0, 0], [-1, -1, 0, 1]),
-            # 270 degrees rotation
-            3: ([1, 0, 0, 0], [1, 1, 0, -1])
-        },
-        # Cyan I-Tetromino
-        5: {
-            # Initial orientation
-            0: ([0, 0, 0, 0], [-2, 1, 0, -1]),
-            # 90 degrees rotation
-            1: ([-2, 1, 0, -1], [0, 0, 0, 0]),
-            # 180 degrees rotation
-            2: ([-2, -1, 0, 1], [0, 0, 0, 0]),
-            # 270 degrees rotation
-            3: ([0, 0, 0, 0], [-2, -1, 0, 1])
-        },
-        # Purple T-Tetromino
-        6: {
-            # Initial orientation
-            0: ([0, -1, 0, 0], [1, 0, 0, -1]),
-            # 90 degrees rotation
-            1: ([-1, 0, 0, 1], [0, -1, 0, 0]),
-            # 180 degrees rotation
-            2: ([0, 1, 0, 0], [-1, 0, 0, 1]),
-            # 270 degrees rotation
-            3: ([1, 0, 0, -1], [0, 1, 0, 0])
-        },
-        # Yellow O-Tetromino
-        # Does not rotate, so all offsets are the same
-        7: {
-            # Initial orientation
-            0: ([-1, -1, 0, 0], [0, -1, 0, -1]),
-            # 90 degrees rotation
-            1: ([-1, -1, 0, 0], [0, -1, 0, -1]),
-            # 180 degrees rotation
-            2: ([-1, -1, 0, 0], [0, -1, 0, -1]),
-            # 270 degrees rotation
-            3: ([-1, -1, 0, 0], [0, -1, 0, -1])
-        }
-    }
+    __slots__ = ('clr', 'shadow', '_rot')
+
+    # Block offsets of every piece and rotation state
+    Trominos = TROMINOS
+
+    # Row bitmasks, bounding boxes and lowest blocks of every piece and rotation
+    Table = PIECE_TABLE
 
     def __init__(self, col=1, row=1, clr=1, rot=0, shadow=False):
         # Create a list of color indices for the blocks in the shape
@@ -142,10 +73,43 @@ class Shape(Grid):
         Returns:
             None
         """
-        if self.clr in Shape.Trominos:
-            self._colOffsets, self._rowOffsets = Shape.Trominos[self.clr][self._rot]
+        if self.clr in Shape.Table:
+            mask = Shape.Table[self.clr][self._rot]
+            self._colOffsets, self._rowOffsets = mask.colOffsets, mask.rowOffsets
             self.update()
 
+    def fits(self, obstacles, col, row, rot):
+        """
+        Check if the shape could be placed at a candidate position and rotation.
+
+        The test uses the precomputed row bitmasks of the piece, so the shape itself
+        is left untouched and no blocks are rebuilt.
+
+        Args:
+            obstacles (Obstacles): The board to test against, including its side and bottom bounds.
+            col (int): Candidate anchor column.
+            row (int): Candidate anchor row.
+            rot (int): Candidate rotation state (0 to 3).
+
+        Returns:
+            bool: True if every block would be inside the board on a free cell, False otherwise.
+        """
+        mask = Shape.Table[self.clr][rot]
+        return obstacles.fits(mask.rowMasks, col + mask.minCol, row + mask.minRow)
+
+    def landing_row(self, obstacles):
+        """
+        Find the row where the shape would land if dropped straight down.
+
+        Args:
+            obstacles (Obstacles): The board the shape falls onto.
+
+        Returns:
+            int: The anchor row of the shape once it has landed.
+        """
+        mask = Shape.Table[self.clr][self._rot]
+        return self.row + obstacles.dropDistance(mask.lowest, self.col, self.row)
+
     def move_left(self):
         """
         Move the shape one column to the left.
@@ -0,0 +1,203 @@
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+# Image assets stored in the cache by the build step
+CACHED_IMAGES = [
+    '../Image/Tetris.jpg',
+    '../Image/Grid.png',
+    '../Image/Intro.png',
+    '../Image/Outro.png',
+    '../View/Z.png',
+    '../View/S.png',
+    '../View/L.png',
+    '../View/J.png',
+    '../View/I.png',
+    '../View/T.png',
+    '../View/CUBE.png',
+]
+
+CACHE_FILE = '../Cache/assets.raw'
+
+class AssetCache:
+    """
+    A file of images already decoded and converted to the pixel format of the display.
+
+    The build step decodes every image once, converts it like `convert_alpha()` would and
+    writes the raw pixels to a single file, after an index giving the size, the pixel
+    layout, the offset and the source mtime, size and SHA-1 of every image. On startup
+    the file is memory-mapped and each image becomes a surface through
+    `pygame.image.frombuffer`, which reads the pixels in place instead of copying them.
+
+    An entry is used only if its source file is unchanged: the mtime and size are compared
+    first, and the source is hashed only when they differ (e.g. after a checkout).
+    Stale or missing entries return None, so the caller decodes the source instead.
+
+    Args:
+        path (str): The path of the cache file.
+
+    Methods:
+        build(files): Decode the images and write the cache file.
+        load(path): Get the cached surface of an image, None if it has no valid entry.
+        close: Unmap the cache file.
+
+    Example:
+        To build the cache, then load an image from it:
+
+        >>> ASSET_CACHE.build(CACHED_IMAGES)
+        >>> surface = ASSET_CACHE.load('../Image/Intro.png')
+    """
+
+    magic = b'PXTC'
+    version = 1
+    alignment = 64
+    header = struct.Struct('<4sII4s')
+    entry = struct.Struct('<H QQ 20s II QQ')
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._index: Optional[Dict[str, Tuple[int, int, bytes, int, int, int, int]]] = None
+        self._layout: Optional[str] = None
+
+    @staticmethod
+    def pixel_layout() -> Optional[str]:
+        """
+        Get the byte order of the pixels `convert_alpha()` produces on this display.
+
+        Returns:
+            str: A `frombuffer` format ('RGBA', 'BGRA' or 'ARGB'), None if there is no match.
+        """
+        masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        order = [''] * 4
+        for channel, mask in zip('RGBA', masks):
+            if mask not in (0xff, 0xff00, 0xff0000, 0xff000000):
+                return None
+            byte = (mask.bit_length() - 1) // 8
+            order[byte if sys.byteorder == 'little' else 3 - byte] = channel
+        layout = ''.join(order)
+        return layout if layout in ('RGBA', 'BGRA', 'ARGB') else None
+
+    @staticmethod
+    def _digest(path: str) -> bytes:
+        with open(path, 'rb') as source:
+            return hashlib.sha1(source.read()).digest()
+
+    def build(self, files: List[str]) -> int:
+        """
+        Decode the images and write them to the cache file (a display mode must be set).
+
+        Parameters:
+            files (list): The paths of the images.
+
+        Returns:
+            int: The size of the cache file in bytes.
+        """
+        layout = self.pixel_layout()
+        if layout is None:
+            raise ValueError('the display pixel format cannot be cached')
+        self.close()
+
+        entries = []
+        pixels = []
+        for file in files:
+            stat = os.stat(file)
+            surface = pygame.image.load(file).convert_alpha()
+            entries.append((os.path.normpath(file).encode(), stat.st_mtime_ns, stat.st_size,
+                            self._digest(file), surface.get_width(), surface.get_height()))
+            pixels.append(pygame.image.tobytes(surface, layout))
+
+        # The pixels start after the index, each image aligned for the blitters
+        offset = self.header.size + sum(self.entry.size + len(entry[0]) for entry in entries)
+        index = []
+        for entry, data in zip(entries, pixels):
+            offset += -offset % self.alignment
+            index.append(self.entry.pack(len(entry[0]), *entry[1:], offset, len(data)) + entry[0])
+            offset += len(data)
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as cache:
+            cache.write(self.header.pack(self.magic, self.version, len(entries), layout.encode()))
+            for record in index:
+                cache.write(record)
+            for record, data in zip(index, pixels):
+                position = self.entry.unpack_from(record)[-2]
+                cache.write(b'\0' * (position - cache.tell()))
+                cache.write(data)
+            size = cache.tell()
+        os.replace(temporary, self.path)
+        return size
+
+    def _open(self) -> None:
+        """
+        Map the cache file and read its index (only once). A missing or foreign file, or one
+        built for another pixel format, gives an empty index.
+        """
+        self._index = {}
+        try:
+            with open(self.path, 'rb') as cache:
+                self._map = mmap.mmap(cache.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, layout = self.header.unpack_from(self._map)
+            if magic != self.magic or version != self.version or layout.decode() != self.pixel_layout():
+                return
+            index = {}
+            position = self.header.size
+            for _ in range(count):
+                name_size, *entry = self.entry.unpack_from(self._map, position)
+                position += self.entry.size
+                index[bytes(self._map[position:position + name_size]).decode()] = tuple(entry)
+                position += name_size
+        except (OSError, ValueError, struct.error):
+            return
+        self._layout = layout.decode()
+        self._index = index
+
+    def load(self, path: str) -> Optional[pygame.Surface]:
+        """
+        Get the surface of an image from the cache, without decoding or copying its pixels.
+
+        The surface shares the memory of the mapped file, so it must not be drawn on.
+
+        Parameters:
+            path (str): The path of the source image.
+
+        Returns:
+            pygame.Surface: The cached image, None if the cache has no valid entry for it.
+        """
+        if self._index is None:
+            self._open()
+        entry = self._index.get(os.path.normpath(path))
+        if entry is None:
+            return None
+        mtime, size, digest, width, height, offset, length = entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != (mtime, size) and self._digest(path) != digest:
+            return None
+        return pygame.image.frombuffer(memoryview(self._map)[offset:offset + length], (width, height), self._layout)
+
+    def close(self) -> None:
+        """
+        Forget the index and unmap the cache file (surfaces loaded from it keep the mapping alive).
+        """
+        self._index = None
+        self._layout = None
+        self._map = None
+
+
+# Cache of the decoded game images, opened on the first image load
+ASSET_CACHE = AssetCache()
+
+if __name__ == "__main__":
+    # Build step: run from Src with `python -m Util.AssetCache`
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    size = ASSET_CACHE.build(CACHED_IMAGES)
+    print(f'{len(CACHED_IMAGES)} images, {size} bytes written to {ASSET_CACHE.path}')
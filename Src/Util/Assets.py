@@ -0,0 +1,145 @@
+import os
+import pygame
+from random import choice
+from typing import List, Optional
+from .Startup import STARTUP
+from .AssetCache import ASSET_CACHE
+
+class ImageAsset:
+    """
+    An image file loaded and converted to the display format on first use.
+
+    The image is read from the asset cache when it holds an up-to-date copy, and
+    decoded from its file otherwise.
+
+    Args:
+        path (str): The path of the image file.
+
+    Attributes:
+        path (str): The path of the image file.
+
+    Methods:
+        get: Get the image surface, loading it if needed.
+
+    Example:
+        To draw the intro image, loading it on the first call:
+
+        >>> intro_screen = ImageAsset('../Image/Intro.png')
+        >>> screen.blit(intro_screen.get(), (0, 0))
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._surface: Optional[pygame.Surface] = None
+
+    def get(self) -> pygame.Surface:
+        """
+        Get the image surface, loading it on the first call (a display mode must be set).
+
+        Returns:
+            pygame.Surface: The image, converted with per-pixel alpha.
+        """
+        if self._surface is None:
+            with STARTUP.phase('image ' + os.path.basename(self.path)):
+                self._surface = ASSET_CACHE.load(self.path)
+                if self._surface is None:
+                    self._surface = pygame.image.load(self.path).convert_alpha()
+        return self._surface
+
+
+class SoundAsset:
+    """
+    A short sound effect decoded on first use.
+
+    Args:
+        path (str): The path of the sound file.
+
+    Attributes:
+        path (str): The path of the sound file.
+
+    Methods:
+        get: Get the decoded sound, loading it if needed.
+        play(channel): Play the sound on a mixer channel.
+
+    Example:
+        To play the rotation sound on its channel:
+
+        >>> block_rotate = SoundAsset('../Sound/Block-Rotate.ogg')
+        >>> block_rotate.play(1)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sound: Optional[pygame.mixer.Sound] = None
+
+    def get(self) -> pygame.mixer.Sound:
+        """
+        Get the decoded sound, loading it on the first call.
+
+        Returns:
+            pygame.mixer.Sound: The sound effect.
+        """
+        if self._sound is None:
+            with STARTUP.phase('sound ' + os.path.basename(self.path)):
+                self._sound = pygame.mixer.Sound(self.path)
+        return self._sound
+
+    def play(self, channel: int) -> None:
+        """
+        Play the sound on a mixer channel, interrupting what the channel was playing.
+        Nothing is played when there is no audio device.
+
+        Parameters:
+            channel (int): The index of the mixer channel.
+        """
+        if pygame.mixer.get_init():
+            pygame.mixer.Channel(channel).play(self.get())
+
+
+class FontAsset:
+    """
+    A system font looked up on first use (the lookup scans the installed fonts).
+
+    Args:
+        name (str): The name of the system font.
+        size (int): The font size.
+
+    Methods:
+        get: Get the font, looking it up if needed.
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self._font: Optional[pygame.font.Font] = None
+
+    def get(self) -> pygame.font.Font:
+        """
+        Get the font, looking it up on the first call.
+
+        Returns:
+            pygame.font.Font: The font (pygame's default font if it is not installed).
+        """
+        if self._font is None:
+            with STARTUP.phase('font ' + self.name):
+                self._font = pygame.font.SysFont(self.name, self.size)
+        return self._font
+
+
+def play_music(files: List[str]) -> None:
+    """
+    Stream a random background track in a loop.
+
+    The track is played through `pygame.mixer.music`, which decodes it while it plays
+    instead of loading the whole file into memory first. Missing files are skipped, and
+    nothing is played when there is no audio device.
+
+    Parameters:
+        files (list): The paths of the candidate tracks.
+    """
+    tracks = [file for file in files if os.path.exists(file)]
+    if not tracks or not pygame.mixer.get_init():
+        return
+    with STARTUP.phase('music'):
+        pygame.mixer.music.load(choice(tracks))
+        pygame.mixer.music.play(-1)
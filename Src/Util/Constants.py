@@ -1,35 +1,39 @@
 import pygame
 import platform
-from random import choice
+from .Startup import STARTUP
+from .Assets import ImageAsset, SoundAsset, FontAsset
 
 # Get the current operating system
 system_os = platform.system()
 
 # Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-pygame.mixer.set_num_channels(6)
+with STARTUP.phase('pygame.init'):
+    pygame.init()
+    # Without an audio device the mixer stays uninitialized and the game runs silently
+    if pygame.mixer.get_init():
+        pygame.mixer.set_num_channels(6)
 
-# Constants for the game grid
-TOP = 1
-ROWS = 24
-COLUMNS = 14
-FLOOR = TOP + ROWS
+# Board geometry, levels and scoring rules (pygame-free, shared with TetrisCore)
+from TetrisCore.Rules import TOP, ROWS, COLUMNS, FLOOR, LEFT, RIGHT, MIDDLE, SCORE, TICK_MS, GRAVITY_MS
 
 # Screen dimensions
 WIDTH = 575
 HEIGHT = 600
 GRIDSIZE = HEIGHT // ROWS
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
 
-# Initial game level, score, and a list of levels
-SCORE = 0
-LEVELS = [300, 250, 200, 175, 150, 125, 112, 100, 90]
+# Frame rate cap of the game window (0 renders as fast as possible), and the longest
+# frame the simulation catches up on before dropping time (avoids a spiral of death)
+FPS = 60
+MAX_FRAME_MS = 250
 
-# Constants for grid positions
-LEFT = 0
-RIGHT = LEFT + COLUMNS
-MIDDLE = (LEFT + COLUMNS) // 2
+# Repaint only the changed regions of the game screen instead of the whole window
+DIRTY_RENDERING = True
+
+# The window icon is set before the window opens
+with STARTUP.phase('image Icon.png'):
+    pygame.display.set_icon(pygame.image.load('../Image/Icon.png'))
+with STARTUP.phase('set_mode'):
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
 
 # Define colors
 BLACK = (0, 0, 0)
@@ -50,58 +54,37 @@ COLOURS = [BLACK, RED, GREEN, BLUE, ORANGE, CYAN, MAGENTA, YELLOW]
 # Names corresponding to Tetris pieces
 figures = [None, 'Z', 'S', 'J', 'L', 'I', 'T', 'O', None]
 
-# Initialize Pygame fonts
-pygame.font.init()
-
+# Assets are loaded on first use, so the intro screen only waits for its own image
 # Set the font for the game depending on the operating system
 if system_os == "Windows":
-    font = pygame.font.SysFont('Algerian', 28)
+    font = FontAsset('Algerian', 28)
 else:
-    font = pygame.font.SysFont('Algerian', 42)
-
-# Function to load images and sounds
-def load_images(files):
-    return [pygame.image.load(file).convert_alpha() for file in files]
+    font = FontAsset('Algerian', 42)
 
-def load_sounds(files):
-    return [pygame.mixer.Sound(file) for file in files]
-
-# Background music
+# Background music, streamed by play_music
 music_files = ['../Music/Rondo_Alla_Turka.ogg',
                 '../Music/Lacrimosa.ogg', 
                 '../Music/Allegro.ogg']
-music = choice(load_sounds(music_files))
-pygame.mixer.Channel(0).play(music, -1)
-
-# Load game images
-tetris_img, grid_img, \
-intro_screen, outro_screen, \
-icon = load_images([
-    '../Image/Tetris.jpg',
-    '../Image/Grid.png',
-    '../Image/Intro.png',
-    '../Image/Outro.png',
-    '../Image/Icon.png'
-])
-pygame.display.set_icon(icon)
-
-# Load game sounds
-block_rotate, force_hit, \
-line_remove, slow_hit, \
-tetris_remove = load_sounds([
-    '../Sound/block-rotate.ogg',
-    '../Sound/Force-Hit-Line.ogg',
-    '../Sound/Remove-Line.ogg',
-    '../Sound/Slow-Hit-Line.ogg',
-    '../Sound/Amadeus-Laughing.ogg'
-])
-
-# Load block images for Tetris pieces
-block_img = load_images([
+
+# Game images
+tetris_img = ImageAsset('../Image/Tetris.jpg')
+grid_img = ImageAsset('../Image/Grid.png')
+intro_screen = ImageAsset('../Image/Intro.png')
+outro_screen = ImageAsset('../Image/Outro.png')
+
+# Game sounds
+block_rotate = SoundAsset('../Sound/Block-Rotate.ogg')
+force_hit = SoundAsset('../Sound/Force-Hit-Line.ogg')
+line_remove = SoundAsset('../Sound/Remove-Line.ogg')
+slow_hit = SoundAsset('../Sound/Slow-Hit-Line.ogg')
+tetris_remove = SoundAsset('../Sound/Amadeus-Laughing.ogg')
+
+# Block images for Tetris pieces
+block_img = [ImageAsset(file) for file in [
     '../View/Z.png',
     '../View/S.png',
     '../View/L.png', 
     '../View/J.png',
     '../View/I.png',
     '../View/T.png',
-    '../View/CUBE.png'])
+    '../View/CUBE.png']]
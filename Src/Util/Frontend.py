@@ -0,0 +1,146 @@
+import pygame
+from typing import Optional
+from .Constants import *
+
+from TetrisCore import Engine as engine_events
+from TetrisCore.Engine import Engine
+from TetrisCore.Generator import PieceGenerator
+from TetrisPiece.Shape import Shape
+from TetrisPiece.Ghost import Ghost
+from TetrisPiece.Obstacles import Obstacles
+
+class EngineFrontend:
+    """
+    Adapts a headless Engine to the pygame game loop.
+
+    The frontend exposes the same attributes as GameState (`shape`, `nextShapeNo`, `score`,
+    `level`, `lines`, `pieces`, `inPlay`), translates key presses into engine actions and plays the sound
+    effects matching the events the engine reports. The engine plays on an Obstacles
+    board, so the locked cells can be drawn by Grid.redraw_screen without copying.
+
+    Args:
+        seed (int): Seed of the engine's piece generator (optional).
+        generator (PieceGenerator): The piece generator to play with (optional, overrides `seed`).
+        columns (int): The width of the board.
+        rows (int): The height of the board.
+
+    Attributes:
+        engine (Engine): The engine running the game.
+        obstacles (Obstacles): The board the engine plays on.
+        ghost (Ghost): The cached shadow of the falling shape.
+
+    Methods:
+        process_key(key): Apply the action bound to a key.
+        tick: Advance the engine by one simulation step.
+
+    Example:
+        To drive a game from the pygame event loop:
+
+        >>> frontend = EngineFrontend(seed=42)
+        >>> frontend.process_key(pygame.K_LEFT)
+        >>> frontend.tick()
+    """
+
+    KEY_ACTIONS = {
+        pygame.K_UP: engine_events.ROTATE,
+        pygame.K_LEFT: engine_events.MOVE_LEFT,
+        pygame.K_RIGHT: engine_events.MOVE_RIGHT,
+        pygame.K_DOWN: engine_events.SOFT_DROP,
+        pygame.K_SPACE: engine_events.HARD_DROP,
+    }
+
+    def __init__(self, seed: Optional[int] = None, generator: Optional[PieceGenerator] = None,
+                 columns: int = COLUMNS, rows: int = ROWS):
+        self.obstacles = Obstacles(LEFT, TOP + rows, 0, columns, rows)
+        self.engine = Engine(seed, board=self.obstacles, generator=generator)
+        self.ghost = Ghost()
+        self._shape = None
+        self._shapes = {}
+
+    @property
+    def shape(self) -> Shape:
+        """
+        The falling piece as a Shape, moved only when the engine's piece has moved.
+
+        One Shape per piece is kept and reused whenever that piece falls again.
+        """
+        engine, shape = self.engine, self._shape
+        if shape is None or shape.clr != engine.clr:
+            shape = self._shapes.get(engine.clr)
+            if shape is None:
+                shape = self._shapes[engine.clr] = Shape(engine.col, engine.row, engine.clr, engine.rot)
+            self._shape = shape
+        if shape.col != engine.col or shape.row != engine.row or shape._rot != engine.rot:
+            shape.col, shape.row, shape._rot = engine.col, engine.row, engine.rot
+            shape.rotate()
+        return self._shape
+
+    @property
+    def nextShapeNo(self) -> int:
+        return self.engine.nextShapeNo
+
+    @property
+    def score(self) -> int:
+        return self.engine.score
+
+    @property
+    def level(self) -> int:
+        return self.engine.level
+
+    @property
+    def lines(self) -> int:
+        return self.engine.lines
+
+    @property
+    def pieces(self) -> int:
+        return self.engine.pieces
+
+    @property
+    def inPlay(self) -> bool:
+        return self.engine.inPlay
+
+    @inPlay.setter
+    def inPlay(self, value: bool) -> None:
+        self.engine.inPlay = value
+
+    def process_key(self, key: int) -> int:
+        """
+        Apply the engine action bound to a key, if any.
+
+        Args:
+            key (int): The pygame key code.
+
+        Returns:
+            int: The event flags raised by the action (0 if the key is unbound or the move was rejected).
+        """
+        action = self.KEY_ACTIONS.get(key)
+        if action is None:
+            return 0
+        events = self.engine.apply(action)
+        self.play_sounds(events)
+        return events
+
+    def tick(self) -> None:
+        """
+        Advance the engine by one simulation step.
+        """
+        self.play_sounds(self.engine.tick())
+
+    @staticmethod
+    def play_sounds(events: int) -> None:
+        """
+        Play the sound effects matching the engine events, on the same channels as GameState.
+
+        Args:
+            events (int): Event flags returned by Engine.apply or Engine.tick.
+        """
+        if events & engine_events.ROTATED:
+            block_rotate.play(1)
+        if events & engine_events.DROPPED:
+            force_hit.play(2)
+        elif events & engine_events.LOCKED:
+            slow_hit.play(5)
+        if events & engine_events.TETRIS:
+            tetris_remove.play(4)
+        elif events & engine_events.LINES:
+            line_remove.play(3)
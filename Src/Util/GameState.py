@@ -1,29 +1,57 @@
-from typing import List 
-from random import randint
+from typing import List, Optional
 from .Constants import *
+from TetrisCore.Rules import TETRIS_ROWS, level_for_score, score_for_rows, spawn_column
+from TetrisCore.Generator import PieceGenerator
 
 from TetrisPiece.Shape import Shape
 from TetrisPiece.MovePiece import MovePiece
 
 class GameState:
-    def __init__(self):
+    def __init__(self, generator: Optional[PieceGenerator] = None, columns: int = COLUMNS):
         """
         Initialize the game state.
 
+        Args:
+            generator (PieceGenerator): The source of the piece sequence (optional,
+                an unseeded uniform generator by default).
+            columns (int): The width of the board, which sets the spawn column.
+
         Attributes:
+            generator (PieceGenerator): The source of the piece sequence.
             shape (Shape): Current falling shape.
-            nextShapeNo (int): Next shape's number.
+            spawnCol (int): The column new shapes appear at.
+            nextShapeNo (int): Next shape's number (read from the generator).
             score (int): Player's score.
             prevTetris (bool): Flag to track previous Tetris completion.
             level (int): Current game level.
             inPlay (bool): Flag to check if the game is active.
+            gravityTimer (int): Milliseconds accumulated towards the next gravity step.
+            lines (int): Total number of cleared rows.
+            pieces (int): Total number of locked pieces.
         """
+        self.generator = generator if generator is not None else PieceGenerator()
         self.shape = None
-        self.nextShapeNo = 1
+        self.spawnCol = spawn_column(columns)
         self.score = 0
         self.prevTetris = False
         self.level = 0
         self.inPlay = True
+        self.gravityTimer = 0
+        self.lines = 0
+        self.pieces = 0
+
+    @property
+    def nextShapeNo(self) -> int:
+        return self.generator.peek()[0]
+
+    def next_shape(self) -> Shape:
+        """
+        Take the next piece from the generator as a new shape at the spawn position.
+
+        Returns:
+            Shape: The new falling shape.
+        """
+        return Shape(self.spawnCol, TOP, self.generator.next())
 
     def update_level(self) -> int:
         """
@@ -32,35 +60,50 @@ class GameState:
         Returns:
             int: The updated game level.
         """
-        thresholds = [500, 1000, 1500, 2000, 2250, 2500, 2750, 3000, 3250]
-        return next((i for i, threshold in enumerate(thresholds) if self.score < threshold), 9)
+        return level_for_score(self.score)
+
+    def advance_gravity(self, elapsed_ms: int) -> bool:
+        """
+        Advance the gravity timer by the length of a simulation step.
+
+        Args:
+            elapsed_ms (int): Simulated time elapsed since the last call, in milliseconds.
+
+        Returns:
+            bool: True when the falling shape should move down one row.
+        """
+        self.gravityTimer += elapsed_ms
+        if self.gravityTimer < GRAVITY_MS[self.level]:
+            return False
+        self.gravityTimer -= GRAVITY_MS[self.level]
+        return True
 
-    def update_score_and_sound_effects(self, obstacles: List[Shape], line_remove: pygame.mixer.Sound, tetris_remove: pygame.mixer.Sound) -> None:
+    def update_score_and_sound_effects(self, obstacles: List[Shape], line_remove: SoundAsset, tetris_remove: SoundAsset) -> None:
         """
         Update the player's score and play sound effects based on completed rows.
 
         Args:
             obstacles (List[Shape]): The list of obstacles (shapes) on the game board.
-            line_remove (pygame.mixer.Sound): The sound effect for removing a single line.
-            tetris_remove (pygame.mixer.Sound): The sound effect for removing four or more lines (Tetris).
+            line_remove (SoundAsset): The sound effect for removing a single line.
+            tetris_remove (SoundAsset): The sound effect for removing four or more lines (Tetris).
 
         Returns:
             None
         """
-        fullRows = obstacles.findFullRows(TOP, FLOOR, COLUMNS)
-        if 3 > len(fullRows) > 0:
-            # Score for completing rows (less than Tetris)
-            self.score += 100 * len(fullRows)
-            pygame.mixer.Channel(3).play(line_remove)
-        elif len(fullRows) >= 3:
-            # Score for Tetris (four or more completed rows)
-            self.score += 500 + (100 * (len(fullRows) - 3))
-            pygame.mixer.Channel(4).play(tetris_remove)
+        fullRows = obstacles.findFullRows(TOP, TOP + obstacles.rows, obstacles.columns)
+        self.score += score_for_rows(len(fullRows))
+        self.lines += len(fullRows)
+        if TETRIS_ROWS > len(fullRows) > 0:
+            # Completed rows (less than Tetris)
+            line_remove.play(3)
+        elif len(fullRows) >= TETRIS_ROWS:
+            # Tetris (three or more completed rows)
+            tetris_remove.play(4)
             self.prevTetris = True
 
         obstacles.removeFullRows(fullRows)
 
-    def drop_instant_piece(self, obstacles: List[Shape], floor: int, line_remove: pygame.mixer.Sound, tetris_remove: pygame.mixer.Sound) -> None:
+    def drop_instant_piece(self, obstacles: List[Shape], floor: int, line_remove: SoundAsset, tetris_remove: SoundAsset) -> None:
         """
         Drop the current shape instantly to the bottom, prepare for the next shape,
         and handle completed rows to update the score.
@@ -68,8 +111,8 @@ class GameState:
         Args:
             obstacles (List[Shape]): The list of obstacles (shapes) on the game board.
             floor (int): The floor position of the game board.
-            line_remove (pygame.mixer.Sound): The sound effect for removing a single line.
-            tetris_remove (pygame.mixer.Sound): The sound effect for removing four or more lines (Tetris).
+            line_remove (SoundAsset): The sound effect for removing a single line.
+            tetris_remove (SoundAsset): The sound effect for removing four or more lines (Tetris).
 
         Returns:
             None
@@ -77,11 +120,10 @@ class GameState:
         # Drop the current shape instantly to the bottom
         MovePiece.drop(self.shape, floor, obstacles, force_hit)
         obstacles.append(self.shape)
+        self.pieces += 1
 
         # Prepare for the next shape
-        shapeNo = self.nextShapeNo
-        self.nextShapeNo = randint(1, 7)
-        self.shape = Shape(MIDDLE, TOP, shapeNo)
+        self.shape = self.next_shape()
 
         # Check and handle completed rows and update the score
         self.update_score_and_sound_effects(obstacles, line_remove, tetris_remove)
@@ -0,0 +1,158 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from TetrisCore.Stats import percentile
+
+# Delayed auto-shift (hold time before a key repeats) and auto-repeat rate, in milliseconds
+DAS_MS = 170
+ARR_MS = 50
+
+# Keys repeated while held: moving sideways and soft dropping
+REPEAT_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN)
+
+class InputHandler:
+    """
+    Collects the input of a frame: the queued events and the repeats of the held keys.
+
+    Events are drained at the start of the frame, before the simulation steps. pygame
+    events carry no time, so a queued event is stamped with the monotonic clock time of
+    the previous poll, the earliest it can have been queued. A key of `repeat_keys`
+    held for `das_ms` milliseconds is pressed again every `arr_ms` milliseconds; the
+    repeats are scheduled on the clock, not on frames, so a slow frame presses a key
+    still held as many times as were due and the repeat speed does not depend on the
+    frame rate. The queue is drained before the repeats are
+    generated, and a key released in the same batch does not repeat: a release during
+    a slow frame never turns into moves the player did not ask for.
+
+    The latency of every key press is recorded twice: until the game state changed
+    (`applied`) and until the frame showing the change was presented (`presented`),
+    counted from the stamp. For a repeat it is the exact time the repeat was due; for a
+    queued press it is an upper bound, which includes the wait of up to one frame in
+    the queue.
+
+    Args:
+        das_ms (int): Delayed auto-shift, in milliseconds.
+        arr_ms (int): Auto-repeat rate, in milliseconds between two repeats (at least 1).
+        repeat_keys (iterable): The keys that repeat while held.
+        window (int): Number of key presses the latency percentiles are computed over.
+
+    Methods:
+        poll(): Get the events of the frame with their time stamps.
+        release_all(): Forget the held keys.
+        applied(stamp): Record that a key press changed the game state.
+        presented(): Record that the frame showing the last key presses was presented.
+        latencies(): Latency percentiles.
+        report(): Format the latency percentiles as a table.
+
+    Example:
+        To handle the input at the start of every frame:
+
+        >>> inputs = InputHandler(das_ms=170, arr_ms=50)
+        >>> for event, stamp in inputs.poll():
+        ...     if handle_event(event):
+        ...         inputs.applied(stamp)
+    """
+
+    def __init__(self, das_ms: int = DAS_MS, arr_ms: int = ARR_MS, repeat_keys: Iterable[int] = REPEAT_KEYS,
+                 window: int = 600):
+        self.das = das_ms * 1000000
+        self.arr = max(arr_ms, 1) * 1000000
+        self.repeatKeys = frozenset(repeat_keys)
+        # Held repeating keys and the clock time of their next repeat, in nanoseconds
+        self._held: Dict[int, int] = {}
+        self._unpresented: List[int] = []
+        # Clock time of the last poll, in nanoseconds (None before the first one)
+        self._polled: Optional[int] = None
+        self.stateLatency: Deque[int] = deque(maxlen=window)
+        self.presentLatency: Deque[int] = deque(maxlen=window)
+
+    def poll(self) -> List[Tuple[pygame.event.Event, int]]:
+        """
+        Drain the event queue, then get the repeats due since the last call of the keys
+        that were not released in the meantime.
+
+        Returns:
+            list: `(event, stamp)` pairs in the order to handle them (the repeats, then the
+            queued events), the stamp being the `time.perf_counter_ns()` time of the
+            previous poll for a queued event (of this poll for the first one) and the time
+            the repeat was due for a repeat.
+        """
+        now = time.perf_counter_ns()
+        since = now if self._polled is None else self._polled
+        self._polled = now
+        queued = pygame.event.get()
+        released = {event.key for event in queued if event.type == pygame.KEYUP}
+        events = []
+        for key, due in self._held.items():
+            if key in released:
+                continue
+            while due <= now:
+                events.append((pygame.event.Event(pygame.KEYDOWN, key=key, repeat=True), due))
+                due += self.arr
+            self._held[key] = due
+        if len(self._held) > 1:
+            events.sort(key=lambda pair: pair[1])
+        for event in queued:
+            if event.type == pygame.KEYDOWN and event.key in self.repeatKeys:
+                self._held[event.key] = now + self.das
+            elif event.type == pygame.KEYUP:
+                self._held.pop(event.key, None)
+            events.append((event, since))
+        return events
+
+    def release_all(self) -> None:
+        """
+        Forget the held keys, e.g. when another screen consumed their release.
+        """
+        self._held.clear()
+        # The next events were queued after the other screen, not since the last poll
+        self._polled = None
+
+    def applied(self, stamp: int) -> None:
+        """
+        Record that a key press stamped `stamp` by `poll` changed the game state.
+        """
+        self.stateLatency.append(time.perf_counter_ns() - stamp)
+        self._unpresented.append(stamp)
+
+    def presented(self) -> None:
+        """
+        Record that the frame showing the key presses applied so far was presented.
+        """
+        if self._unpresented:
+            now = time.perf_counter_ns()
+            self.presentLatency.extend(now - stamp for stamp in self._unpresented)
+            self._unpresented.clear()
+
+    def latencies(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get percentiles of the key press latencies over the last `window` presses.
+
+        Returns:
+            dict: For 'input to state' and 'input to present', the `p50`, `p90`, `p99`
+            and `max` latencies in milliseconds and the `count` of presses.
+        """
+        summaries = {}
+        for name, values in (('input to state', self.stateLatency), ('input to present', self.presentLatency)):
+            values = sorted(values)
+            summary = {'p{}'.format(q): percentile(values, q) / 1e6 for q in (50, 90, 99)}
+            summary['max'] = values[-1] / 1e6 if values else 0
+            summary['count'] = len(values)
+            summaries[name] = summary
+        return summaries
+
+    def report(self) -> str:
+        """
+        Format the latency percentiles as a table.
+
+        Returns:
+            str: One line per latency, in milliseconds.
+        """
+        lines = ['{:<18}{:>8}{:>10}{:>10}{:>10}{:>10}'.format('latency', 'presses', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms')]
+        for name, summary in self.latencies().items():
+            lines.append('{:<18}{:>8}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}'.format(
+                name, summary['count'], summary['p50'], summary['p90'], summary['p99'], summary['max']))
+        return '\n'.join(lines)
@@ -0,0 +1,236 @@
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+from TetrisCore.Stats import percentile
+from .Assets import FontAsset
+
+# Upper bounds of the frame time histogram bins, in milliseconds (the last bin is open)
+HISTOGRAM_MS = (4, 8, 12, 16.7, 20, 33.3, 50, 100)
+# Frames up to this duration keep 60 FPS, their bins are drawn in green
+BUDGET_MS = 16.7
+
+class FrameProfiler:
+    """
+    Times the phases of every frame of the game loop.
+
+    The loop calls `begin_frame` at the top of every frame and `mark(name)` at the end
+    of every phase: the time since the previous mark is charged to that phase, so a
+    phase costs one `time.perf_counter_ns()` call and two appends. The durations of the
+    last `window` frames are kept per phase for rolling percentiles, every frame time
+    goes to a histogram, and the most recent phases are kept as trace events that
+    `write_trace` saves in the Chrome trace format (chrome://tracing, ui.perfetto.dev).
+
+    The overlay shows the percentiles and the histogram in a corner of the screen. It
+    is drawn just before the frame is presented and the covered area is restored right
+    after, so the renderers never see it.
+
+    Args:
+        window (int): Number of frames the percentiles are computed over.
+        max_events (int): Number of trace events kept (the oldest are dropped).
+        refresh_ms (int): How often the overlay text is rendered again, in milliseconds.
+
+    Attributes:
+        overlay (bool): Show the overlay.
+        frames (int): Number of frames timed.
+        histogram (list): Frame counts per HISTOGRAM_MS bin, plus one for longer frames.
+
+    Methods:
+        begin_frame(): Start timing a new frame.
+        mark(name): End the current phase.
+        percentiles(name, qs): Rolling percentiles of a phase.
+        report(): Format the percentiles and the histogram as a table.
+        draw_overlay(surface) / restore_overlay(surface): Show the overlay on the next presented frame.
+        write_trace(path): Save the trace events as a Chrome trace file.
+
+    Example:
+        To time the phases of a game loop:
+
+        >>> profiler = FrameProfiler()
+        >>> while running:
+        ...     profiler.begin_frame()
+        ...     update(); profiler.mark('update')
+        ...     draw(); profiler.mark('draw')
+    """
+
+    FRAME = 'frame'
+
+    def __init__(self, window: int = 600, max_events: int = 200000, refresh_ms: int = 250):
+        self.window = window
+        self.refresh_ms = refresh_ms
+        self.overlay = False
+        self.frames = 0
+        self.histogram = [0] * (len(HISTOGRAM_MS) + 1)
+        self._durations: Dict[str, Deque[int]] = {self.FRAME: deque(maxlen=window)}
+        self._events: Deque[Tuple[str, int, int]] = deque(maxlen=max_events)
+        self._origin = time.perf_counter_ns()
+        self._frameStart: Optional[int] = None
+        self._mark = self._origin
+        self._font = FontAsset('Consolas', 16)
+        self._surface: Optional[pygame.Surface] = None
+        self._rendered = None
+        self._saved: Optional[Tuple[pygame.Surface, pygame.Rect]] = None
+        self._shown: Optional[pygame.Rect] = None
+
+    def begin_frame(self) -> None:
+        """
+        Start timing a new frame, which ends the previous one.
+        """
+        now = time.perf_counter_ns()
+        if self._frameStart is not None:
+            duration = now - self._frameStart
+            self._durations[self.FRAME].append(duration)
+            self._events.append((self.FRAME, self._frameStart, duration))
+            milliseconds = duration / 1e6
+            bin_index = 0
+            while bin_index < len(HISTOGRAM_MS) and milliseconds > HISTOGRAM_MS[bin_index]:
+                bin_index += 1
+            self.histogram[bin_index] += 1
+            self.frames += 1
+        self._frameStart = self._mark = now
+
+    def mark(self, name: str) -> None:
+        """
+        End the current phase: the time since the previous mark (or the start of the frame) is charged to it.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        now = time.perf_counter_ns()
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations[name] = deque(maxlen=self.window)
+        durations.append(now - self._mark)
+        self._events.append((name, self._mark, now - self._mark))
+        self._mark = now
+
+    def phases(self) -> List[str]:
+        """
+        Get the names of the phases, in the order they were first marked, then the whole frame.
+        """
+        return [name for name in self._durations if name != self.FRAME] + [self.FRAME]
+
+    def percentiles(self, name: str, qs: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+        """
+        Get rolling percentiles of a phase over the last `window` frames.
+
+        Args:
+            name (str): The name of the phase ('frame' for whole frames).
+            qs (Sequence): The percentiles, from 0 to 100.
+
+        Returns:
+            dict: `pXX` entries and `max`, in milliseconds.
+        """
+        values = sorted(self._durations.get(name, ()))
+        summary = {'p{:g}'.format(q): percentile(values, q) / 1e6 for q in qs}
+        summary['max'] = values[-1] / 1e6 if values else 0
+        return summary
+
+    def report(self) -> str:
+        """
+        Format the rolling percentiles of every phase and the frame time histogram.
+
+        Returns:
+            str: One line per phase (milliseconds), then one line per histogram bin.
+        """
+        lines = ['{:<12}{:>10}{:>10}{:>10}{:>10}'.format('phase', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms')]
+        for name in self.phases():
+            summary = self.percentiles(name)
+            lines.append('{:<12}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}'.format(
+                name, summary['p50'], summary['p90'], summary['p99'], summary['max']))
+        lines.append('frame time histogram ({} frames):'.format(self.frames))
+        for label, count in zip(self._bin_labels(), self.histogram):
+            share = count / self.frames if self.frames else 0
+            lines.append('{:>12}{:>8}  {}'.format(label, count, '#' * round(share * 40)))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _bin_labels() -> List[str]:
+        """
+        Get the labels of the histogram bins.
+        """
+        return ['<= {:g} ms'.format(bound) for bound in HISTOGRAM_MS] + ['> {:g} ms'.format(HISTOGRAM_MS[-1])]
+
+    def _render(self) -> pygame.Surface:
+        """
+        Render the overlay: the percentiles of every phase above a bar chart of the histogram.
+        """
+        font = self._font.get()
+        lines = ['{:<8}{:>7}{:>7}{:>7}'.format('ms', 'p50', 'p99', 'max')]
+        for name in self.phases():
+            summary = self.percentiles(name, (50, 99))
+            lines.append('{:<8}{:>7.2f}{:>7.2f}{:>7.2f}'.format(name, summary['p50'], summary['p99'], summary['max']))
+        texts = [font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = font.get_linesize()
+        bars = 40
+        width = max(text.get_width() for text in texts) + 12
+        surface = pygame.Surface((width, line_height * len(texts) + bars + 16))
+        surface.fill((20, 20, 20))
+        for index, text in enumerate(texts):
+            surface.blit(text, (6, 4 + index * line_height))
+        # Histogram: one bar per bin, scaled to the fullest bin
+        top = 8 + line_height * len(texts)
+        bar_width = (width - 12) // len(self.histogram)
+        fullest = max(self.histogram) or 1
+        for index, count in enumerate(self.histogram):
+            height = round(bars * count / fullest)
+            colour = (90, 200, 90) if index < len(HISTOGRAM_MS) and HISTOGRAM_MS[index] <= BUDGET_MS else (220, 90, 60)
+            pygame.draw.rect(surface, colour, (6 + index * bar_width, top + bars - height, bar_width - 2, height))
+        return surface
+
+    def draw_overlay(self, surface: pygame.Surface) -> Optional[pygame.Rect]:
+        """
+        Draw the overlay on a surface, saving the area it covers for restore_overlay.
+
+        The overlay text is rendered again at most every `refresh_ms` milliseconds.
+
+        Parameters:
+            surface (pygame.Surface): The screen.
+
+        Returns:
+            pygame.Rect: The area to present: the overlay, or the area it covered on the frame
+            after it was hidden. None otherwise.
+        """
+        if not self.overlay:
+            # Once hidden, the restored area is presented one last time to erase the overlay
+            rect, self._shown = self._shown, None
+            return rect
+        now = time.perf_counter_ns() // 1000000
+        if self._surface is None or now - self._rendered >= self.refresh_ms:
+            self._surface = self._render()
+            self._rendered = now
+        rect = self._surface.get_rect().clip(surface.get_rect())
+        self._saved = (surface.subsurface(rect).copy(), rect)
+        surface.blit(self._surface, rect)
+        self._shown = rect
+        return rect
+
+    def restore_overlay(self, surface: pygame.Surface) -> None:
+        """
+        Put back the area covered by the overlay once the frame has been presented.
+
+        Parameters:
+            surface (pygame.Surface): The screen.
+        """
+        if self._saved is not None:
+            saved, rect = self._saved
+            surface.blit(saved, rect)
+            self._saved = None
+
+    def write_trace(self, path: str) -> None:
+        """
+        Save the trace events as a Chrome trace file (JSON), one complete event per frame and per phase.
+
+        Parameters:
+            path (str): The file to write.
+        """
+        # Phases nest under their frame on the same track (timestamps in microseconds)
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'game loop'}}]
+        events.extend({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                       'ts': (start - self._origin) / 1000, 'dur': duration / 1000}
+                      for name, start, duration in self._events)
+        with open(path, 'w') as trace:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace)
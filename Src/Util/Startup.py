@@ -0,0 +1,92 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+class StartupTimer:
+    """
+    Records where the time to the first frame goes.
+
+    Every startup step (importing pygame, opening the window, loading an asset...)
+    is timed as a named phase, relative to the moment this module was imported.
+    Assets are loaded lazily, so a phase may also be recorded after the first
+    frame; the report marks those separately.
+
+    Attributes:
+        origin (float): `time.perf_counter()` value all timings are relative to.
+        phases (list): `(name, start, duration)` tuples, in seconds.
+        firstFrame (float): Time of the first presented frame, None until then.
+        verbose (bool): Print the report to stderr when the first frame is presented.
+
+    Methods:
+        phase(name): Context manager timing a startup phase.
+        first_frame: Record that the first frame was presented.
+        report: Format the timings as a table.
+
+    Example:
+        To time the creation of the window:
+
+        >>> with STARTUP.phase('set_mode'):
+        ...     screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[Tuple[str, float, float]] = []
+        self.firstFrame: Optional[float] = None
+        self.verbose = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time the enclosed block as a startup phase.
+
+        Parameters:
+            name (str): The name of the phase in the report.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, start - self.origin, end - start))
+
+    def first_frame(self) -> None:
+        """
+        Record that the first frame was presented (only the first call counts).
+        """
+        if self.firstFrame is not None:
+            return
+        self.firstFrame = time.perf_counter() - self.origin
+        if self.verbose:
+            print(self.report(), file=sys.stderr)
+
+    def report(self) -> str:
+        """
+        Format the phases and the time to first frame as a table.
+
+        Returns:
+            str: One line per phase (start and duration in milliseconds), followed by
+            the time not covered by any phase and the time to first frame.
+        """
+        lines = ['{:<32}{:>10}{:>10}'.format('phase', 'start ms', 'ms')]
+        covered = 0.0
+        later = []
+        for name, start, duration in self.phases:
+            if self.firstFrame is not None and start >= self.firstFrame:
+                later.append((name, start, duration))
+                continue
+            covered += duration
+            lines.append('{:<32}{:>10.1f}{:>10.1f}'.format(name, start * 1000, duration * 1000))
+        if self.firstFrame is not None:
+            lines.append('{:<32}{:>10}{:>10.1f}'.format('other', '', (self.firstFrame - covered) * 1000))
+            lines.append('{:<32}{:>10}{:>10.1f}'.format('time to first frame', '', self.firstFrame * 1000))
+        if later:
+            lines.append('after first frame:')
+            for name, start, duration in later:
+                lines.append('{:<32}{:>10.1f}{:>10.1f}'.format(name, start * 1000, duration * 1000))
+        return '\n'.join(lines)
+
+
+# Startup timings of the game process, started when this module is first imported
+STARTUP = StartupTimer()
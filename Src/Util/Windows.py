@@ -1,6 +1,6 @@
 import sys
 import pygame
-from random import randint
+from .Startup import STARTUP
 
 class IntroScreen:
     """
@@ -8,11 +8,12 @@ class IntroScreen:
 
     Args:
         screen (pygame.Surface): The game screen where the intro screen is displayed.
-        intro_screen_img (pygame.Surface): The image to be displayed on the intro screen.
+        intro_screen_img (ImageAsset): The image to be displayed on the intro screen, loaded when the screen first runs.
+        fps (int): Frame rate cap while the screen waits for input.
 
     Attributes:
         screen (pygame.Surface): The game screen where the intro screen is displayed.
-        intro_screen_img (pygame.Surface): The image to be displayed on the intro screen.
+        intro_screen_img (ImageAsset): The image to be displayed on the intro screen, loaded when the screen first runs.
         inPlay (bool): Flag indicating whether the game is in play.
         hasPlayed (bool): Flag indicating whether the intro screen has been played.
 
@@ -25,9 +26,10 @@ class IntroScreen:
         >>> intro_screen = IntroScreen(screen, intro_screen_img)
     """
 
-    def __init__(self, screen, intro_screen_img):
+    def __init__(self, screen, intro_screen_img, fps=30):
         self.screen = screen
         self.intro_screen_img = intro_screen_img
+        self.fps = fps
         self.inPlay = False
         self.hasPlayed = False
 
@@ -42,9 +44,13 @@ class IntroScreen:
         Returns:
             None
         """
+        image = self.intro_screen_img.get()
+        clock = pygame.time.Clock()
         while not self.inPlay and not self.hasPlayed:
-            self.screen.blit(self.intro_screen_img, (0, 0))
+            clock.tick(self.fps)
+            self.screen.blit(image, (0, 0))
             pygame.display.flip()
+            STARTUP.first_frame()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -60,11 +66,13 @@ class OutroScreen:
 
     Args:
         screen (pygame.Surface): The game screen where the outro screen is displayed.
-        outro_screen_img (pygame.Surface): The image to be displayed on the outro screen.
+        outro_screen_img (ImageAsset): The image to be displayed on the outro screen, loaded when the screen first runs.
+        fps (int): Frame rate cap while the screen waits for input.
+        reset (callable): Called without arguments to set up a new game (optional).
 
     Attributes:
         screen (pygame.Surface): The game screen where the outro screen is displayed.
-        outro_screen_img (pygame.Surface): The image to be displayed on the outro screen.
+        outro_screen_img (ImageAsset): The image to be displayed on the outro screen, loaded when the screen first runs.
         inPlay (bool): Flag indicating whether the game is in play.
         hasPlayed (bool): Flag indicating whether the outro screen has been played.
 
@@ -77,9 +85,11 @@ class OutroScreen:
         >>> outro_screen = OutroScreen(screen, outro_screen_img)
     """
 
-    def __init__(self, screen, outro_screen_img):
+    def __init__(self, screen, outro_screen_img, fps=30, reset=None):
         self.screen = screen
         self.outro_screen_img = outro_screen_img
+        self.fps = fps
+        self.reset = reset
         self.inPlay = False
         self.hasPlayed = True
 
@@ -95,8 +105,11 @@ class OutroScreen:
         Returns:
             None
         """
+        image = self.outro_screen_img.get()
+        clock = pygame.time.Clock()
         while not self.inPlay and self.hasPlayed:
-            self.screen.blit(self.outro_screen_img, (0, 0))
+            clock.tick(self.fps)
+            self.screen.blit(image, (0, 0))
             pygame.display.flip()
 
             for event in pygame.event.get():
@@ -112,15 +125,12 @@ class OutroScreen:
         """
         Reset the game state to start a new game.
 
-        This method resets the game state, including the global SCORE, shapeNo, and nextShapeNo,
-        to start a new game.
+        This method calls the `reset` callback, which replaces the game state, the board
+        and the falling shape with new ones. The piece sequence continues from the same
+        generator, so a seeded session stays reproducible.
 
         Returns:
             None
         """
-        global SCORE
-        SCORE = 0
-        global shapeNo
-        shapeNo = randint(1, 7)
-        global nextShapeNo
-        nextShapeNo = randint(1, 7)
+        if self.reset is not None:
+            self.reset()
@@ -0,0 +1,199 @@
+# Equivalence checks between the optimized code paths and their reference: the batched
+# environment against the engine, the incremental column tops against a scan of the
+# board, replays against their re-simulation and the dirty redraw against the full one.
+#
+# Run from the repository root or from Src:
+#     python -m pytest -q Src
+import os
+import random
+
+import pytest
+
+from TetrisCore.Engine import Engine, ACTIONS, NOOP, HARD_DROP
+from TetrisCore.Board import Board
+from TetrisCore.Generator import PieceGenerator, UNIFORM, BAG
+from TetrisCore.Autoplay import AutoPlayer
+from TetrisCore.Replay import ReplayWriter, ReplayReader, verify
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+
+
+def engine_state(engine):
+    return (engine.clr, engine.rot, engine.col, engine.row, engine.score, engine.level, engine.lines,
+            engine.pieces, engine.counter, engine.gravityTimer, engine.inPlay, engine.nextShapeNo)
+
+
+def play(engine, player, rnd):
+    """
+    Choose the next action: the AI's key now and then, a random one otherwise.
+    """
+    if player is not None:
+        return player.next_action(engine.board, engine.clr, engine.rot, engine.col, engine.row,
+                                  engine.pieces) if rnd.random() < 0.3 else NOOP
+    return rnd.choice(ACTIONS)
+
+
+def scanned_tops(board):
+    """
+    Compute the column tops of a board from its rows, without the incremental heightmap.
+    """
+    tops = [board.rows] * board.columns
+    for row in range(board.rows - 1, -1, -1):
+        bits = board.rowBits(row)
+        for column in range(board.columns):
+            if bits >> column & 1:
+                tops[column] = row
+    return tops
+
+
+@pytest.mark.parametrize('mode', [UNIFORM, BAG])
+def test_batch_env_matches_engine(mode):
+    np = pytest.importorskip('numpy')
+    from TetrisCore.BatchEnv import BatchEnv
+
+    seeds = [seed * 7919 - 100 for seed in range(16)]
+    env = BatchEnv(seeds, mode)
+    engines = [Engine(generator=PieceGenerator(seed, mode)) for seed in seeds]
+    # Half of the games are played by the AI, so their stacks clear lines
+    players = [AutoPlayer() if index % 2 == 0 else None for index in range(len(seeds))]
+    rnd = random.Random(1)
+    for step in range(3000):
+        actions = [play(engine, player, rnd) for engine, player in zip(engines, players)]
+        _, rewards, _ = env.step(np.array(actions))
+        for index, engine in enumerate(engines):
+            score = engine.score
+            engine.apply(actions[index])
+            engine.tick()
+            assert rewards[index] == engine.score - score
+            batched = tuple(int(values[index]) for values in (
+                env.clr, env.rot, env.col, env.row, env.score, env.level, env.lines, env.pieces, env.counter,
+                env.gravityTimer, env.inPlay, env.nextShapeNo))
+            assert batched == engine_state(engine), (step, index)
+            if step % 97 == 0:
+                board = engine.board
+                cells = [[board.cellColor(board.col + column, row) for column in range(board.columns)]
+                         for row in range(board.rows)]
+                assert env.cells[index].tolist() == cells, (step, index)
+    assert env.lines.sum() > 0
+
+
+def test_column_tops_follow_the_engine():
+    rnd = random.Random(0)
+    for seed in range(10):
+        engine = Engine(seed=seed)
+        player = AutoPlayer() if seed % 3 else None
+        while engine.inPlay and engine.counter < 5000:
+            engine.apply(play(engine, player, rnd))
+            engine.tick()
+            assert engine.board.columnTops() == scanned_tops(engine.board), (seed, engine.counter)
+
+
+def test_column_tops_after_edits_and_clears():
+    rnd = random.Random(0)
+    for _ in range(500):
+        board = Board(3, 10, 12)
+        for _ in range(rnd.randrange(80)):
+            board.setCell(3 + rnd.randrange(10), rnd.randrange(12), 1)
+        # Full rows with gaps between them
+        for row in rnd.sample(range(12), rnd.randrange(4)):
+            for column in range(10):
+                board.setCell(3 + column, row, 2)
+        assert board.columnTops() == scanned_tops(board)
+        board.removeFullRows(board.findFullRows(0, 12, 10))
+        assert board.columnTops() == scanned_tops(board)
+
+
+@pytest.mark.parametrize('mode', [UNIFORM, BAG])
+def test_replay_round_trip(tmp_path, mode):
+    rnd = random.Random(2)
+    generator = PieceGenerator(7, mode)
+    # A second game of the session starts from a generator that already dealt pieces
+    for game in range(2):
+        path = tmp_path / 'game{}.pxr'.format(game)
+        writer = ReplayWriter(open(path, 'wb'), generator)
+        engine = Engine(generator=generator)
+        player = AutoPlayer()
+        while engine.inPlay and engine.counter < 20000:
+            action = play(engine, player, rnd) if rnd.random() < 0.7 else rnd.choice(ACTIONS)
+            if action != NOOP:
+                writer.action(action)
+                engine.apply(action)
+            writer.tick()
+            engine.tick()
+        writer.finish(engine.score, engine.lines, engine.pieces)
+
+        reader = ReplayReader.load(str(path))
+        assert reader.result == (engine.score, engine.lines, engine.pieces)
+        ok, replayed = verify(reader)
+        assert ok
+        assert engine_state(replayed) == engine_state(engine)
+
+
+def test_unfinished_replay_has_no_result(tmp_path):
+    path = tmp_path / 'cut.pxr'
+    writer = ReplayWriter(open(path, 'wb'), PieceGenerator(3))
+    writer.tick()
+    writer.action(HARD_DROP)
+    writer.stream.close()
+    reader = ReplayReader.load(str(path))
+    assert reader.result is None
+    assert reader.inputs == [(1, HARD_DROP)]
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """
+    Run in Src, where the asset paths are relative to, with the game clock stopped.
+    """
+    pygame = pytest.importorskip('pygame')
+    monkeypatch.chdir(SRC)
+    # The timer of the screen must read the same for the two redraws of a frame
+    monkeypatch.setattr(pygame.time, 'get_ticks', lambda: 0)
+    return pygame
+
+
+def test_dirty_redraw_matches_full_redraw(window):
+    pygame = window
+    from Util.Constants import screen, grid_img, tetris_img, block_img, font
+    from Util.Frontend import EngineFrontend
+    from TetrisGrid.Grid import Grid
+    from TetrisGrid.Renderer import DirtyRenderer
+
+    frontend = EngineFrontend(seed=3)
+    engine = frontend.engine
+    renderer = DirtyRenderer()
+    reference = pygame.Surface(screen.get_size())
+    assets = (grid_img.get(), tetris_img.get())
+    blocks, game_font = [block.get() for block in block_img], font.get()
+    player, rnd = AutoPlayer(), random.Random(0)
+    skipped = 0
+    for frame in range(1500):
+        if not engine.inPlay:
+            break
+        engine.apply(play(engine, player, rnd))
+        engine.tick()
+        shape = frontend.shape
+        shadow = frontend.ghost.update(shape, frontend.obstacles)
+        args = (*assets, shape, shadow, frontend.obstacles, blocks, engine.nextShapeNo, engine.score, engine.level,
+                game_font)
+        skipped += not renderer.redraw(screen, *args)
+        Grid.redraw_screen(reference, *args, present=False)
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(reference, 'RGB'), frame
+    # Frames that change nothing on screen are skipped
+    assert skipped > 0
+
+
+def test_key_press_after_quit_is_not_recorded(window, tmp_path):
+    pygame = window
+    from Tetris import TetrisGame, EngineTetrisGame
+
+    for game_class in (TetrisGame, EngineTetrisGame):
+        record_dir = tmp_path / game_class.__name__
+        game = game_class(seed=3, fps=0, record_dir=str(record_dir))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        state = game.main_game_loop()
+        [path] = record_dir.iterdir()
+        reader = ReplayReader.load(str(path))
+        assert reader.result == (state.score, state.lines, state.pieces)
+        assert verify(reader)[0]